@@ -9,7 +9,7 @@ from cdk_organizer.stack_group import StackGroupLoader
 CDK_CONFIG_TYPE = TypeVar('CDK_CONFIG_TYPE', covariant=True)
 
 
-class StackGroup(BaseStackGroup[App, CDK_CONFIG_TYPE]):
+class StackGroup(BaseStackGroup[App, CDK_CONFIG_TYPE], abstract=True):
     """Stack Group for AWS CDK."""
 
     def __init__(self, app: App, loader: StackGroupLoader) -> None:
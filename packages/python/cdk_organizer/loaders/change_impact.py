@@ -0,0 +1,267 @@
+"""
+Change Impact.
+
+Maps the changed files of a commit (e.g. `git diff --name-only`) to the stack groups they affect, \
+    so the pipelines only synthesize and deploy the affected stack groups (`stackGroups` context variable).
+
+A stack group is affected by the changes of:
+
+- its stack file and the local Python modules it imports (stack files or project modules), recursively.
+- the YAML files of the config directories merged into its config, from the stack group config folder \
+    up to the config roots, for each env and region directory.
+- the files included by the `!include` tags, and the files matching the `!include_pattern` globs, of these YAML files.
+- the stack groups it resolves (`resolve_group`), recursively.
+
+The index is built from the current source tree and the changed paths are relative to the project directory \
+    (e.g. `git diff --name-only --relative`), the deleted and added files are also matched. \
+    Only the `env` and `region` context directories are indexed when they're set, otherwise all of them.
+
+### Example:
+
+```bash
+git diff --name-only --relative origin/main | python -m cdk_organizer.loaders.change_impact
+cdk synth -c stackGroups=$(git diff --name-only --relative origin/main | python -m cdk_organizer.loaders.change_impact --separator ,)
+```
+
+Or from Python:
+
+```python
+ChangeImpact(app).affected(['config/dev/us-east-1/storage/config.yaml'])
+```
+"""
+
+import argparse
+import logging
+import os
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.config_compiler import TrackingConfigLoader, context_app, eager_includes, sorted_subdirectories
+from cdk_organizer.loaders.config_loader import config_directories
+from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+from cdk_organizer.loaders.stack_manifest import StackManifest
+from constructs import IConstruct
+
+CDK_APP_TYPE = TypeVar('CDK_APP_TYPE', bound=IConstruct)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ChangeImpact(object):
+    """
+    Reverse dependency index, from the stack groups inputs to the stack groups.
+
+    Args:
+        app (CDK_APP_TYPE): CDK App instance, used to read the `stacksDirectory`, `configDirectory`, `env` and `region` contexts
+        manifest (StackManifest, optional): stack manifest of the stack files, created if not informed
+        index_config (bool): index the config directories, otherwise only the Python modules and \
+            the `resolve_group` dependencies are indexed
+
+    Attributes:
+        stack_groups (List[str]): stack group module names, e.g. `stacks.storage`
+        inputs (Dict[str, Set[str]]): stack groups by input file path (Python modules and included files)
+        directories (Dict[str, Set[str]]): stack groups by merged config directory path
+        patterns (Dict[str, Set[str]]): stack groups by `!include_pattern` glob
+        dependents (Dict[str, Set[str]]): stack groups resolving each stack group
+    """
+
+    def __init__(self, app: CDK_APP_TYPE, manifest: Optional[StackManifest] = None, index_config: bool = True) -> None:
+        """Build the index."""
+        self.app = app
+        self.manifest = manifest if manifest is not None else StackManifest()
+        self.stack_groups: List[str] = []
+        self.inputs: Dict[str, Set[str]] = {}
+        self.directories: Dict[str, Set[str]] = {}
+        self.patterns: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self._stack_dir = app.node.try_get_context("stacksDirectory") or "stacks"
+        self._config_dirs = config_directories(app)
+
+        self._index_modules()
+        if index_config:
+            self._index_config()
+        LOGGER.debug(
+            f'Change impact: {len(self.stack_groups)} stack groups, {len(self.inputs)} files, '
+            f'{len(self.directories)} config directories, {len(self.patterns)} patterns'
+        )
+
+    def affected(self, paths: Iterable[str]) -> List[str]:
+        """
+        Find the stack groups affected by changed files.
+
+        Args:
+            paths (Iterable[str]): changed file paths, relative to the project directory or absolute
+
+        Returns:
+            sorted stack group module names, including the stack groups resolving them.
+        """
+        affected: Set[str] = set()
+        for path in paths:
+            path = _normalize(path)
+            affected.update(self.inputs.get(path, ()))
+            if fnmatch(path, "*.yaml"):
+                affected.update(self.directories.get(os.path.dirname(path) or os.curdir, ()))
+
+            for pattern, stack_groups in self.patterns.items():
+                if fnmatch(path, pattern):
+                    affected.update(stack_groups)
+
+        pending = list(affected)
+        while pending:
+            for dependent in self.dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+
+        return sorted(affected)
+
+    def _index_modules(self) -> None:
+        """Index the Python modules imported by the stack groups, and the stack groups they resolve."""
+        stack_modules = {str(file).replace("/", ".").replace(".py", ""): file for file in Path(f'{self._stack_dir}/').rglob("**/*.py")}
+        modules = dict(stack_modules)
+        stack_group_modules = self.manifest.discover(modules)
+        names = _module_keys(modules)
+        while True:
+            local_modules = {}
+            for file in list(modules.values()):
+                for name in self._dependency_names(self.manifest.files[str(file)]):
+                    if name not in names:
+                        local_modules.update(_local_module(name))
+
+            if not local_modules:
+                break
+
+            modules.update(local_modules)
+            names = _module_keys(modules)
+            stack_group_modules = self.manifest.discover(modules)
+
+        stack_group_modules = [module_name for module_name in stack_group_modules if module_name in stack_modules]
+        self.stack_groups = sorted({module_name.rpartition('.')[0] for module_name in stack_group_modules})
+        for module_name in stack_group_modules:
+            stack_group = module_name.rpartition('.')[0]
+            for dependency in self._module_closure(module_name, modules, names):
+                self.inputs.setdefault(_normalize(str(modules[dependency])), set()).add(stack_group)
+
+            for target in self.manifest.files[str(modules[module_name])]['resolves']:
+                target_module = names.get(target.rpartition('.')[0])
+                if target_module in stack_modules:
+                    target_group = target_module.rpartition('.')[0]
+                    if target_group != stack_group:
+                        self.dependents.setdefault(target_group, set()).add(stack_group)
+
+    def _module_closure(self, module_name: str, modules: Dict[str, Path], names: Dict[str, str]) -> Set[str]:
+        """List a module and the local modules it imports, recursively, including their packages."""
+        closure: Set[str] = set()
+        pending = [module_name]
+        while pending:
+            current = pending.pop()
+            if current in closure:
+                continue
+
+            closure.add(current)
+            entry = self.manifest.files[str(modules[current])]
+            package_names = _parent_names(current.rpartition('.')[0] if current.endswith('.__init__') else current)[1:]
+            pending.extend(names[name] for name in self._dependency_names(entry) + package_names if name in names)
+
+        return closure
+
+    def _dependency_names(self, entry: dict) -> List[str]:
+        """List the imported module names of a manifest entry, with their parent packages."""
+        return [name for module_name in entry['imports'] for name in _parent_names(module_name)]
+
+    def _index_config(self) -> None:
+        """Index the config directories merged by the stack groups, and their included files and patterns."""
+        directory_inputs: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        tree_index = ConfigTreeIndex(*self._config_dirs)
+        with eager_includes():
+            for env, region in self._env_regions():
+                loader = TrackingConfigLoader(self.app, env, region, ConfigCache(), tree_index=tree_index, sources=set(), patterns=[])
+                for stack_group in self.stack_groups:
+                    for root in self._config_dirs:
+                        path = loader._module_folder(stack_group, root)
+                        while True:
+                            key = _normalize(str(path))
+                            self.directories.setdefault(key, set()).add(stack_group)
+                            if key not in directory_inputs:
+                                directory_inputs[key] = self._directory_inputs(loader, path)
+
+                            sources, patterns = directory_inputs[key]
+                            for source in sources:
+                                self.inputs.setdefault(source, set()).add(stack_group)
+                            for pattern in patterns:
+                                self.patterns.setdefault(pattern, set()).add(stack_group)
+
+                            if path == Path(root) or path.parent == path:
+                                break
+                            path = path.parent
+
+    def _directory_inputs(self, loader: TrackingConfigLoader, path: Path) -> Tuple[Set[str], Set[str]]:
+        """Parse the YAML files of a config directory, returning the parsed and included files and the `!include_pattern` globs."""
+        loader.sources = set()
+        loader.patterns = []
+        if loader._exists(path):
+            loader._load_directory_config(path)
+
+        return {_normalize(source) for source in loader.sources}, {_normalize(pattern) for pattern, _ in loader.patterns}
+
+    def _env_regions(self) -> List[Tuple[str, str]]:
+        """List the env and region directories of the config roots, or the `env` and `region` contexts."""
+        env = os.getenv("CDK_ENV", None) or self.app.node.try_get_context("env")
+        region = self.app.node.try_get_context("region")
+        envs = [env] if env else sorted({name for root in self._config_dirs for name in sorted_subdirectories(root)})
+        return [
+            (env_name, region_name)
+            for env_name in envs
+            for region_name in ([region] if region else sorted({
+                name for root in self._config_dirs for name in sorted_subdirectories(os.path.join(root, env_name))
+            }))
+        ]
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(os.path.relpath(path))
+
+
+def _parent_names(module_name: str) -> List[str]:
+    """List a module name and its parent package names, e.g. `a.b.c`, `a.b` and `a`."""
+    parts = module_name.split('.')
+    return ['.'.join(parts[:index]) for index in range(len(parts), 0, -1)]
+
+
+def _module_keys(modules: Dict[str, Path]) -> Dict[str, str]:
+    """Map the importable module names to the module keys, the `<package>.__init__` keys are imported as `<package>`."""
+    names = {module_name: module_name for module_name in modules}
+    names.update({module_name[:-len('.__init__')]: module_name for module_name in modules if module_name.endswith('.__init__')})
+    return names
+
+
+def _local_module(name: str) -> Dict[str, Path]:
+    """Find a module of the project directory, the packages are keyed as `<package>.__init__`."""
+    if not name or not all(name.split('.')):
+        return {}
+
+    path = Path(*name.split('.'))
+    if path.with_suffix('.py').is_file():
+        return {name: path.with_suffix('.py')}
+    if path.joinpath('__init__.py').is_file():
+        return {f'{name}.__init__': path.joinpath('__init__.py')}
+    return {}
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """List the stack groups affected by the changed files, the context is read from the `cdk.context.json` and `cdk.json` files and the `--context` arguments."""
+    parser = argparse.ArgumentParser(description='List the stack groups affected by changed files.')
+    parser.add_argument('paths', nargs='*', help='changed file paths, read from the standard input if not informed')
+    parser.add_argument('-c', '--context', action='append', default=[], metavar='KEY=VALUE', help='context variable')
+    parser.add_argument('-s', '--separator', default='\n', help='stack groups separator, default: new line')
+    arguments = parser.parse_args(args)
+
+    paths = arguments.paths or [line.strip() for line in sys.stdin if line.strip()]
+    sys.stdout.write(arguments.separator.join(ChangeImpact(context_app(arguments.context)).affected(paths)) + '\n')
+
+
+if __name__ == '__main__':
+    main()
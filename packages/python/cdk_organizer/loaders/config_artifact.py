@@ -0,0 +1,218 @@
+"""
+Config Artifact.
+
+Reads the compiled config artifact built by `ConfigCompiler`, see `configArtifact` context variable.
+
+### Format:
+
+```text
+magic (8 bytes) | header size (8 bytes, little endian) | header (JSON) | entries (pickle)
+```
+
+The header holds the sources fingerprint and the offset and size of each directory entry, \
+    the file is memory-mapped and only the entries used by the stack groups are unpickled.
+
+The entries are pickled, so the artifacts not owned by the current user are not read.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from cdk_organizer.loaders.file_cache import is_owned
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+ARTIFACT_MAGIC = b'CDKOCFG\0'
+ARTIFACT_VERSION = 2
+HEADER_SIZE_FORMAT = '<Q'
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConfigArtifact(object):
+    """
+    Compiled config artifact reader.
+
+    Args:
+        path (str): artifact file path
+
+    Attributes:
+        header (dict): artifact header
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open and memory-map the artifact."""
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            if not is_owned(os.fstat(self._file.fileno())):
+                raise ValueError(f'{path} is not owned by the current user')
+
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            prefix_size = len(ARTIFACT_MAGIC) + struct.calcsize(HEADER_SIZE_FORMAT)
+            if self._data[:len(ARTIFACT_MAGIC)] != ARTIFACT_MAGIC:
+                raise ValueError(f'{path} is not a config artifact')
+
+            header_size, = struct.unpack(HEADER_SIZE_FORMAT, self._data[len(ARTIFACT_MAGIC):prefix_size])
+            self.header: dict = json.loads(self._data[prefix_size:prefix_size + header_size])
+            self._offset = prefix_size + header_size
+        except Exception:
+            self.close()
+            raise
+
+        self._entries: Dict[str, dict] = {}
+
+    @classmethod
+    def open(cls, path: str, strategies: Optional[dict] = None) -> Optional['ConfigArtifact']:
+        """
+        Open an artifact if it exists and it's up to date.
+
+        Args:
+            path (str): artifact file path
+            strategies (dict, optional): merge strategies of the `configMergeStrategies` context, not checked if not informed
+
+        Returns:
+            artifact or `None` when the artifact is missing, invalid or stale.
+        """
+        try:
+            artifact = cls(path)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            LOGGER.debug(f'Ignoring invalid config artifact {path}: {error}')
+            return None
+
+        if not artifact.is_valid(strategies):
+            LOGGER.debug(f'Config artifact {path} is stale')
+            artifact.close()
+            return None
+
+        return artifact
+
+    def is_valid(self, strategies: Optional[dict] = None) -> bool:
+        """
+        Check if the artifact sources did not change.
+
+        Args:
+            strategies (dict, optional): merge strategies of the `configMergeStrategies` context, not checked if not informed
+
+        Returns:
+            `True` if the artifact is up to date.
+        """
+        header = self.header
+        if header.get('version') != ARTIFACT_VERSION:
+            return False
+        if strategies is not None and strategies != header['strategies']:
+            return False
+
+        sources = {}
+        for path, (mtime, size, digest) in header['sources'].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+
+            sources[path] = digest if (stat.st_mtime_ns, stat.st_size) == (mtime, size) else hash_file(path)
+
+        patterns = [[pattern, sorted(os.path.relpath(file) for file in glob.glob(pattern))] for pattern, _ in header['patterns']]
+        directories = {directory: list_directory(directory) for directory in header['directories']}
+        return fingerprint(header['config_dirs'], header['strategies'], sources, patterns, directories) == header['fingerprint']
+
+    def load(self, path: 'Path') -> Optional[Tuple[dict, bool]]:
+        """
+        Load the compiled config of a stack group config folder.
+
+        Args:
+            path (Path): config folder in the highest priority config root, e.g. `config/dev/us-east-1/app1`
+
+        Returns:
+            compiled config (must not be mutated) and if the module config exists, or `None` when \
+                the folder is not covered by the artifact.
+        """
+        key = str(path)
+        if key not in self.header['index']:
+            return None
+
+        offset, size, exists = self.header['index'][key]
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = pickle.loads(self._data[self._offset + offset:self._offset + offset + size])
+
+        return entry, exists
+
+    def close(self) -> None:
+        """Close the artifact file."""
+        if getattr(self, '_data', None) is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+
+def hash_file(path: str) -> str:
+    """
+    Hash a file content.
+
+    Args:
+        path (str): file path
+
+    Returns:
+        sha256 hex digest, empty when the file can't be read
+    """
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+def list_directory(path: str) -> Optional[List[str]]:
+    """
+    List the YAML files of a config directory.
+
+    Args:
+        path (str): directory path
+
+    Returns:
+        sorted file names, `None` when the directory doesn't exist
+    """
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries if entry.name.endswith('.yaml') and not entry.is_dir())
+    except OSError:
+        return None
+
+
+def fingerprint(
+    config_dirs: List[str],
+    strategies: dict,
+    sources: Dict[str, str],
+    patterns: list,
+    directories: Dict[str, Optional[List[str]]]
+) -> str:
+    """
+    Compute the fingerprint of the artifact sources.
+
+    Args:
+        config_dirs (List[str]): config roots
+        strategies (dict): merge strategies
+        sources (Dict[str, str]): content hash of the source files
+        patterns (list): glob patterns and the matched files
+        directories (Dict[str, Optional[List[str]]]): YAML files of the config directories
+
+    Returns:
+        sha256 hex digest
+    """
+    data = json.dumps(
+        [ARTIFACT_VERSION, config_dirs, strategies, sources, patterns, directories],
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
@@ -0,0 +1,113 @@
+"""
+Config Cache.
+
+Keeps the config layers of each config directory (see `LayeredConfig`), so the stack groups sharing \
+    the same ancestors (`config/config.yaml`, `config/<env>/config.yaml`, ...) parse each directory \
+    only once per `StackGroupLoader` run and share the parsed layers.
+
+The cache also holds the directories being parsed ahead of time by `ConfigLoader.prefetch`.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+class ConfigCache(object):
+    """
+    Config layers cache per config directory.
+
+    Attributes:
+        hits (int): number of lookups served from the cache
+        misses (int): number of lookups not found in the cache
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._entries: Dict[str, Tuple[dict, ...]] = {}
+        self._prefetched: Dict[str, 'Future'] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[dict, ...]]:
+        """
+        Get the config layers of a directory.
+
+        Args:
+            key (str): config directory path
+
+        Returns:
+            config layers, from the highest to the lowest priority, or `None` when the directory is not cached yet.
+        """
+        config = self._entries.get(key)
+        if config is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return config
+
+    def set(self, key: str, layers: Tuple[dict, ...]) -> None:
+        """
+        Store the config layers of a directory.
+
+        The layers are shared by all the lookups, so they must not be mutated afterwards.
+
+        Args:
+            key (str): config directory path
+            layers (Tuple[dict, ...]): config layers, from the highest to the lowest priority
+        """
+        self._entries[key] = layers
+
+    def contains(self, key: str) -> bool:
+        """
+        Check if a directory is cached or being prefetched, without updating the counters.
+
+        Args:
+            key (str): config directory path
+
+        Returns:
+            `True` if the directory is cached or being prefetched.
+        """
+        return key in self._entries or key in self._prefetched
+
+    def add_prefetch(self, key: str, future: 'Future') -> None:
+        """
+        Store the future of a directory being parsed ahead of time.
+
+        Args:
+            key (str): config directory path
+            future (Future): future resolving to the merged configuration of the directory files
+        """
+        self._prefetched[key] = future
+
+    def pop_prefetch(self, key: str) -> Optional['Future']:
+        """
+        Remove and return the prefetch future of a directory.
+
+        Args:
+            key (str): config directory path
+
+        Returns:
+            prefetch future or `None` when the directory is not being prefetched.
+        """
+        return self._prefetched.pop(key, None)
+
+    def cancel_prefetch(self) -> None:
+        """Cancel the pending prefetches that were not used."""
+        for future in self._prefetched.values():
+            future.cancel()
+
+        self._prefetched.clear()
+
+    def clear(self) -> None:
+        """Remove all the entries and reset the counters."""
+        self.cancel_prefetch()
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached directories."""
+        return len(self._entries)
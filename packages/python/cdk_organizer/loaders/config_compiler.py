@@ -0,0 +1,289 @@
+"""
+Config Compiler.
+
+Pre-resolves the config of every `<env>/<region>/<stack group>` folder of the config roots \
+    (includes expanded, templates rendered and merges applied) into a single artifact file, \
+    so the synth jobs load each stack group config directly from the artifact instead of \
+    parsing and merging the config tree.
+
+The artifact stores a fingerprint of its sources (config files, included files, glob patterns \
+    and directory listings), a stale artifact is detected and rebuilt when it's used by the \
+    `configArtifact` context variable.
+
+### Example:
+
+Build the artifact once, e.g. in the CI pipeline:
+
+```bash
+python -m cdk_organizer.loaders.config_compiler cdk.out/config.bin
+```
+
+And use it in the synth jobs:
+
+```bash
+cdk synth --context configArtifact=cdk.out/config.bin
+```
+
+The artifact can also be built from the CDK app:
+
+```python
+ConfigCompiler(app).compile('cdk.out/config.bin')
+```
+
+See `ConfigArtifact` for the artifact format.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from cdk_organizer.loaders.config_artifact import ARTIFACT_MAGIC, ARTIFACT_VERSION, HEADER_SIZE_FORMAT, fingerprint, hash_file, list_directory
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.config_loader import ConfigLoader, config_directories
+from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+from cdk_organizer.loaders.layered_config import LayeredConfig
+from cdk_organizer.loaders.merge_engine import MergeEngine
+from cdk_organizer.miscellaneous.yaml_tags.include_cache import INCLUDE_CACHE
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader, yaml_path_loader
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyInclude, materialize
+from constructs import IConstruct
+
+CDK_APP_TYPE = TypeVar('CDK_APP_TYPE', bound=IConstruct)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConfigCompiler(object):
+    """
+    Compiles the config folders of the stack modules, for each env and region directory, into an artifact.
+
+    Args:
+        app (CDK_APP_TYPE): CDK App instance, used to read the `stacksDirectory`, `configDirectory` and `configMergeStrategies` contexts
+        merge_engine (MergeEngine, optional): merge engine, created from the `configMergeStrategies` context if not informed
+    """
+
+    def __init__(self, app: CDK_APP_TYPE, merge_engine: Optional[MergeEngine] = None) -> None:
+        """Initialize the compiler."""
+        self.app = app
+        self.strategies = app.node.try_get_context("configMergeStrategies") or {}
+        if isinstance(self.strategies, str):
+            self.strategies = json.loads(self.strategies)
+
+        self.merge_engine = merge_engine if merge_engine is not None else MergeEngine(self.strategies)
+        self._stack_dir = app.node.try_get_context("stacksDirectory") or "stacks"
+        self._config_dirs = config_directories(app)
+
+    def compile(self, output: str) -> str:
+        """
+        Compile the config and write the artifact.
+
+        The lazy includes are disabled while compiling, so all the included files are part of the fingerprint.
+
+        Args:
+            output (str): artifact file path
+
+        Returns:
+            sources fingerprint
+        """
+        with eager_includes():
+            sources: Set[str] = set()
+            patterns: List[Tuple[str, List[str]]] = []
+            cache = ConfigCache()
+            tree_index = ConfigTreeIndex(*self._config_dirs)
+            entries = []
+            index = {}
+            offset = 0
+            for env, region, module in self._modules():
+                loader = TrackingConfigLoader(
+                    self.app,
+                    env,
+                    region,
+                    cache,
+                    merge_engine=self.merge_engine,
+                    tree_index=tree_index,
+                    sources=sources,
+                    patterns=patterns
+                )
+                config = copy.deepcopy(LayeredConfig.from_layers(loader._load_module(module), self.merge_engine))
+                entry = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+                index[str(loader._module_folder(module))] = [offset, len(entry), loader.config_exists(module)]
+                entries.append(entry)
+                offset += len(entry)
+
+        source_hashes = {}
+        source_stats = {}
+        for path in sources:
+            path = os.path.relpath(path)
+            stat = os.stat(path)
+            source_hashes[path] = hash_file(path)
+            source_stats[path] = [stat.st_mtime_ns, stat.st_size, source_hashes[path]]
+
+        unique_patterns = {(os.path.relpath(pattern), tuple(sorted(os.path.relpath(file) for file in files))) for pattern, files in patterns}
+        relative_patterns = [[pattern, list(files)] for pattern, files in sorted(unique_patterns)]
+        directories = {key: list_directory(key) for key in sorted(cache._entries)}
+
+        header = {
+            'version': ARTIFACT_VERSION,
+            'config_dirs': self._config_dirs,
+            'strategies': self.strategies,
+            'sources': source_stats,
+            'patterns': relative_patterns,
+            'directories': directories,
+            'fingerprint': fingerprint(
+                self._config_dirs,
+                self.strategies,
+                source_hashes,
+                relative_patterns,
+                directories
+            ),
+            'index': index
+        }
+        self._write(output, header, entries)
+        LOGGER.debug(f'Config artifact {output}: {len(index)} config folders, {len(sources)} sources')
+        return header['fingerprint']
+
+    def _modules(self) -> List[Tuple[str, str, str]]:
+        """List the stack modules, for each `<config>/<env>/<region>` directory of the config roots."""
+        files = Path(f'{self._stack_dir}/').rglob("**/*.py")
+        modules = dict.fromkeys('.'.join(str(file).replace("/", ".").replace(".py", "").split('.')[:-1]) for file in files)
+        envs = sorted({env for root in self._config_dirs for env in sorted_subdirectories(root)})
+        return [
+            (env, region, module)
+            for env in envs
+            for region in sorted({region for root in self._config_dirs for region in sorted_subdirectories(os.path.join(root, env))})
+            for module in modules
+        ]
+
+    def _write(self, output: str, header: dict, entries: List[bytes]) -> None:
+        directory = os.path.dirname(output) or '.'
+        os.makedirs(directory, exist_ok=True)
+        header_data = json.dumps(header, sort_keys=True, separators=(',', ':')).encode()
+        with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.tmp', delete=False) as file:
+            try:
+                file.write(ARTIFACT_MAGIC)
+                file.write(struct.pack(HEADER_SIZE_FORMAT, len(header_data)))
+                file.write(header_data)
+                for entry in entries:
+                    file.write(entry)
+            except Exception:
+                os.remove(file.name)
+                raise
+
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, output)
+
+
+class TrackingConfigLoader(ConfigLoader):
+    """
+    Config loader recording the parsed and included files.
+
+    Args:
+        sources (Set[str]): parsed and included file paths, updated by the loader
+        patterns (List[Tuple[str, List[str]]]): `!include_pattern` globs and their matched files, updated by the loader
+    """
+
+    def __init__(self, *args: Any, sources: Set[str], patterns: List[Tuple[str, List[str]]], **kwargs: Any) -> None:
+        """Initialize the loader."""
+        super().__init__(*args, **kwargs)
+        self.sources = sources
+        self.patterns = patterns
+
+    def _load_file(self, path: str) -> Any:
+        with open(path, 'r') as file:
+            loader = yaml_path_loader(path)(file.read())
+
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+
+        self.sources.add(path)
+        self.sources.update(loader.dependencies)
+        self.patterns.extend(loader.patterns)
+        return materialize(data) if isinstance(data, LazyInclude) else data
+
+
+@contextmanager
+def eager_includes() -> Iterator[None]:
+    """Disable the lazy includes, so all the included files are parsed (and recorded by `TrackingConfigLoader`)."""
+    lazy_includes = IncludeLoader.lazy_includes
+    if lazy_includes:
+        IncludeLoader.lazy_includes = False
+        INCLUDE_CACHE.clear()
+
+    try:
+        yield
+    finally:
+        if lazy_includes:
+            IncludeLoader.lazy_includes = True
+            INCLUDE_CACHE.clear()
+
+
+def sorted_subdirectories(path: str) -> List[str]:
+    """
+    List the subdirectories of a directory.
+
+    Args:
+        path (str): directory path
+
+    Returns:
+        sorted subdirectory names
+    """
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+    except OSError:
+        return []
+
+
+def context_app(contexts: List[str]) -> IConstruct:
+    """
+    Create an app construct with the context of the CDK project and the `KEY=VALUE` contexts, for the command line tools.
+
+    The context is merged as the CDK CLI does, the `cdk.context.json` file (cached context values) has the lowest priority, \
+        then the `context` key of the `cdk.json` file and the `KEY=VALUE` contexts.
+
+    Args:
+        contexts (List[str]): `KEY=VALUE` context variables
+
+    Returns:
+        app construct
+    """
+    from constructs import RootConstruct
+
+    app = RootConstruct()
+    for path, key in (('cdk.context.json', None), ('cdk.json', 'context')):
+        if os.path.exists(path):
+            with open(path, 'r') as file:
+                values = json.load(file)
+
+            for name, value in (values.get(key, {}) if key else values).items():
+                app.node.set_context(name, value)
+
+    for context in contexts:
+        key, _, value = context.partition('=')
+        app.node.set_context(key, value)
+
+    return app
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Compile the config artifact, the context is read from the `cdk.context.json` and `cdk.json` files and the `--context` arguments."""
+    parser = argparse.ArgumentParser(description='Compile the cdk-organizer config into an artifact.')
+    parser.add_argument('output', help='artifact file path')
+    parser.add_argument('-c', '--context', action='append', default=[], metavar='KEY=VALUE', help='context variable')
+    arguments = parser.parse_args(args)
+    sys.stdout.write(f'{ConfigCompiler(context_app(arguments.context)).compile(arguments.output)}\n')
+
+
+if __name__ == '__main__':
+    main()
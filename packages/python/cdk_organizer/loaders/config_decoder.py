@@ -0,0 +1,269 @@
+"""
+Config Decoder.
+
+Decodes the stack group config into its config dataclass (`StackGroup.data`).
+
+The decoder of each dataclass is compiled once from its type hints into nested converter functions, \
+    and cached by the dataclass type, so the fields and type hints are not inspected again for each \
+    stack group. The converters follow the `dacite.from_dict` rules (default `Config`):
+
+- The missing fields use their default value, or `None` for the `Optional` fields.
+- The nested dataclasses are decoded from `Mapping` values.
+- The `List`, `Set`, `Dict`, ... values are copied to the same type of the config value with their items decoded.
+- The `Union` members are tried in order, and the other values must be instances of the field type \
+    (`int` values are accepted by the `float` fields with `dacite` 1.8+, see `NUMERIC_TOWER`).
+
+When a value doesn't match the type hints, or the dataclass uses types which are not compiled \
+    (e.g. `Tuple`, `Literal`, `NewType`, `InitVar` or non `init` fields), the config is decoded by \
+    `dacite.from_dict`, so the errors keep the `dacite` messages.
+
+The config dataclasses can also be `frozen` (and use `slots`, Python 3.10+), \
+    the decoded configs are then read-only, hashable and smaller.
+"""
+
+import dataclasses
+import re
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Collection, Dict, Mapping, Optional, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from dacite import from_dict
+
+try:
+    from types import UnionType  # type: ignore
+except ImportError:  # pragma: no cover
+    UnionType = None
+
+T = TypeVar('T')
+
+Converter = Callable[[Any], Any]
+
+NONE_TYPE = type(None)
+
+DECODERS: Dict[type, Optional[Converter]] = {}
+
+
+def _numeric_tower() -> bool:
+    """Check if the installed `dacite` accepts `int` values for the `float` and `complex` fields (PEP 484 numeric tower), added by `dacite` 1.8."""
+    try:
+        return tuple(int(part) for part in re.findall(r'\d+', version('dacite'))[:2]) >= (1, 8)
+    except PackageNotFoundError:  # pragma: no cover
+        return True
+
+
+NUMERIC_TOWER = _numeric_tower()
+
+
+class _Mismatch(Exception):
+    """The value doesn't match the type hints, `dacite` decodes the config to report the error."""
+
+
+class _Unsupported(Exception):
+    """The type hint is not compiled, `dacite` decodes the config."""
+
+
+def decode_config(data_class: Type[T], data: Mapping) -> T:
+    """
+    Decode a config into a dataclass, using its compiled decoder.
+
+    Args:
+        data_class (Type[T]): config dataclass
+        data (Mapping): config
+
+    Returns:
+        dataclass instance
+
+    Raises:
+        dacite.DaciteError: when the config doesn't match the dataclass
+    """
+    decoder = compile_decoder(data_class)
+    if decoder is not None:
+        try:
+            return decoder(data)
+        except _Mismatch:
+            pass
+
+    return from_dict(data_class=data_class, data=data)
+
+
+def compile_decoder(data_class: type) -> Optional[Converter]:
+    """
+    Get the compiled decoder of a dataclass, it's compiled on the first call.
+
+    Args:
+        data_class (type): config dataclass
+
+    Returns:
+        decoder function, receiving the config `Mapping`, or `None` when the dataclass uses types which are not compiled.
+    """
+    if data_class not in DECODERS:
+        try:
+            DECODERS[data_class] = _DecoderCompiler().dataclass(data_class)
+        except _Unsupported:
+            DECODERS[data_class] = None
+
+    return DECODERS[data_class]
+
+
+class _DecoderCompiler(object):
+    """Compiles the converters of the type hints."""
+
+    def __init__(self) -> None:
+        self._dataclasses: Dict[type, Converter] = {}
+
+    def dataclass(self, data_class: type) -> Converter:
+        """Compile the decoder of a dataclass from a `Mapping`, the recursive dataclasses share the same decoder."""
+        if data_class in self._dataclasses:
+            return self._dataclasses[data_class]
+
+        fields = []
+
+        def decode(data: Mapping) -> Any:
+            values = {}
+            for name, convert, default in fields:
+                values[name] = convert(data[name]) if name in data else default()
+
+            return data_class(**values)
+
+        self._dataclasses[data_class] = decode
+        try:
+            hints = get_type_hints(data_class)
+        except Exception:
+            raise _Unsupported()
+
+        # `InitVar` and `ClassVar` pseudo-fields are not listed by `dataclasses.fields`
+        if len(dataclasses.fields(data_class)) != len(data_class.__dataclass_fields__):
+            raise _Unsupported()
+
+        for field in dataclasses.fields(data_class):
+            if not field.init:
+                raise _Unsupported()
+            fields.append((field.name, self.converter(hints[field.name]), self._default(field, hints[field.name])))
+
+        return decode
+
+    def converter(self, hint: Any) -> Converter:
+        """Compile the converter of a type hint."""
+        if hint is Any:
+            return _identity
+
+        origin = get_origin(hint)
+        if origin is Union or (UnionType is not None and isinstance(hint, UnionType)):
+            return self._union(get_args(hint))
+
+        if origin is not None:
+            if isinstance(origin, type) and issubclass(origin, Mapping):
+                return self._mapping(origin, get_args(hint))
+            if isinstance(origin, type) and issubclass(origin, Collection) and not issubclass(origin, tuple):
+                return self._collection(origin, get_args(hint))
+            raise _Unsupported()
+
+        if isinstance(hint, type) and dataclasses.is_dataclass(hint):
+            return self._dataclass_value(hint)
+
+        if isinstance(hint, type):
+            return self._instance(hint)
+
+        raise _Unsupported()
+
+    def _default(self, field: dataclasses.Field, hint: Any) -> Callable[[], Any]:
+        if field.default is not dataclasses.MISSING:
+            default = field.default
+            return lambda: default
+
+        if field.default_factory is not dataclasses.MISSING:  # type: ignore
+            return field.default_factory  # type: ignore
+
+        if _is_optional(hint):
+            return lambda: None
+
+        return _missing
+
+    def _dataclass_value(self, data_class: type) -> Converter:
+        decode = self.dataclass(data_class)
+
+        def convert(data: Any) -> Any:
+            if isinstance(data, Mapping):
+                return decode(data)
+            if isinstance(data, data_class):
+                return data
+            raise _Mismatch()
+
+        return convert
+
+    def _union(self, members: tuple) -> Converter:
+        if len(members) == 2 and NONE_TYPE in members:
+            # `dacite` only decodes the first member of the `Optional` types
+            first = self.converter(members[0])
+
+            def convert_optional(data: Any) -> Any:
+                return None if data is None else first(data)
+
+            return convert_optional
+
+        optional = NONE_TYPE in members
+        converters = [self.converter(member) for member in members]
+
+        def convert(data: Any) -> Any:
+            if optional and data is None:
+                return None
+
+            for converter in converters:
+                try:
+                    return converter(data)
+                except Exception:
+                    continue
+
+            raise _Mismatch()
+
+        return convert
+
+    def _mapping(self, origin: type, args: tuple) -> Converter:
+        key, value = (self.converter(args[0]), self.converter(args[1])) if args else (_identity, _identity)
+
+        def items(data: Mapping) -> Any:
+            for item_key, item in data.items():
+                key(item_key)
+                yield item_key, value(item)
+
+        def convert(data: Any) -> Any:
+            if not isinstance(data, origin):
+                raise _Mismatch()
+
+            return type(data)(items(data))
+
+        return convert
+
+    def _collection(self, origin: type, args: tuple) -> Converter:
+        item_converter = self.converter(args[0]) if args else _identity
+
+        def convert(data: Any) -> Any:
+            if not isinstance(data, origin) or isinstance(data, (str, bytes, Mapping)):
+                raise _Mismatch()
+
+            return type(data)(item_converter(item) for item in data)
+
+        return convert
+
+    def _instance(self, cls: type) -> Converter:
+        types = (int, float, cls) if NUMERIC_TOWER and cls in (float, complex) else cls
+
+        def convert(data: Any) -> Any:
+            if not isinstance(data, types):
+                raise _Mismatch()
+            return data
+
+        return convert
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _missing() -> Any:
+    raise _Mismatch()
+
+
+def _is_optional(hint: Any) -> bool:
+    origin = get_origin(hint)
+    is_union = origin is Union or (UnionType is not None and isinstance(hint, UnionType))
+    return is_union and NONE_TYPE in get_args(hint)
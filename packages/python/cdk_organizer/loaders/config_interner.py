@@ -0,0 +1,213 @@
+"""
+Config Interner.
+
+Deduplicates the structurally identical subtrees of the parsed config directories, enabled by \
+    the `configIntern` context variable. Most stack groups share the same subtrees (tags, \
+    backends, account tables, ...) defined or included by many config files, each unique \
+    subtree is kept only once as a `FrozenDict` or `FrozenList`.
+
+The frozen objects cache their hash, and the equal subtrees are the same object, so comparing \
+    them is usually an identity or hash check.
+
+The frozen objects are not exposed to the stack groups, `LayeredConfig` returns mutable copies \
+    of them (`copy.deepcopy` returns plain `dict` and `list` objects).
+
+### Example:
+
+```bash
+cdk synth --context configIntern=true
+```
+"""
+
+import copy
+import datetime
+import sys
+from typing import Any, Dict, Hashable, Tuple
+
+SCALAR_TYPES = (str, int, float, bool, bytes, type(None), datetime.date)
+
+
+class FrozenDict(dict):
+    """Immutable `dict` with a cached hash, created by `ConfigInterner`."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the dict, all the values must be hashable."""
+        super().__init__(*args, **kwargs)
+        self._hash = hash(frozenset(super().items()))
+
+    def __hash__(self) -> int:  # type: ignore
+        """Return the cached hash."""
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the identity and the cached hashes before the items."""
+        if self is other:
+            return True
+        if isinstance(other, (FrozenDict, FrozenList)) and self._hash != other._hash:
+            return False
+        return super().__eq__(other)
+
+    def __ne__(self, other: Any) -> bool:
+        """Return the negation of `__eq__`."""
+        return not self.__eq__(other)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        """Return a mutable copy."""
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> Tuple[type, Tuple[dict]]:
+        """Pickle the items."""
+        return FrozenDict, (dict(self), )
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly  # type: ignore
+
+
+class FrozenList(list):
+    """Immutable `list` with a cached hash, created by `ConfigInterner`."""
+
+    def __init__(self, *args: Any) -> None:
+        """Initialize the list, all the items must be hashable."""
+        super().__init__(*args)
+        self._hash = hash(tuple(self))
+
+    def __hash__(self) -> int:  # type: ignore
+        """Return the cached hash."""
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the identity and the cached hashes before the items."""
+        if self is other:
+            return True
+        if isinstance(other, (FrozenDict, FrozenList)) and self._hash != other._hash:
+            return False
+        return super().__eq__(other)
+
+    def __ne__(self, other: Any) -> bool:
+        """Return the negation of `__eq__`."""
+        return not self.__eq__(other)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        """Return a mutable copy."""
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> Tuple[type, Tuple[list]]:
+        """Pickle the items."""
+        return FrozenList, (list(self), )
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = reverse = sort = _readonly  # type: ignore
+
+
+class ConfigInterner(object):
+    """
+    Hash-consing table of the config subtrees.
+
+    The subtrees containing values which are not hashable (e.g. sets or lazy includes) \
+        are not interned, but their children are.
+
+    Attributes:
+        hits (int): number of subtrees replaced by an existing one
+        saved_bytes (int): estimated memory saved by the replaced subtrees, in bytes
+    """
+
+    def __init__(self) -> None:
+        """Initialize the interner."""
+        self.hits = 0
+        self.saved_bytes = 0
+        self._table: Dict[Hashable, Tuple[Any, int]] = {}
+        self._interned: Dict[int, Tuple[Any, int]] = {}
+
+    def intern_layer(self, config: dict) -> dict:
+        """
+        Intern the values of a parsed config directory.
+
+        The top level dict is not frozen, as it's a `LayeredConfig` layer.
+
+        Args:
+            config (dict): parsed config, its values are replaced
+
+        Returns:
+            the config object
+        """
+        try:
+            for key, value in config.items():
+                config[key] = self.intern(value)[0]
+        finally:
+            self._interned.clear()
+
+        return config
+
+    def intern(self, value: Any) -> Tuple[Any, int]:
+        """
+        Intern a config value.
+
+        Args:
+            value (Any): config value
+
+        Returns:
+            canonical value (frozen when it's an internable `dict` or `list`) and its estimated size in bytes, \
+                `0` when it's not internable.
+        """
+        if isinstance(value, (FrozenDict, FrozenList)):
+            return value, sys.getsizeof(value)
+
+        if isinstance(value, (dict, list)):
+            # the YAML aliases refer to the same object, it's interned only once, and the recursive ones are not interned
+            interned = self._interned.get(id(value))
+            if interned is None:
+                self._interned[id(value)] = (value, 0)
+                interned = self._interned[id(value)] = self._intern_container(value)
+            return interned
+
+        if isinstance(value, SCALAR_TYPES):
+            return value, sys.getsizeof(value)
+
+        return value, 0
+
+    def __len__(self) -> int:
+        """Return the number of unique subtrees."""
+        return len(self._table)
+
+    def _intern_container(self, value: Any) -> Tuple[Any, int]:
+        if isinstance(value, dict):
+            items = [(key, self.intern(item)) for key, item in value.items()]
+            if all(size and isinstance(key, SCALAR_TYPES) for key, (_, size) in items):
+                table_key = ('dict', ) + tuple((type(key), key) + self._item_key(item) for key, (item, _) in items)
+                return self._lookup(table_key, lambda: FrozenDict((key, item) for key, (item, _) in items), sum(
+                    size + sys.getsizeof(key) for key, (_, size) in items
+                ))
+
+            for key, (item, _) in items:
+                value[key] = item
+            return value, 0
+
+        items = [self.intern(item) for item in value]
+        if all(size for _, size in items):
+            table_key = ('list', ) + tuple(self._item_key(item) for item, _ in items)
+            return self._lookup(table_key, lambda: FrozenList(item for item, _ in items), sum(size for _, size in items))
+
+        value[:] = [item for item, _ in items]
+        return value, 0
+
+    def _item_key(self, item: Any) -> Tuple[Any, ...]:
+        # the interned subtrees are unique, and equal values of different types (`1` and `True`) or keys order must not be merged
+        if isinstance(item, (FrozenDict, FrozenList)):
+            return (id(item), )
+        return type(item), item
+
+    def _lookup(self, table_key: Hashable, create: Any, children_size: int) -> Tuple[Any, int]:
+        entry = self._table.get(table_key)
+        if entry is not None:
+            self.hits += 1
+            self.saved_bytes += entry[1]
+            return entry
+
+        frozen = create()
+        entry = frozen, sys.getsizeof(frozen) + children_size
+        self._table[table_key] = entry
+        return entry
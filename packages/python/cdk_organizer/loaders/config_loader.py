@@ -38,24 +38,80 @@ prop4: value4
 > **Note**: If the property name conflicts, the higher priority config file will \
     override the lower priority config file.
 
+The files are only loaded up to the config root, the files above it (e.g. in the project root) are ignored. \
+    The config root can be an absolute path, e.g. a shared config checkout, and several roots can be layered, \
+    see `configDirectory` context variable: the config of each root is loaded and the later roots have the higher priority.
+
+```json
+{
+  "context": {
+    "configDirectory": ["/mnt/shared-config", "config"]
+  }
+}
+```
+
+The merge of each key can also be customized (`replace`, `append`, `merge_lists`), see `MergeEngine`.
+
+The parsed config of each directory is a layer of the stack group config (`LayeredConfig`), \
+    the layers are stored in a `ConfigCache` and shared by all the stack groups, so the parent \
+    directories are neither parsed again nor copied for each stack group. The identical subtrees \
+    of the layers can also be shared using a `ConfigInterner`, see `configIntern` context variable.
+
+The parsed files can also be persisted across synth runs using a `FileCache`, see `configCache` context variable.
+
+The config of all the directories can also be compiled ahead of time into a `ConfigArtifact`, \
+    see `ConfigCompiler` and `configArtifact` context variable.
+
+The config directories and their YAML files can be listed once with a `ConfigTreeIndex`, \
+    instead of probing the ancestor directories of each stack group.
+
+The config directories of a list of modules can be parsed ahead of time in an executor using `prefetch`, \
+    the stack groups pick up the prefetched directories when they load their config.
+
+When the `lazyIncludes` context variable is enabled, the included files are only parsed when \
+    the stack group reads them.
+
 """
 
 import os
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Tuple, TypeVar
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Set, Tuple, TypeVar
 
 import yaml
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.layered_config import LayeredConfig
+from cdk_organizer.loaders.merge_engine import MergeEngine
 from cdk_organizer.miscellaneous.yaml_tags.include_yaml import yaml_path_loader
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyInclude, materialize
 from constructs import IConstruct
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from cdk_organizer.loaders.config_artifact import ConfigArtifact
+    from cdk_organizer.loaders.config_interner import ConfigInterner
+    from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+    from cdk_organizer.loaders.file_cache import FileCache
+
 CDK_APP_TYPE = TypeVar('CDK_APP_TYPE', bound=IConstruct)
 
 
 class ConfigLoader(object):
     """Configuration Loader from YAML file to dict object based on the CDK Stack Groups."""
 
-    def __init__(self, app: CDK_APP_TYPE, env: str, region: str) -> None:
+    def __init__(
+        self,
+        app: CDK_APP_TYPE,
+        env: str,
+        region: str,
+        cache: Optional[ConfigCache] = None,
+        file_cache: Optional['FileCache'] = None,
+        interner: Optional['ConfigInterner'] = None,
+        merge_engine: Optional[MergeEngine] = None,
+        artifact: Optional['ConfigArtifact'] = None,
+        tree_index: Optional['ConfigTreeIndex'] = None
+    ) -> None:
         """
         Initialize the Configuration Loader.
 
@@ -63,74 +119,195 @@ class ConfigLoader(object):
             app (CDK_APP_TYPE): CDK App instance
             env (str): environment name
             region (str): region name
+            cache (ConfigCache, optional): shared config cache, a private one is created if not informed
+            file_cache (FileCache, optional): persistent parsed files cache
+            interner (ConfigInterner, optional): deduplicates the config subtrees of the parsed directories
+            merge_engine (MergeEngine, optional): shared merge engine, a private one is created if not informed
+            artifact (ConfigArtifact, optional): compiled config, the directories not covered by it are loaded from the files
+            tree_index (ConfigTreeIndex, optional): shared index of the config directories, the file system is probed if not informed
         """
         super().__init__()
 
         self.app = app
         self.env = env
         self.region = region
+        self.cache = cache if cache is not None else ConfigCache()
+        self.file_cache = file_cache
+        self.interner = interner
+        self.merge_engine = merge_engine if merge_engine is not None else MergeEngine()
+        self.artifact = artifact
+        self.tree_index = tree_index
         self._stack_dir = app.node.try_get_context("stacksDirectory") or "stacks"
-        self._config_dir = app.node.try_get_context("configDirectory") or "config"
+        self._config_dirs = config_directories(app)
+        self._config_dir = self._config_dirs[-1]
 
     def merge_dict(self, dict1: dict, dict2: dict, path=None) -> dict:
         """
-        Merge two dict objects.
+        Merge two dict objects, using the `merge_engine`.
+
+        The lazy included values are resolved when both dicts have the same key.
 
         Args:
             dict1 (dict): first dict object
             dict2 (dict): second dict object
-            path (list): dict property path
+            path (list): unused, kept for compatibility
         Returns:
             dict merged dict object
         """
-        if path is None:
-            path = []
-        for key in dict2:
-            if key in dict1:
-                if isinstance(dict1[key], dict) and isinstance(dict2[key], dict):
-                    self.merge_dict(dict1[key], dict2[key], path + [str(key)])
-                elif dict1[key] == dict2[key]:
-                    pass  # same leaf value
-                else:
-                    dict1[key] = dict2[key]
-            else:
-                dict1[key] = dict2[key]
-        return dict1
+        return self.merge_engine.merge(dict1, dict2)
 
-    def _load_config_recursive(self, path: Path, config: dict = {}) -> dict:
-        if not path.exists():
-            return self._load_config_recursive(path.parent, config)
+    def _load_file(self, path: str) -> Any:
+        if self.file_cache is not None:
+            data = self.file_cache.load_yaml(path)
         else:
-            for filename in os.listdir(path):
-                if fnmatch(filename, "*.yaml"):
-                    with open(os.path.join(path, filename), 'r') as file:
-                        file_data = yaml.load(file.read(), yaml_path_loader(os.path.join(path, filename)))
+            with open(path, 'r') as file:
+                data = yaml.load(file.read(), yaml_path_loader(path))
 
-                    config = self.merge_dict(file_data or {}, config)
+        return materialize(data) if isinstance(data, LazyInclude) else data
 
-            if str(path) != ".":
-                config = self._load_config_recursive(path.parent, config)
+    def _yaml_files(self, path: Path) -> Optional[List[str]]:
+        """Return the YAML files of a config directory, `None` when the directory doesn't exist."""
+        if self.tree_index is not None:
+            return self.tree_index.yaml_files(path)
 
-            return config
+        if not path.exists():
+            return None
 
-    def load_config(self, module: str) -> Tuple[dict, bool]:
+        return [os.path.join(path, filename) for filename in os.listdir(path) if fnmatch(filename, "*.yaml")]
+
+    def _load_directory_config(self, path: Path) -> dict:
+        config = {}
+        for filename in self._yaml_files(path) or []:
+            file_data = self._load_file(filename)
+            config = self.merge_dict(file_data or {}, config)
+
+        return config
+
+    def _load_config_recursive(self, path: Path, root: Path) -> Tuple[dict, ...]:
+        key = str(path)
+        layers = self.cache.get(key)
+        if layers is None:
+            parent_layers = () if path == root or path.parent == path else self._load_config_recursive(path.parent, root)
+            prefetch = self.cache.pop_prefetch(key)
+            if prefetch is not None:
+                config = prefetch.result()
+            elif self._exists(path):
+                config = self._load_directory_config(path)
+            else:
+                config = {}
+
+            if config and self.interner is not None:
+                config = self.interner.intern_layer(config)
+
+            layers = (config, ) + parent_layers if config else parent_layers
+            self.cache.set(key, layers)
+
+        return layers
+
+    def _load_module(self, module: str) -> Tuple[dict, ...]:
+        """Load the config layers of a module from all the config roots."""
+        layers: Tuple[dict, ...] = ()
+        for root in self._config_dirs:
+            layers = self._load_config_recursive(self._module_folder(module, root), Path(root)) + layers
+
+        return layers
+
+    def _exists(self, path: Path) -> bool:
+        return self.tree_index.exists(path) if self.tree_index is not None else path.exists()
+
+    def _file_exists(self, path: Path) -> bool:
+        return self.tree_index.has_file(path) if self.tree_index is not None else path.exists()
+
+    def _module_folder(self, module: str, root: Optional[str] = None) -> Path:
+        return Path(f'{root or self._config_dir}/{self.env}/{self.region}').joinpath(self.config_path(module))
+
+    def config_path(self, module: str) -> Path:
         """
-        Load the configuration from the YAML file to the dict object.
+        Get the config folder of a module, relative to the `<config>/<env>/<region>` directories.
 
         Args:
             module (str): module name
 
         Returns:
-            configuration object and if the module config exists.
+            relative config folder path
         """
         module_path = Path(module.replace(".", "/"))
         module_folder = module_path
         ignore_parts = self._stack_dir.count("/") + 1
         if not module_path.is_dir():
             module_folder = module_path.parent
-        module_folder = Path(f'{self._config_dir}/{self.env}/{self.region}').joinpath(Path(*module_folder.parts[ignore_parts:]))
-        module_config = module_folder.joinpath("config.yaml")
+        return Path(*module_folder.parts[ignore_parts:])
+
+    def prefetch(self, modules: Iterable[str], executor: 'Executor') -> None:
+        """
+        Parse the config directories of the modules ahead of time.
+
+        Each existing directory from the module config folder up to the config root is submitted once \
+            to the executor, and the result is picked up by `load_config`.
+
+        Args:
+            modules (Iterable[str]): module names
+            executor (Executor): executor used to parse the config directories
+        """
+        visited: Set[str] = set()
+        for module in modules:
+            for root in self._config_dirs:
+                path = self._module_folder(module, root)
+                while str(path) not in visited:
+                    key = str(path)
+                    visited.add(key)
+                    if not self.cache.contains(key) and self._exists(path):
+                        self.cache.add_prefetch(key, executor.submit(self._load_directory_config, path))
+
+                    if path == Path(root) or path.parent == path:
+                        break
+                    path = path.parent
+
+    def load_config(self, module: str) -> Tuple[dict, bool]:
+        """
+        Load the configuration from the YAML file to the dict object.
+
+        Args:
+            module (str): module name
+
+        Returns:
+            configuration object (`LayeredConfig`) and if the module config exists.
+        """
+        if self.artifact is not None:
+            compiled = self.artifact.load(self._module_folder(module))
+            if compiled is not None:
+                return LayeredConfig.from_layers((compiled[0], ), self.merge_engine), compiled[1]
+
+        return LayeredConfig.from_layers(self._load_module(module), self.merge_engine), self.config_exists(module)
+
+    def config_exists(self, module: str) -> bool:
+        """
+        Check if the module config (`config.yaml`) exists in any config root, without loading the config.
+
+        Args:
+            module (str): module name
+
+        Returns:
+            `True` if the module config exists.
+        """
+        return any(self._file_exists(self._module_folder(module, root).joinpath("config.yaml")) for root in self._config_dirs)
+
+
+def config_directories(app: CDK_APP_TYPE) -> List[str]:
+    """
+    Get the config roots of the `configDirectory` context variable.
+
+    The context can be a path or a list of paths (also as a string separated by `os.pathsep`), \
+        the later roots have the higher priority.
+
+    Args:
+        app (CDK_APP_TYPE): CDK App instance
 
-        config = self._load_config_recursive(module_folder)
+    Returns:
+        normalized config roots, from the lowest to the highest priority
+    """
+    config_dir = app.node.try_get_context("configDirectory") or "config"
+    if isinstance(config_dir, str):
+        config_dir = config_dir.split(os.pathsep)
 
-        return config, module_config.exists()
+    return [str(Path(root)) for root in config_dir if root]
@@ -0,0 +1,131 @@
+"""
+Config Tree Index.
+
+Lists the config directories and their YAML files with a single `os.scandir` walk of each \
+    config root, so the stack groups resolve which directories exist and which files \
+    are merged from memory, instead of probing each ancestor directory of each stack group.
+
+The directories outside of the config roots and the symbolic links to directories \
+    are listed on their first lookup.
+
+The index reflects the file system when it's built, it's created once per `StackGroupLoader` run.
+"""
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+class ConfigTreeIndex(object):
+    """
+    YAML files index of the config directories.
+
+    Args:
+        roots (str): config root paths
+
+    Attributes:
+        roots (Tuple[str, ...]): normalized config root paths
+        scans (int): number of `os.scandir` calls
+    """
+
+    def __init__(self, *roots: str) -> None:
+        """Walk the config roots."""
+        self.roots = tuple(str(Path(root)) for root in roots)
+        self.scans = 0
+        self._directories: Dict[str, Optional[List[str]]] = {}
+        self._links: List[str] = []
+
+        for root in self.roots:
+            pending = [] if root in self._directories else [root]
+            while pending:
+                pending.extend(self._scan(pending.pop()))
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        """
+        Check if a config directory exists.
+
+        Args:
+            path (Union[str, Path]): directory path
+
+        Returns:
+            `True` if the directory exists.
+        """
+        return self._lookup(str(path)) is not None
+
+    def yaml_files(self, path: Union[str, Path]) -> Optional[List[str]]:
+        """
+        List the YAML files of a config directory.
+
+        Args:
+            path (Union[str, Path]): directory path
+
+        Returns:
+            file paths in the file system order, `None` when the directory doesn't exist.
+        """
+        key = str(path)
+        names = self._lookup(key)
+        if names is None:
+            return None
+
+        return [os.path.join(key, name) for name in names]
+
+    def has_file(self, path: Union[str, Path]) -> bool:
+        """
+        Check if a YAML file exists in a config directory.
+
+        Args:
+            path (Union[str, Path]): file path, e.g. `config/dev/config.yaml`
+
+        Returns:
+            `True` if the file exists.
+        """
+        directory, name = os.path.split(str(path))
+        names = self._lookup(directory or '.')
+        return names is not None and name in names
+
+    def __len__(self) -> int:
+        """Return the number of existing directories."""
+        return sum(1 for names in self._directories.values() if names is not None)
+
+    def _lookup(self, key: str) -> Optional[List[str]]:
+        if key in self._directories:
+            return self._directories[key]
+
+        if self._walked(key):
+            # the config roots were fully walked, so the missing directories don't exist
+            return None
+
+        self._scan(key)
+        return self._directories[key]
+
+    def _walked(self, key: str) -> bool:
+        """Check if a directory is in a walked config root."""
+        walked = any(
+            (not os.path.isabs(key) and key.split(os.sep)[0] != os.pardir) if root == os.curdir else key.startswith(root.rstrip(os.sep) + os.sep)
+            for root in self.roots
+        )
+        return walked and not any(key == link or key.startswith(link + os.sep) for link in self._links)
+
+    def _scan(self, directory: str) -> List[str]:
+        """List a directory, storing its YAML files, and return its subdirectories, except the symbolic links."""
+        self.scans += 1
+        names = []
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = entry.name if directory == os.curdir else os.path.join(directory, entry.name)
+                    if entry.is_dir():
+                        if entry.is_symlink():
+                            self._links.append(path)
+                        else:
+                            subdirectories.append(path)
+                    elif fnmatch(entry.name, "*.yaml"):
+                        names.append(entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            self._directories[directory] = None
+            return []
+
+        self._directories[directory] = names
+        return subdirectories
@@ -0,0 +1,217 @@
+"""
+File Cache.
+
+Persistent cache of the parsed config files, enabled by the `configCache` context variable.
+
+The entries are keyed by the file path and content hash, and also store the hashes of all the files \
+    resolved by the `!include` and `!include_pattern` tags, so an entry is only used when none of \
+    its inputs changed. The entries are written atomically, so multiple synth processes can share \
+    the same cache directory.
+
+The entries are pickled, so the cache directory is created only accessible by the current user, \
+    and the directory and entries owned by other users are ignored (e.g. a shared `/tmp` directory).
+
+### Example:
+
+```bash
+cdk synth --context configCache=true
+cdk synth --context configCache=/tmp/cdk-organizer-cache --context configCacheMaxSize=134217728
+```
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader, yaml_path_loader
+
+CACHE_VERSION = 1
+# default cache directory, in the synth output directory
+CACHE_DIRECTORY = '.cdk-organizer-cache'
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+TEMP_FILE_TTL = 3600
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FileCache(object):
+    """
+    Persistent parsed YAML file cache.
+
+    Args:
+        directory (str): cache directory
+        max_size (int): maximum size in bytes of the cache directory, the least recently used entries are evicted by `prune`
+
+    Attributes:
+        hits (int): number of files loaded from the cache
+        misses (int): number of files parsed
+        trusted (bool): if the cache directory is owned by the current user, the cache is not used otherwise
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the cache."""
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.trusted = is_owned(os.stat(directory))
+        if not self.trusted:
+            LOGGER.debug(f'Ignoring config cache directory {directory}, not owned by the current user')
+
+    def load_yaml(self, path: str) -> Any:
+        """
+        Load a YAML config file from the cache, or parse and store it.
+
+        Args:
+            path (str): YAML file path
+
+        Returns:
+            parsed file content
+        """
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        mode = b'lazy' if IncludeLoader.lazy_includes else b'eager'
+        entry_path = os.path.join(self.directory, f'{self._hash(os.path.abspath(path).encode(), mode, content)}.pickle')
+        entry = self._read_entry(entry_path)
+        if entry is not None and self._is_valid(entry):
+            with self._lock:
+                self.hits += 1
+            return entry['data']
+
+        with self._lock:
+            self.misses += 1
+        loader = yaml_path_loader(path)(content)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+
+        self._write_entry(entry_path, {
+            'dependencies': self._hash_files(loader.dependencies),
+            'patterns': loader.patterns,
+            'data': data
+        })
+        return data
+
+    def prune(self) -> None:
+        """Evict the least recently used entries until the cache directory fits the `max_size`."""
+        if not self.trusted:
+            return
+
+        entries: List[Tuple[float, int, str]] = []
+        total_size = 0
+        with os.scandir(self.directory) as directory:
+            for entry in directory:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                if entry.name.endswith('.pickle'):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+                elif entry.name.endswith('.tmp') and stat.st_mtime < time.time() - TEMP_FILE_TTL:
+                    self._remove(entry.path)
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            self._remove(path)
+            total_size -= size
+
+    def _is_valid(self, entry: dict) -> bool:
+        for path, digest in entry['dependencies'].items():
+            try:
+                with open(path, 'rb') as file:
+                    if self._hash(file.read()) != digest:
+                        return False
+            except OSError:
+                return False
+
+        for pattern, filenames in entry['patterns']:
+            if sorted(glob.glob(pattern)) != filenames:
+                return False
+
+        return True
+
+    def _hash_files(self, paths: List[str]) -> Dict[str, str]:
+        hashes = {}
+        for path in paths:
+            if path not in hashes:
+                with open(path, 'rb') as file:
+                    hashes[path] = self._hash(file.read())
+
+        return hashes
+
+    def _hash(self, *parts: bytes) -> str:
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        for part in parts:
+            digest.update(b'\0')
+            digest.update(part)
+
+        return digest.hexdigest()
+
+    def _read_entry(self, entry_path: str) -> Optional[dict]:
+        if not self.trusted:
+            return None
+
+        try:
+            with open(entry_path, 'rb') as file:
+                if not is_owned(os.fstat(file.fileno())):
+                    LOGGER.debug(f'Ignoring config cache entry {entry_path}, not owned by the current user')
+                    return None
+
+                entry = pickle.load(file)
+
+            os.utime(entry_path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            LOGGER.debug(f'Ignoring invalid config cache entry {entry_path}: {error}')
+            return None
+
+    def _write_entry(self, entry_path: str, entry: dict) -> None:
+        if not self.trusted:
+            return
+
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as file:
+                temp_path = file.name
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_path, entry_path)
+        except Exception as error:
+            LOGGER.debug(f'Unable to write config cache entry {entry_path}: {error}')
+            if temp_path:
+                self._remove(temp_path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def is_owned(stat: os.stat_result) -> bool:
+    """
+    Check if a file is owned by the current user, always `True` on the platforms without user ids (Windows).
+
+    Args:
+        stat (os.stat_result): file status
+
+    Returns:
+        bool: if the file can be trusted
+    """
+    return not hasattr(os, 'getuid') or stat.st_uid == os.getuid()
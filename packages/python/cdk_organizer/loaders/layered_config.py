@@ -0,0 +1,137 @@
+"""
+Layered Config.
+
+The config of a stack group is the merge of the config directories from the root `config` folder \
+    down to the stack group folder. Instead of merging copies of the parent directories, \
+    `LayeredConfig` keeps a reference to the parsed config of each directory (layer), \
+    which are shared by all the stack groups, and resolves each key on its first access.
+
+The keys are resolved with the same rules of the `MergeEngine`:
+
+- The value of the highest priority layer defining the key wins.
+- When the value is a `dict`, it's merged with the `dict` values of the lower priority layers, \
+    unless the key strategy is `replace`, the other values of the lower priority layers are replaced.
+- When the value is a `list` and the key strategy is `append` or `merge_lists`, it's merged \
+    with the `list` values of the lower priority layers, the other values are replaced.
+
+So the result is the same of merging each layer into the next lower priority one, from the stack group \
+    folder up to the root folder, e.g. a `dict` value is merged with the `dict` values of the grandparent \
+    folders even if the parent folder replaces it with a scalar value.
+
+The `__merge__` keys declaring the strategies are not part of the config.
+
+The merged `dict` values are also `LayeredConfig` objects, and the `list` values are copied, \
+    so writing to the config never changes the shared layers (copy-on-write).
+
+`copy.deepcopy` and `pickle` return plain `dict` objects.
+"""
+
+import copy
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from cdk_organizer.loaders.merge_engine import APPEND, MERGE_LISTS, REPLACE, STRATEGIES_KEY, MergeEngine
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyConfig, LazyInclude
+
+if TYPE_CHECKING:
+    from cdk_organizer.loaders.merge_engine import StrategyTree
+
+MUTABLE_TYPES = (dict, list, set, LazyInclude)
+
+
+class LayeredConfig(LazyConfig):
+    """
+    Config dict resolving the keys through a chain of shared layers.
+
+    Accepts the same arguments as `dict`, use `from_layers` to create a config from the layers.
+
+    Attributes:
+        layers (Tuple[dict, ...]): config layers, from the highest to the lowest priority, they must not be mutated
+        engine (MergeEngine): merge engine providing the strategies of the keys
+        strategies (StrategyTree): loader strategies of the keys
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the config."""
+        super().__init__(*args, **kwargs)
+        self.layers: Tuple[dict, ...] = ()
+        self.engine: Optional[MergeEngine] = None
+        self.strategies: 'StrategyTree' = {}
+        self._declared: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_layers(
+        cls,
+        layers: Sequence[dict],
+        engine: Optional[MergeEngine] = None,
+        strategies: Optional['StrategyTree'] = None
+    ) -> 'LayeredConfig':
+        """
+        Create a config from the layers.
+
+        Args:
+            layers (Sequence[dict]): config layers, from the highest to the lowest priority
+            engine (MergeEngine, optional): merge engine, a default one is created if not informed
+            strategies (StrategyTree, optional): loader strategies of the keys, defaults to the engine config root strategies
+
+        Returns:
+            config object
+        """
+        config = cls()
+        config.layers = tuple(layers)
+        config.engine = engine if engine is not None else MergeEngine()
+        config.strategies = config.engine.strategies if strategies is None else strategies
+
+        # the keys keep the order of the merged dict, the lowest priority layers first
+        for layer in reversed(config.layers):
+            for key, value in layer.items():
+                if key != STRATEGIES_KEY:
+                    dict.__setitem__(config, key, value)
+
+        config._pending = {key for key, value in dict.items(config) if isinstance(value, MUTABLE_TYPES)}
+        return config
+
+    def _resolve(self, key: Any) -> Any:
+        if not self.layers:
+            return super()._resolve(key)
+
+        if self._declared is None:
+            self._declared = self.engine.declared_strategies(*self.layers)
+
+        strategy, children = self.engine.strategy(key, self.strategies, self._declared)
+        values = self._values(key)
+        top = next(values)
+        if isinstance(top, dict) and strategy != REPLACE:
+            dicts = [top] + [value for value in values if isinstance(value, dict)]
+
+            if len(dicts) > 1:
+                self.engine.stats.dicts += 1
+            return LayeredConfig.from_layers(dicts, self.engine, children)
+
+        if isinstance(top, list) and strategy in (APPEND, MERGE_LISTS):
+            result = copy.deepcopy(top)
+            for value in values:
+                if not isinstance(value, list):
+                    continue
+
+                if strategy == APPEND:
+                    result = copy.deepcopy(value) + result
+                    self.engine.stats.appended += 1
+                else:
+                    result = self.engine.merge_lists(copy.deepcopy(value), result, children)
+            return result
+
+        return copy.deepcopy(top)
+
+    def _values(self, key: Any) -> Iterator[Any]:
+        """Iterate the values of a key, from the highest to the lowest priority layer."""
+        for layer in self.layers:
+            if key in layer:
+                value = layer[key]
+                if isinstance(value, LazyInclude):
+                    # the resolved value is a new object, so it replaces the placeholder in the shared layer
+                    value = layer[key] = value.resolve()
+                yield value
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Callable[..., dict], Tuple[dict]]:
+        """Copy and pickle the config as a plain `dict`."""
+        return dict, (dict(self.items()), )
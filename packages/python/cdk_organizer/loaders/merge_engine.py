@@ -0,0 +1,216 @@
+"""
+Merge Engine.
+
+Merges the config objects with per key strategies:
+
+- `merge`: the `dict` values are merged recursively, default for `dict` values.
+- `replace`: the higher priority value replaces the lower priority one, default for the other values.
+- `append`: the higher priority `list` is appended to the lower priority one.
+- `merge_lists`: the `list` items are merged by index, the `dict` items are merged recursively.
+
+The strategies are only applied when both values have the expected types, otherwise the default rules are used.
+
+The strategies can be declared in the YAML files, using the `__merge__` key of the mapping holding the keys:
+
+```yaml
+__merge__:
+  subnets: append
+subnets:
+  - 10.0.0.0/24
+```
+
+Or by the loader, using the dotted path of the keys from the config root, see `configMergeStrategies` context variable:
+
+```json
+{
+  "context": {
+    "configMergeStrategies": {
+      "network.subnets": "append"
+    }
+  }
+}
+```
+
+The strategies declared by the higher priority config win. The merge is iterative and only walks the \
+    higher priority config, the replaced values are neither compared nor copied.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyInclude, materialize
+
+MERGE = 'merge'
+REPLACE = 'replace'
+APPEND = 'append'
+MERGE_LISTS = 'merge_lists'
+STRATEGIES = (MERGE, REPLACE, APPEND, MERGE_LISTS)
+
+STRATEGIES_KEY = '__merge__'
+
+# strategy and children of each key
+StrategyTree = Dict[str, Tuple[Optional[str], dict]]
+
+
+@dataclass
+class MergeStats:
+    """
+    Merge statistics.
+
+    Attributes:
+        dicts (int): number of merged `dict` objects
+        added (int): number of keys only defined by the higher priority config
+        replaced (int): number of values replaced by the higher priority config
+        appended (int): number of `list` values merged by the `append` strategy
+        merged_lists (int): number of `list` values merged by the `merge_lists` strategy
+    """
+
+    dicts: int = 0
+    added: int = 0
+    replaced: int = 0
+    appended: int = 0
+    merged_lists: int = 0
+
+
+class MergeEngine(object):
+    """
+    Config merge engine.
+
+    Args:
+        strategies (Dict[str, str], optional): strategies by the dotted path of the keys, from the config root
+
+    Attributes:
+        strategies (StrategyTree): strategies tree of the config root
+        stats (MergeStats): merge statistics
+    """
+
+    def __init__(self, strategies: Optional[Dict[str, str]] = None) -> None:
+        """Initialize the engine."""
+        self.strategies: StrategyTree = {}
+        self.stats = MergeStats()
+        for path, strategy in (strategies or {}).items():
+            self._add_strategy(path, strategy)
+
+    def merge(self, base: dict, override: dict, strategies: Optional[StrategyTree] = None) -> dict:
+        """
+        Merge a higher priority config into a lower priority one.
+
+        Args:
+            base (dict): lower priority config, it's updated
+            override (dict): higher priority config, its values are assigned to the base config without copying them
+            strategies (StrategyTree, optional): strategies tree of the merged objects, defaults to the config root
+
+        Returns:
+            the base config object
+        """
+        stack: List[Tuple[dict, dict, StrategyTree]] = [(base, override, self.strategies if strategies is None else strategies)]
+        while stack:
+            target, source, tree = stack.pop()
+            self.stats.dicts += 1
+            declared = self.declared_strategies(source, target)
+            for key, value in source.items():
+                if key not in target:
+                    target[key] = value
+                    self.stats.added += 1
+                    continue
+
+                current = target[key]
+                if isinstance(current, LazyInclude):
+                    current = target[key] = materialize(current)
+                if isinstance(value, LazyInclude):
+                    value = materialize(value)
+
+                strategy, children = self.strategy(key, tree, declared)
+                if strategy != REPLACE and isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value, children))
+                elif strategy == APPEND and isinstance(current, list) and isinstance(value, list):
+                    target[key] = current + value
+                    self.stats.appended += 1
+                elif strategy == MERGE_LISTS and isinstance(current, list) and isinstance(value, list):
+                    stack.extend(self._merge_lists(current, value, children))
+                else:
+                    target[key] = value
+                    self.stats.replaced += 1
+
+        return base
+
+    def merge_lists(self, base: list, override: list, strategies: Optional[StrategyTree] = None) -> list:
+        """
+        Merge a higher priority list into a lower priority one by index.
+
+        Args:
+            base (list): lower priority list, it's updated
+            override (list): higher priority list, its items are assigned to the base list without copying them
+            strategies (StrategyTree, optional): strategies tree of the `dict` items
+
+        Returns:
+            the base list object
+        """
+        for target, source, children in self._merge_lists(base, override, strategies or {}):
+            self.merge(target, source, children)
+
+        return base
+
+    def strategy(self, key: str, tree: StrategyTree, declared: Dict[str, str]) -> Tuple[Optional[str], StrategyTree]:
+        """
+        Get the strategy of a key.
+
+        Args:
+            key (str): config key
+            tree (StrategyTree): strategies tree of the mapping holding the key
+            declared (Dict[str, str]): strategies declared by the `__merge__` key of the mapping
+
+        Returns:
+            strategy (`None` for the default rules) and the strategies tree of the key value
+        """
+        strategy, children = tree.get(key, (None, {}))
+        return declared.get(key, strategy), children
+
+    def declared_strategies(self, *configs: Any) -> Dict[str, str]:
+        """
+        Get the strategies declared by the `__merge__` key, the first config has the highest priority.
+
+        Args:
+            configs (Any): config objects
+
+        Returns:
+            strategies by key
+        """
+        declared: Dict[str, str] = {}
+        for config in reversed(configs):
+            strategies = config.get(STRATEGIES_KEY) if isinstance(config, dict) else None
+            if isinstance(strategies, LazyInclude):
+                strategies = materialize(strategies)
+            if isinstance(strategies, dict):
+                for key, strategy in strategies.items():
+                    declared[key] = self._validate(strategy, key)
+
+        return declared
+
+    def _merge_lists(self, base: list, override: list, strategies: StrategyTree) -> List[Tuple[dict, dict, StrategyTree]]:
+        self.stats.merged_lists += 1
+        nested = []
+        for index, value in enumerate(override):
+            if index >= len(base):
+                base.append(value)
+            elif isinstance(base[index], dict) and isinstance(value, dict):
+                nested.append((base[index], value, strategies))
+            else:
+                base[index] = value
+
+        return nested
+
+    def _add_strategy(self, path: str, strategy: str) -> None:
+        tree = self.strategies
+        keys = path.split('.')
+        for key in keys[:-1]:
+            tree = tree.setdefault(key, (None, {}))[1]
+
+        tree[keys[-1]] = (self._validate(strategy, path), tree.get(keys[-1], (None, {}))[1])
+
+    def _validate(self, strategy: str, key: str) -> str:
+        if strategy not in STRATEGIES:
+            raise InfraRuntimeException(f"Invalid merge strategy '{strategy}' for '{key}', expected one of {', '.join(STRATEGIES)}")
+
+        return strategy
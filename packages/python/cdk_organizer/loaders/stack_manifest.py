@@ -0,0 +1,302 @@
+"""
+Stack Manifest.
+
+Discovers the stack groups of the stack files by parsing their source (`ast`), without importing them, \
+    so `StackGroupLoader.synth` only imports the files defining stack groups, and imports them \
+    after the stack files they depend on (imports and `resolve_group` targets).
+
+A stack group class is a class whose base name ends with `StackGroup` (e.g. `StackGroup[MyConfig]`, \
+    `stack_group.StackGroup[cdktf.App, MyConfig]`, `ProjectStackGroup` or an alias imported from a `StackGroup` name), \
+    or whose base is a stack group class of the stack files, so the project base classes can be defined in the \
+    stack files with any name.
+
+The classes whose bases can't be resolved statically, e.g. a project base class defined outside the stack files \
+    (`lib/base.py`) or in an installed package, are also handled as stack groups, so their files are imported. \
+    Only the builtin classes, the classes of the standard library and CDK modules (`LIBRARY_MODULES`) and \
+    the classes of the stack files are known not to be stack groups. The files with syntax errors are always imported.
+
+The manifest is enabled by the `stackManifest` context variable and persisted in a file, each file entry is keyed by \
+    the file modification time and size, and by its content hash when they changed, \
+    so only the new and changed files are parsed again.
+
+### Example:
+
+```bash
+cdk synth --context stackManifest=true
+cdk synth --context stackManifest=cdk.out/stack-manifest.json
+```
+"""
+
+import ast
+import builtins
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
+
+from cdk_organizer.loaders.config_artifact import hash_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MANIFEST_VERSION = 2
+# manifest file name, in the cache directory
+MANIFEST_FILE = 'stack-manifest.json'
+STACK_GROUP_CLASS = 'StackGroup'
+
+# top level modules whose classes aren't stack groups, unless their name ends with `StackGroup`
+LIBRARY_MODULES = frozenset(sys.builtin_module_names) | frozenset(getattr(sys, 'stdlib_module_names', ())) | {
+    'abc', 'collections', 'dataclasses', 'enum', 'typing', 'typing_extensions',
+    'aws_cdk', 'constructs', 'cdktf', 'cdk_organizer'
+}
+
+LOGGER = logging.getLogger(__name__)
+
+
+class StackManifest(object):
+    """
+    Stack groups manifest of the stack files.
+
+    Args:
+        path (str, optional): manifest file path, the manifest is not persisted if not informed
+
+    Attributes:
+        files (Dict[str, dict]): manifest entries by stack file path, with the module name (`module`), \
+            module level classes and their base names (`classes`), imported modules (`imports`) and \
+            `resolve_group` targets (`resolves`, `<module>.<class>` names)
+        parsed (int): number of parsed stack files
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initialize the manifest, reading the persisted entries."""
+        self.path = path
+        self.files: Dict[str, dict] = {}
+        self.parsed = 0
+        self._previous = self._read() if path else {}
+        self._stack_groups: Dict[str, Optional[List[str]]] = {}
+
+    def discover(self, modules: Dict[str, 'Path']) -> List[str]:
+        """
+        Discover the stack groups of the stack files.
+
+        Args:
+            modules (Dict[str, Path]): stack files by module name
+
+        Returns:
+            module names of the stack files defining stack groups, the dependencies before their dependents.
+        """
+        for module_name, file in modules.items():
+            self.files[str(file)] = self._entry(module_name, str(file))
+
+        entries = {entry['module']: entry for entry in self.files.values() if entry['module'] in modules}
+        self._find_stack_groups(entries)
+        order: List[str] = []
+        visited: Set[str] = set()
+        for module_name in modules:
+            self._visit(module_name, entries, visited, order)
+
+        return [module_name for module_name in order if self._stack_groups[module_name] is None or self._stack_groups[module_name]]
+
+    def stack_groups(self, file: 'Path') -> Optional[List[str]]:
+        """
+        Get the stack group class names of a stack file.
+
+        Args:
+            file (Path): stack file path
+
+        Returns:
+            sorted class names, including the base classes and the classes whose bases can't be resolved, \
+                `None` when the file can't be parsed.
+        """
+        return self._stack_groups[self.files[str(file)]['module']]
+
+    def save(self) -> None:
+        """Write the manifest file, when it's persisted."""
+        if not self.path or self.files == self._previous:
+            return
+
+        directory = os.path.dirname(self.path) or '.'
+        temp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as file:
+                temp_path = file.name
+                json.dump({'version': MANIFEST_VERSION, 'files': self.files}, file, sort_keys=True, separators=(',', ':'))
+
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+            self._previous = dict(self.files)
+        except Exception as error:
+            LOGGER.debug(f'Unable to write stack manifest {self.path}: {error}')
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r') as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as error:
+            LOGGER.debug(f'Ignoring invalid stack manifest {self.path}: {error}')
+            return {}
+
+        return manifest['files'] if manifest.get('version') == MANIFEST_VERSION else {}
+
+    def _entry(self, module_name: str, path: str) -> dict:
+        """Get the manifest entry of a stack file, parsing it when it's new or changed."""
+        stat = os.stat(path)
+        previous = self.files.get(path) or self._previous.get(path)
+        if previous is not None and previous['module'] == module_name:
+            if previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+                return previous
+
+            digest = hash_file(path)
+            if previous['hash'] == digest:
+                return dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            digest = hash_file(path)
+
+        self.parsed += 1
+        entry = {'module': module_name, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+        with open(path, 'rb') as file:
+            source = file.read()
+
+        try:
+            tree = ast.parse(source, path)
+        except (SyntaxError, ValueError):
+            return dict(entry, classes=None, imports=[], resolves=[])
+
+        return dict(entry, **_SourceAnalyzer(module_name, path).analyze(tree))
+
+    def _find_stack_groups(self, entries: Dict[str, dict]) -> None:
+        """Find the stack group classes of each module, following the base classes of the stack files."""
+        # the classes of the packages are named by their module key (local names) and their package (imported names)
+        modules = {module: module_name for module_name in entries for module in (module_name, _import_name(module_name))}
+        bases = {
+            f'{module}.{name}': class_bases
+            for module, module_name in modules.items()
+            for name, class_bases in (entries[module_name]['classes'] or {}).items()
+        }
+        found: Dict[str, bool] = {}
+
+        def is_stack_group(name: str) -> bool:
+            if name not in found:
+                found[name] = False  # inheritance cycles
+                module, _, class_name = name.rpartition('.')
+                if class_name.endswith(STACK_GROUP_CLASS):
+                    found[name] = True
+                elif name in bases:
+                    found[name] = any(is_stack_group(base) for base in bases[name])
+                elif module in modules:
+                    # not a class of the module, unless it's a builtin class (e.g. `Exception`)
+                    found[name] = not hasattr(builtins, class_name)
+                else:
+                    found[name] = module.split('.')[0] not in LIBRARY_MODULES
+            return found[name]
+
+        for module_name, entry in entries.items():
+            if entry['classes'] is None:
+                self._stack_groups[module_name] = None
+            else:
+                self._stack_groups[module_name] = sorted(
+                    name for name, class_bases in entry['classes'].items() if any(is_stack_group(base) for base in class_bases)
+                )
+
+    def _visit(self, module_name: str, entries: Dict[str, dict], visited: Set[str], order: List[str]) -> None:
+        """Add a module after its dependencies (depth first), the import cycles keep the discovery order."""
+        if module_name in visited:
+            return
+
+        visited.add(module_name)
+        entry = entries[module_name]
+        dependencies = entry['imports'] + [name.rsplit('.', 1)[0] for name in entry['resolves']]
+        for dependency in dependencies:
+            if dependency in entries:
+                self._visit(dependency, entries, visited, order)
+
+        order.append(module_name)
+
+
+def _import_name(module_name: str) -> str:
+    """Return the import name of a module, the `<package>.__init__` modules are imported as `<package>`."""
+    return module_name[:-len('.__init__')] if module_name.endswith('.__init__') else module_name
+
+
+class _SourceAnalyzer(object):
+    """Finds the classes, imports and `resolve_group` targets of a stack file syntax tree."""
+
+    def __init__(self, module_name: str, path: str) -> None:
+        self.module_name = module_name
+        self.package = module_name.rsplit('.', 1)[0] if os.path.basename(path) != '__init__.py' else module_name
+        self.names: Dict[str, str] = {}
+
+    def analyze(self, tree: ast.Module) -> Dict[str, Any]:
+        imports = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.append(alias.name)
+                    self.names[alias.asname or alias.name.split('.')[0]] = alias.name if alias.asname else alias.name.split('.')[0]
+            elif isinstance(node, ast.ImportFrom):
+                module = self._absolute_module(node.module, node.level)
+                if module is None:
+                    continue
+
+                imports.append(module)
+                for alias in node.names:
+                    imports.append(f'{module}.{alias.name}')
+                    self.names[alias.asname or alias.name] = f'{module}.{alias.name}'
+
+        classes = {}
+        resolves = []
+        for node in self._module_statements(tree.body):
+            if isinstance(node, ast.ClassDef):
+                bases = (self._qualified_name(base.value if isinstance(base, ast.Subscript) else base) for base in node.bases)
+                classes[node.name] = sorted({base for base in bases if base is not None})
+                resolves.extend(self._resolve_targets(node))
+
+        return {
+            'classes': classes,
+            'imports': sorted(set(imports)),
+            'resolves': sorted(set(resolves))
+        }
+
+    def _module_statements(self, body: List[ast.stmt]) -> Iterator[ast.stmt]:
+        """Iterate the module level statements, including the conditional blocks."""
+        for node in body:
+            yield node
+            if isinstance(node, (ast.If, ast.Try, ast.With)):
+                yield from self._module_statements(node.body)
+                yield from self._module_statements(getattr(node, 'orelse', []))
+                yield from self._module_statements(getattr(node, 'finalbody', []))
+                for handler in getattr(node, 'handlers', []):
+                    yield from self._module_statements(handler.body)
+
+    def _absolute_module(self, module: Optional[str], level: int) -> Optional[str]:
+        if not level:
+            return module
+
+        parts = self.package.split('.')
+        if level - 1 >= len(parts):
+            return None
+
+        package = '.'.join(parts[:len(parts) - level + 1])
+        return f'{package}.{module}' if module else package
+
+    def _resolve_targets(self, class_node: ast.ClassDef) -> Iterator[str]:
+        for node in ast.walk(class_node):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'resolve_group' and node.args:
+                target = self._qualified_name(node.args[0])
+                if target is not None:
+                    yield target
+
+    def _qualified_name(self, node: ast.expr) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return self.names.get(node.id, f'{self.module_name}.{node.id}')
+        if isinstance(node, ast.Attribute):
+            value = self._qualified_name(node.value)
+            return f'{value}.{node.attr}' if value is not None else None
+        return None
@@ -0,0 +1,185 @@
+"""
+Include Cache.
+
+Keeps the content of the files resolved by the `!include` and `!include_pattern` tags, so a file \
+    included many times (e.g. a shared `tags.yaml`) is read, rendered and parsed only once per process.
+
+The entries are keyed by the absolute file path, the `params` hash and the file modification time \
+    and size, the nested included files are also checked before using an entry.
+
+The cache size is limited by the size of the source files of the entries (`max_size` bytes), \
+    the least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from cdk_organizer.miscellaneous.yaml_tags.pattern_index import PATTERN_INDEX
+
+if TYPE_CHECKING:
+    import yaml
+
+DEFAULT_MAX_SIZE = 32 * 1024 * 1024
+
+CacheKey = Tuple[str, str, int, int]
+
+
+@dataclass
+class IncludeCacheEntry:
+    """
+    Include cache entry.
+
+    Attributes:
+        value (Any): included file content, must not be mutated
+        dependencies (List[str]): nested included files
+        patterns (List[Tuple[str, List[str]]]): nested glob patterns and the matched files
+        anchors (Dict[str, yaml.Node]): anchors defined by the included file and its nested included files
+        stats (Dict[str, Tuple[int, int]]): modification time and size of the nested included files
+        size (int): size of the source files
+    """
+
+    value: Any
+    dependencies: List[str] = field(default_factory=list)
+    patterns: List[Tuple[str, List[str]]] = field(default_factory=list)
+    anchors: Dict[str, 'yaml.Node'] = field(default_factory=dict)
+    stats: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    size: int = 0
+
+
+class IncludeCache(object):
+    """
+    LRU cache of included files content.
+
+    Args:
+        max_size (int): maximum size in bytes of the source files of the entries, `0` disables the cache
+
+    Attributes:
+        hits (int): number of includes served from the cache
+        misses (int): number of includes not found in the cache
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: 'OrderedDict[CacheKey, IncludeCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, params: dict) -> Optional[IncludeCacheEntry]:
+        """
+        Get the entry of an included file.
+
+        Args:
+            path (str): included file path
+            params (dict): include params
+
+        Returns:
+            cache entry or `None` when the file is not cached or changed.
+        """
+        key = self._key(path, params)
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None or not self._is_valid(entry):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def contains(self, path: str, params: dict) -> bool:
+        """
+        Check if an included file is cached, without validating the entry or updating the counters.
+
+        Args:
+            path (str): included file path
+            params (dict): include params
+
+        Returns:
+            `True` if the file is cached.
+        """
+        key = self._key(path, params)
+        return key is not None and key in self._entries
+
+    def set(self, path: str, params: dict, entry: IncludeCacheEntry) -> None:
+        """
+        Store the entry of an included file.
+
+        Args:
+            path (str): included file path
+            params (dict): include params
+            entry (IncludeCacheEntry): cache entry
+        """
+        if self.max_size <= 0:
+            return
+
+        key = self._key(path, params)
+        entry.stats = {dependency: self._stat(dependency) for dependency in entry.dependencies}
+        entry.size = sum(stat[1] for stat in entry.stats.values() if stat is not None)
+        if key is None or entry.size + key[3] > self.max_size:
+            return
+
+        entry.size += key[3]
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self) -> None:
+        """Remove all the entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached files."""
+        return len(self._entries)
+
+    def _key(self, path: str, params: dict) -> Optional[CacheKey]:
+        stat = self._stat(path)
+        if stat is None:
+            return None
+
+        params_hash = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return os.path.abspath(path), params_hash, stat[0], stat[1]
+
+    def _stat(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_valid(self, entry: IncludeCacheEntry) -> bool:
+        for dependency, stat in entry.stats.items():
+            if stat is None or self._stat(dependency) != stat:
+                return False
+
+        for pattern, filenames in entry.patterns:
+            if PATTERN_INDEX.glob(pattern) != filenames:
+                return False
+
+        return True
+
+
+INCLUDE_CACHE = IncludeCache()
@@ -1,13 +1,43 @@
 """Include YAML tag constructor."""
 
-import glob
-import json
+import copy
 import os
 import pathlib
-from typing import IO, Any
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Set, Tuple
 
 import yaml
+from cdk_organizer.miscellaneous.yaml_tags.include_cache import INCLUDE_CACHE, IncludeCacheEntry
+from cdk_organizer.miscellaneous.yaml_tags.json_include import load_json_file, resolve_json_pointer
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyInclude, materialize
+from cdk_organizer.miscellaneous.yaml_tags.merge_yaml import construct_merge
+from cdk_organizer.miscellaneous.yaml_tags.pattern_index import PATTERN_INDEX
 from jinja2 import BaseLoader, Environment, StrictUndefined, UndefinedError
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import AliasEvent
+from yaml.parser import Parser
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+from yaml.scanner import Scanner
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+    from yaml.nodes import Node
+
+try:
+    from yaml.cyaml import CParser
+except ImportError:  # pragma: no cover
+    CParser = None
+
+TEMPLATE_MARKERS = ('{{', '{%', '{#')
+TEMPLATE_CACHE_SIZE = 256
+
+TEMPLATE_ENVIRONMENT = Environment(
+    loader=BaseLoader,
+    undefined=StrictUndefined,
+    autoescape=True
+)
 
 
 def custom_compose_document(self):
@@ -21,7 +51,166 @@ def custom_compose_document(self):
 yaml.SafeLoader.compose_document = custom_compose_document
 
 
-def yaml_path_loader(path: str) -> yaml.SafeLoader:
+class IncludeComposer(Composer):
+    """
+    YAML Composer which keeps the anchors between documents, so they can be shared with the included files.
+
+    It also tracks the anchors defined by the document (`local_anchors`) and the anchors of the \
+        including files referred by the document or its included files (`parent_anchors`).
+    """
+
+    compose_document = custom_compose_document
+
+    def __init__(self) -> None:
+        """Initialize the composer."""
+        super().__init__()
+        self.local_anchors: Set[str] = set()
+        self.parent_anchors: Set[str] = set()
+
+    @property
+    def uses_parent_anchors(self) -> bool:
+        """If the document refers to anchors defined by the including files."""
+        return bool(self.parent_anchors)
+
+    def compose_node(self, parent: Optional['Node'], index: Any) -> 'Node':
+        """Compose a node, tracking the anchors and aliases."""
+        event = self.peek_event()
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self.local_anchors:
+                self.parent_anchors.add(event.anchor)
+        elif event.anchor is not None:
+            self.local_anchors.add(event.anchor)
+
+        return super().compose_node(parent, index)
+
+
+if CParser is not None:
+    class _BaseIncludeLoader(IncludeComposer, CParser, SafeConstructor, Resolver):
+        """Safe YAML Loader using the libyaml parser and the Python composer."""
+
+        def __init__(self, stream: Any) -> None:
+            CParser.__init__(self, stream)
+            IncludeComposer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:  # pragma: no cover
+    class _BaseIncludeLoader(Reader, Scanner, Parser, IncludeComposer, SafeConstructor, Resolver):
+        """Safe YAML Loader, used when PyYAML is not compiled with libyaml."""
+
+        def __init__(self, stream: Any) -> None:
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+            IncludeComposer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+
+class IncludeLoader(_BaseIncludeLoader):
+    """
+    Safe YAML Loader supporting the `!include`, `!include_pattern` and `!merge` tags.
+
+    The constructors are registered once in the class, and the directory used to resolve \
+        the included files is kept in the instance, see `yaml_path_loader`.
+
+    When PyYAML is compiled with libyaml the events are parsed by the C parser, the nodes are \
+        still composed in Python to share the anchors with the included files.
+
+    When `lazy_includes` is enabled (`lazyIncludes` context variable), the included files are \
+        only read when the value is accessed, see `LazyInclude`.
+
+    Args:
+        stream (Any): YAML content
+        path (str): YAML file path, used to resolve the relative included files
+
+    Attributes:
+        lazy_includes (bool): class attribute, return `LazyInclude` placeholders for the `!include` and `!include_pattern` tags
+        dependencies (List[str]): files resolved by the `!include` and `!include_pattern` tags
+        patterns (List[Tuple[str, List[str]]]): glob patterns resolved by the `!include_pattern` tags and the matched files
+    """
+
+    lazy_includes = False
+
+    def __init__(self, stream: Any, path: str) -> None:
+        """Initialize the loader."""
+        self._root = os.path.dirname(path)
+        self.dependencies: List[str] = []
+        self.patterns: List[Tuple[str, List[str]]] = []
+        super().__init__(stream)
+
+
+def construct_include_pattern(loader: IncludeLoader, node: yaml.Node) -> Any:
+    """
+    YAML !include_pattern tag constructor.
+
+    The pattern is resolved by the `PATTERN_INDEX`, the files are included in path order \
+        and the files not found in the `INCLUDE_CACHE` are read in parallel.
+
+    Args:
+        loader (IncludeLoader): YAML loader instance
+        node (yaml.Node): YAML node
+
+    Returns:
+        list with the content of the matched files
+    """
+    params = {}
+    pattern = None
+    if isinstance(node.value, str):
+        pattern = loader.construct_scalar(node)
+    else:
+        value = loader.construct_mapping(node, True)
+        if 'pattern' not in value:
+            raise yaml.constructor.ConstructorError(None, None, f'expected a pattern, but found {value}', node.start_mark)
+
+        pattern = value['pattern']
+        params = value.get('params', {})
+
+    pattern_path = os.path.join(loader._root, pattern)
+    if loader.lazy_includes:
+        return LazyInclude(partial(load_lazy_include, resolve_pattern_content, pattern_path, params, capture_anchors(loader)))
+
+    return resolve_pattern_content(pattern_path, loader, params)
+
+
+def construct_include(loader: IncludeLoader, node: yaml.Node) -> Any:
+    """
+    YAML !include tag constructor.
+
+    Args:
+        loader (IncludeLoader): YAML loader instance
+        node (yaml.Node): YAML node
+
+    Returns:
+        included file content
+    """
+    params = {}
+    path = None
+    pointer = ''
+    if isinstance(node.value, str):
+        path = loader.construct_scalar(node)
+    else:
+        value = loader.construct_mapping(node, True)
+        if 'path' not in value:
+            raise yaml.constructor.ConstructorError(None, None, f'expected a path, but found {value}', node.start_mark)
+
+        path = value['path']
+        params = value.get('params', {})
+        pointer = value.get('pointer', '')
+
+    filename = os.path.abspath(os.path.join(loader._root, path))
+    if loader.lazy_includes:
+        resolve = partial(resolve_file_content, pointer=pointer) if pointer else resolve_file_content
+        return LazyInclude(partial(load_lazy_include, resolve, filename, params, capture_anchors(loader)))
+
+    return resolve_file_content(filename, loader, params, pointer=pointer)
+
+
+IncludeLoader.add_constructor('!include', construct_include)
+IncludeLoader.add_constructor('!include_pattern', construct_include_pattern)
+IncludeLoader.add_constructor('!merge', construct_merge)
+
+
+def yaml_path_loader(path: str) -> Callable[[Any], IncludeLoader]:
     """
     YAML Path Loader.
 
@@ -63,62 +252,52 @@ def yaml_path_loader(path: str) -> yaml.SafeLoader:
     }
     ```
 
+    A `pointer` key ([JSON pointer](https://datatracker.ietf.org/doc/html/rfc6901)) includes only a part of the file, \
+        the whole file is parsed only once per process and only the referenced value is copied:
+
+    ```yaml
+    prefixes: !include
+      path: ip-ranges.json
+      pointer: /prefixes
+    ```
+
     **NOTE**: The variables are resolved using Jinja2.
 
+    The loader instance also records the files (`dependencies`) and glob patterns (`patterns`) \
+        resolved by the `!include` and `!include_pattern` tags, including the nested ones.
+
     Args:
         path (str): YAML file path
 
     Returns:
-        yaml.SafeLoader: YAML Loader
-    """
-    class Loader(yaml.SafeLoader):
-        def __init__(self, stream: IO) -> None:
-            self._root = os.path.dirname(path)
-            super().__init__(stream)
-
-    def construct_include_pattern(loader: Loader, node: yaml.Node) -> Any:
-        params = {}
-        pattern = None
-        if isinstance(node.value, str):
-            pattern = loader.construct_scalar(node)
-        else:
-            value = loader.construct_mapping(node, True)
-            if 'pattern' not in value:
-                raise yaml.constructor.ConstructorError(None, None, f'expected a pattern, but found {value}', node.start_mark)
-
-            pattern = value['pattern']
-            params = value.get('params', {})
-
-        return [
-            resolve_file_content(filename, loader, params)
-            for filename in glob.glob(os.path.join(loader._root, pattern))
-        ]
-
-    def construct_include(loader: Loader, node: yaml.Node) -> Any:
-        params = {}
-        path = None
-        if isinstance(node.value, str):
-            path = loader.construct_scalar(node)
-        else:
-            value = loader.construct_mapping(node, True)
-            if 'path' not in value:
-                raise yaml.constructor.ConstructorError(None, None, f'expected a path, but found {value}', node.start_mark)
+        Callable[[Any], IncludeLoader]: YAML Loader factory, to be used as the `Loader` argument of `yaml.load`
+    """
+    return partial(IncludeLoader, path=path)
 
-            path = value['path']
-            params = value.get('params', {})
 
-        filename = os.path.abspath(os.path.join(loader._root, path))
-        return resolve_file_content(filename, loader, params)
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(value: str) -> 'Template':
+    """
+    Compile a Jinja2 template using the shared environment.
 
-    yaml.add_constructor('!include', construct_include, Loader)
-    yaml.add_constructor('!include_pattern', construct_include_pattern, Loader)
-    return Loader
+    The compiled templates are cached by source (`TEMPLATE_CACHE_SIZE` entries), \
+        so a file included many times with different params is compiled only once.
+
+    Args:
+        value (str): Template source
+
+    Returns:
+        Template: Compiled template
+    """
+    return TEMPLATE_ENVIRONMENT.from_string(value)
 
 
 def resolve_variables(value: str, variables: dict) -> str:
     """
     Resolve Variables using Jinja2.
 
+    The value is returned as is when it has no template markers (`{{`, `{%` or `{#`).
+
     Args:
         value (str): Value to be resolved
         variables (dict): Variables
@@ -126,41 +305,152 @@ def resolve_variables(value: str, variables: dict) -> str:
     Returns:
         str: Resolved value
     """
+    if not any(marker in value for marker in TEMPLATE_MARKERS):
+        return value
+
     try:
-        value_template = Environment(
-            loader=BaseLoader,
-            undefined=StrictUndefined,
-            autoescape=True
-        ).from_string(value)
-        return value_template.render(variables)
+        return compile_template(value).render(variables)
     except UndefinedError as error:
         raise yaml.constructor.ConstructorError(None, None, f'undefined variable: {error}', None)
 
 
-def resolve_file_content(path: str, loader: yaml.Loader, params: dict = {}) -> Any:
+def capture_anchors(loader: IncludeLoader) -> dict:
+    """
+    Copy the anchors of a loader for a lazy include.
+
+    The lazy included file may refer to any of them, so the anchors not defined by the document \
+        are tracked as used (`parent_anchors`) and its content is not cached with them.
+
+    Args:
+        loader (IncludeLoader): YAML loader instance
+
+    Returns:
+        dict: anchors of the loader
+    """
+    loader.parent_anchors.update(anchor for anchor in loader.anchors if anchor not in loader.local_anchors)
+    return dict(loader.anchors)
+
+
+def load_lazy_include(resolve: Callable[[str, IncludeLoader, dict], Any], path: str, params: dict, anchors: dict) -> Any:
+    """
+    Resolve a lazy include, called by `LazyInclude.resolve`.
+
+    Args:
+        resolve (Callable[[str, IncludeLoader, dict], Any]): `resolve_file_content` or `resolve_pattern_content`
+        path (str): file path or glob pattern
+        params (dict): Variables
+        anchors (dict): anchors of the including file
+
+    Returns:
+        Any: File content, without lazy includes
+    """
+    loader = IncludeLoader('', path)
+    loader.anchors = dict(anchors)
+    return materialize(resolve(path, loader, params))
+
+
+def resolve_pattern_content(pattern: str, loader: yaml.Loader, params: dict = {}) -> List[Any]:
+    """
+    Resolve the content of the files matching a glob pattern.
+
+    Args:
+        pattern (str): glob pattern
+        loader (yaml.Loader): YAML Loader
+        params (dict, optional): Variables. Defaults to {}.
+
+    Returns:
+        List[Any]: content of the matched files, in path order
+    """
+    filenames = PATTERN_INDEX.glob(pattern)
+    loader.patterns.append((pattern, filenames))
+    contents = PATTERN_INDEX.read_files([filename for filename in filenames if not INCLUDE_CACHE.contains(filename, params)])
+
+    return [
+        resolve_file_content(filename, loader, params, contents.get(filename))
+        for filename in filenames
+    ]
+
+
+def resolve_file_content(
+    path: str,
+    loader: yaml.Loader,
+    params: dict = {},
+    content: Optional[str] = None,
+    pointer: str = ''
+) -> Any:
     """
     Resolve file content.
 
+    The content is stored in the `INCLUDE_CACHE`, unless the file or its nested included files refer \
+        to anchors of the including files, and a copy is returned for each include.
+
     Args:
         path (str): File path
         loader (yaml.Loader): YAML Loader
         params (dict, optional): Variables. Defaults to {}.
+        content (str, optional): File content, when it was already read. Defaults to None.
+        pointer (str, optional): JSON pointer of the included value. Defaults to the whole file.
 
     Returns:
         Any: File content
     """
-    extension = get_extension(path)
+    loader.dependencies.append(path)
+
+    cached_entry = INCLUDE_CACHE.get(path, params)
+    if cached_entry is not None:
+        entry, cacheable = cached_entry, True
+    else:
+        entry, parent_anchors = load_file_content(path, loader, params, content)
+        cacheable = not parent_anchors
+        if cacheable:
+            INCLUDE_CACHE.set(path, params, entry)
+        else:
+            loader.parent_anchors.update(parent_anchors - loader.local_anchors)
 
-    with open(path, 'r') as f:
-        if extension in ('yaml', 'yml'):
-            included_loader = yaml_path_loader(path)(resolve_variables(f.read(), params))
-            included_loader.anchors = loader.anchors
+    loader.dependencies.extend(entry.dependencies)
+    loader.patterns.extend(entry.patterns)
+    loader.anchors.update(entry.anchors)
+    value = resolve_json_pointer(entry.value, pointer)
+    return copy.deepcopy(value) if cacheable else value
 
-            return included_loader.get_data()
-        elif extension in ('json', ):
-            return json.load(f)
-        else:
-            return f.read()
+
+def load_file_content(path: str, loader: yaml.Loader, params: dict = {}, content: Optional[str] = None) -> Tuple[IncludeCacheEntry, Set[str]]:
+    """
+    Load file content, without using the cache.
+
+    Args:
+        path (str): File path
+        loader (yaml.Loader): YAML Loader
+        params (dict, optional): Variables. Defaults to {}.
+        content (str, optional): File content, when it was already read. Defaults to None.
+
+    Returns:
+        file content entry and the anchors of the including files it refers to, it can be cached when there are none.
+    """
+    extension = get_extension(path)
+    if extension in ('json', ):
+        return IncludeCacheEntry(load_json_file(path, content)), set()
+
+    if content is None:
+        with open(path, 'r') as f:
+            content = f.read()
+
+    if extension in ('yaml', 'yml'):
+        included_loader = IncludeLoader(resolve_variables(content, params), path)
+        included_loader.anchors = loader.anchors
+        parent_anchors = dict(loader.anchors)
+
+        data = included_loader.get_data()
+        # the anchors defined by the file and its nested includes, restored by the cache hits
+        anchors = {anchor: node for anchor, node in included_loader.anchors.items() if parent_anchors.get(anchor) is not node}
+        return IncludeCacheEntry(
+            data,
+            included_loader.dependencies,
+            included_loader.patterns,
+            anchors
+        ), included_loader.parent_anchors
+    else:
+        return IncludeCacheEntry(content), set()
 
 
 def get_extension(path: str) -> str:
@@ -0,0 +1,107 @@
+"""
+JSON Include.
+
+Decodes the JSON files resolved by the `!include` and `!include_pattern` tags.
+
+When [orjson](https://github.com/ijl/orjson) is installed the file is memory-mapped and decoded by it, \
+    otherwise the Python `json` module is used. Documents not supported by `orjson` \
+    (e.g. `NaN` values or integers larger than 64 bits) are also decoded by the `json` module.
+
+It also resolves the JSON pointers ([RFC 6901](https://datatracker.ietf.org/doc/html/rfc6901)) \
+    used by the `pointer` key of the `!include` tag.
+"""
+
+import json
+import mmap
+from typing import Any, Optional
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def load_json_file(path: str, content: Optional[str] = None) -> Any:
+    """
+    Decode a JSON file.
+
+    Args:
+        path (str): JSON file path
+        content (str, optional): File content, when it was already read. Defaults to None.
+
+    Returns:
+        Any: decoded document
+    """
+    if content is not None:
+        return loads(content)
+
+    with open(path, 'rb') as file:
+        if orjson is None:
+            return json.loads(file.read())
+
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return loads(view)
+        except ValueError:
+            # empty files can't be memory-mapped
+            return loads(file.read())
+
+
+def loads(content: Any) -> Any:
+    """
+    Decode a JSON document using `orjson`, when installed, or the `json` module.
+
+    Args:
+        content (Any): JSON document, `str`, `bytes` or `memoryview` (only with `orjson`)
+
+    Returns:
+        Any: decoded document
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            if isinstance(content, memoryview):
+                content = content.tobytes()
+
+    return json.loads(content)
+
+
+def resolve_json_pointer(document: Any, pointer: str) -> Any:
+    """
+    Resolve a JSON pointer.
+
+    Example:
+
+    ```python
+    resolve_json_pointer({'a': {'b': [1, 2]}}, '/a/b/1')  # 2
+    ```
+
+    Args:
+        document (Any): decoded document
+        pointer (str): JSON pointer, an empty pointer refers to the whole document
+
+    Returns:
+        Any: value referenced by the pointer, it's not copied
+    """
+    if not pointer:
+        return document
+
+    if not pointer.startswith('/'):
+        raise yaml.constructor.ConstructorError(None, None, f'invalid JSON pointer {pointer!r}, it must start with "/"', None)
+
+    value = document
+    for token in pointer[1:].split('/'):
+        token = token.replace('~1', '/').replace('~0', '~')
+        try:
+            if isinstance(value, list):
+                value = value[int(token)]
+            else:
+                value = value[token]
+        except (IndexError, KeyError, TypeError, ValueError):
+            raise yaml.constructor.ConstructorError(None, None, f'JSON pointer {pointer!r} not found', None)
+
+    return value
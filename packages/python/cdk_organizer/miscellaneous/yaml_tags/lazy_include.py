@@ -0,0 +1,231 @@
+"""
+Lazy Include.
+
+When the `lazyIncludes` context variable is enabled, the `!include` and `!include_pattern` tags \
+    return a `LazyInclude` placeholder instead of the file content, and the file is only read \
+    and parsed when the value is accessed.
+
+The stack group config is wrapped in a `LazyConfig`, which materializes each top level key \
+    on its first access (`config['key']`, `config.get('key')`, `dacite.from_dict`, ...), \
+    so the included files under keys never read by the stack group are never parsed.
+
+The `LazyConfig` objects are represented as plain mappings by the YAML dumpers (`yaml.safe_dump`, `yaml.dump`).
+
+> **Note**: The anchors defined by a lazily included file are not visible to the including file.
+"""
+
+from typing import Any, Callable, Iterator, Set, Tuple
+
+from yaml.representer import Representer, SafeRepresenter
+
+
+class LazyInclude(object):
+    """
+    Placeholder of an included file content, resolved on demand.
+
+    The placeholder is immutable, so it is shared by the copies of the config, and each \
+        call to `resolve` returns a new copy of the content.
+
+    Args:
+        resolver (Callable[[], Any]): function returning the included file content, must be picklable (e.g. a `functools.partial`)
+    """
+
+    __slots__ = ('resolver', )
+
+    def __init__(self, resolver: Callable[[], Any]) -> None:
+        """Initialize the placeholder."""
+        self.resolver = resolver
+
+    def resolve(self) -> Any:
+        """
+        Read the included file.
+
+        Returns:
+            included file content, the nested lazy includes are also resolved
+        """
+        return materialize(self.resolver())
+
+    def __copy__(self) -> 'LazyInclude':
+        """Return the placeholder itself, as it is immutable."""
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'LazyInclude':
+        """Return the placeholder itself, as it is immutable."""
+        return self
+
+    def __reduce__(self) -> Tuple[type, Tuple[Callable[[], Any]]]:
+        """Pickle the placeholder with its resolver."""
+        return LazyInclude, (self.resolver, )
+
+    def __repr__(self) -> str:
+        """Return the placeholder representation."""
+        return f'LazyInclude({self.resolver!r})'
+
+
+def materialize(value: Any) -> Any:
+    """
+    Resolve the lazy includes of a value.
+
+    The dicts and lists are updated in place.
+
+    Args:
+        value (Any): config value
+
+    Returns:
+        value without lazy includes
+    """
+    if isinstance(value, LazyInclude):
+        return value.resolve()
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (LazyInclude, dict, list)):
+                value[key] = materialize(item)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, (LazyInclude, dict, list)):
+                value[index] = materialize(item)
+
+    return value
+
+
+def has_lazy_include(value: Any) -> bool:
+    """
+    Check if a value contains lazy includes.
+
+    Args:
+        value (Any): config value
+
+    Returns:
+        `True` if the value or any nested value is a `LazyInclude`.
+    """
+    if isinstance(value, LazyInclude):
+        return True
+
+    if isinstance(value, dict):
+        return any(has_lazy_include(item) for item in value.values())
+    elif isinstance(value, list):
+        return any(has_lazy_include(item) for item in value)
+
+    return False
+
+
+class LazyConfig(dict):
+    """
+    Config dict materializing the lazy includes of each top level key on its first access.
+
+    The keys still to be resolved are kept in `_pending`, and the subclasses can change \
+        how a key is resolved by overriding `_resolve`.
+
+    Accepts the same arguments as `dict`, the values are not copied.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the config."""
+        super().__init__(*args, **kwargs)
+        self._pending: Set[Any] = {key for key, value in super().items() if has_lazy_include(value)}
+
+    def materialize(self) -> 'LazyConfig':
+        """
+        Resolve all the lazy includes.
+
+        Returns:
+            the config itself
+        """
+        for key in list(self._pending):
+            self._materialize_key(key)
+
+        return self
+
+    def _resolve(self, key: Any) -> Any:
+        return materialize(super().__getitem__(key))
+
+    def _materialize_key(self, key: Any) -> None:
+        if key in self._pending:
+            super().__setitem__(key, self._resolve(key))
+            self._pending.discard(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get a value, resolving its lazy includes."""
+        self._materialize_key(key)
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get a value, resolving its lazy includes."""
+        self._materialize_key(key)
+        return super().get(key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a value."""
+        self._pending.discard(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a value."""
+        self._pending.discard(key)
+        super().__delitem__(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Set the values of a mapping or an iterable of key/value pairs."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> 'LazyConfig':
+        """Set the values of a mapping."""
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        self._pending.clear()
+        super().clear()
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate the keys, also disables the `dict(config)` fast path which would copy the lazy includes."""
+        return super().__iter__()
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the materialized config."""
+        self.materialize()
+        if isinstance(other, LazyConfig):
+            other.materialize()
+
+        return super().__eq__(other)
+
+    def items(self):  # type: ignore
+        """Return the materialized items."""
+        self.materialize()
+        return super().items()
+
+    def values(self):  # type: ignore
+        """Return the materialized values."""
+        self.materialize()
+        return super().values()
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        """Remove a key, returning its materialized value."""
+        self._materialize_key(key)
+        return super().pop(key, *args)
+
+    def popitem(self) -> Tuple[Any, Any]:
+        """Remove the last item, returning its materialized value."""
+        self.materialize()
+        return super().popitem()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        """Get a value, resolving its lazy includes, or set the default."""
+        self._materialize_key(key)
+        return super().setdefault(key, default)
+
+    def copy(self) -> dict:
+        """Return a shallow copy of the materialized config."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        """Return the materialized config representation."""
+        self.materialize()
+        return super().__repr__()
+
+
+SafeRepresenter.add_multi_representer(LazyConfig, SafeRepresenter.represent_dict)
+Representer.add_multi_representer(LazyConfig, SafeRepresenter.represent_dict)
@@ -1,15 +1,19 @@
 """Merge YAML tag constructor."""
 
+import copy
+from functools import partial
 from typing import Any, List
 
 import yaml
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyInclude, materialize
 
 
 def construct_merge(loader: yaml.SafeLoader, node: yaml.Node) -> List[Any]:
     """
     YAML !merge tag constructor.
 
-    This tag is used to merge arrays
+    This tag is used to merge arrays, when an item is a lazy include the merge is also deferred.
+
     Example:
         YAML file:
         ```yaml
@@ -42,7 +46,33 @@ def construct_merge(loader: yaml.SafeLoader, node: yaml.Node) -> List[Any]:
             None, None, f'expected a sequence node, but found {node.id}', node.start_mark)
 
     values = loader.construct_sequence(node, True)
+    if any(isinstance(value, LazyInclude) for value in values):
+        return LazyInclude(partial(resolve_lazy_merge, values))
+
+    return merge_lists(values)
+
+
+def resolve_lazy_merge(values: List[Any]) -> List[Any]:
+    """
+    Merge a copy of the items, resolving the lazy includes.
 
+    Args:
+        values (List[Any]): items to be merged
+    Returns:
+        A merge list of items
+    """
+    return merge_lists(materialize(copy.deepcopy(values)))
+
+
+def merge_lists(values: List[Any]) -> List[Any]:
+    """
+    Merge the list items into a single list.
+
+    Args:
+        values (List[Any]): items to be merged
+    Returns:
+        A merge list of items
+    """
     result = []
     for value in values:
         if isinstance(value, list):
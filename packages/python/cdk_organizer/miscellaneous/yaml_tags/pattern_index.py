@@ -0,0 +1,138 @@
+"""
+Pattern Index.
+
+Resolves the glob patterns of the `!include_pattern` tag using a cache of the directory listings, \
+    so each directory is listed only once per process while it doesn't change, and returns the matched \
+    files sorted to keep the output stable between runs.
+
+The listings are keyed by the directory modification time, so the files added to or removed from \
+    a directory are matched by the next glob of the process.
+
+The matched files are also read in parallel by `read_files`.
+"""
+
+import fnmatch
+import glob
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+PARALLEL_READ_THRESHOLD = 8
+
+
+class PatternIndex(object):
+    """
+    Glob patterns resolver based on cached directory listings.
+
+    The patterns follow the `glob.glob` rules (non recursive, hidden files are only matched by patterns starting with `.`).
+
+    Args:
+        max_workers (int, optional): number of threads used to read the files, defaults to the `ThreadPoolExecutor` default
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initialize the index."""
+        self.max_workers = max_workers
+        self._listings: Dict[str, Tuple[int, Dict[str, bool]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def glob(self, pattern: str) -> List[str]:
+        """
+        Resolve a glob pattern.
+
+        Args:
+            pattern (str): glob pattern
+
+        Returns:
+            sorted list of the matched paths
+        """
+        drive, path = os.path.splitdrive(pattern)
+        root = drive + os.sep if os.path.isabs(pattern) else drive
+        parts = [part for part in path.split(os.sep) if part]
+
+        candidates = [root]
+        for index, part in enumerate(parts):
+            directories_only = index < len(parts) - 1
+            matches = []
+            for candidate in candidates:
+                listing = self.listdir(candidate or os.curdir)
+                if part in (os.curdir, os.pardir):
+                    matches.append(os.path.join(candidate, part))
+                elif glob.has_magic(part):
+                    for name in fnmatch.filter(listing, part):
+                        if (name[0] != '.' or part[0] == '.') and (listing[name] or not directories_only):
+                            matches.append(os.path.join(candidate, name))
+                elif part in listing and (listing[part] or not directories_only):
+                    matches.append(os.path.join(candidate, part))
+
+            candidates = matches
+
+        return sorted(candidates) if parts else []
+
+    def listdir(self, directory: str) -> Dict[str, bool]:
+        """
+        List a directory, the listing is cached until the directory modification time changes.
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            mapping of the entry names to `True` when the entry is a directory
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return {}
+
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        listing = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    listing[entry.name] = entry.is_dir()
+        except OSError:
+            pass
+
+        with self._lock:
+            self._listings[directory] = (mtime_ns, listing)
+
+        return listing
+
+    def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Read text files in parallel.
+
+        Nothing is read when there are less than `PARALLEL_READ_THRESHOLD` files, \
+            so they are read on demand by the caller.
+
+        Args:
+            paths (List[str]): file paths
+
+        Returns:
+            mapping of the read file paths to the file contents
+        """
+        if len(paths) < PARALLEL_READ_THRESHOLD:
+            return {}
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='include-pattern')
+
+        return dict(zip(paths, self._executor.map(self._read_file, paths)))
+
+    def clear(self) -> None:
+        """Remove the cached directory listings."""
+        with self._lock:
+            self._listings.clear()
+
+    def _read_file(self, path: str) -> str:
+        with open(path, 'r') as file:
+            return file.read()
+
+
+PATTERN_INDEX = PatternIndex()
@@ -0,0 +1,274 @@
+"""
+Sharded Synth.
+
+Synthesizes the stack groups in parallel processes (shards), each shard runs the CDK app command \
+    with its own output directory and the `stackGroups` context of its stack groups, \
+    and the outputs are merged into a single cloud assembly (`cdk.out`) or cdktf output (`cdktf.out`).
+
+The stack groups are partitioned by the `resolve_group` dependencies, the stack groups resolving each other \
+    (directly or not) are synthesized by the same shard, so each stack group is created by a single shard. \
+    The disabled stack groups, without config in the `env` and `region` directories, are not synthesized.
+
+The shard outputs are merged file by file, the identical files (e.g. shared assets) are kept once, \
+    the JSON files written by several shards (e.g. `manifest.json` and `tree.json`) are merged, \
+    and the other conflicting files are reported as errors.
+
+The cache directory of the output (`.cdk-organizer-cache`) is kept between the runs and is not part of the merge, \
+    the `configCache` and `stackManifest` contexts enabled with `true` are shared by all the shards.
+
+### Example:
+
+```bash
+python -m cdk_organizer.shard_synth --shards 8 -c env=dev -c region=us-east-1
+cdk deploy --app cdk.out --all
+```
+
+The app command is read from the `cdk.json` or `cdktf.json` file, the context is read from the \
+    `cdk.context.json` and `cdk.json` files and the `--context` arguments.
+"""
+
+import argparse
+import filecmp
+import heapq
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TypeVar
+
+from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException, catch_exceptions
+from cdk_organizer.loaders.change_impact import ChangeImpact
+from cdk_organizer.loaders.config_compiler import context_app
+from cdk_organizer.loaders.config_loader import ConfigLoader
+from cdk_organizer.loaders.file_cache import CACHE_DIRECTORY
+from cdk_organizer.loaders.stack_manifest import MANIFEST_FILE
+from constructs import IConstruct
+
+CDK_APP_TYPE = TypeVar('CDK_APP_TYPE', bound=IConstruct)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ShardedSynth(object):
+    """
+    Runs the CDK app command in parallel shards of stack groups and merges their outputs.
+
+    Args:
+        app (CDK_APP_TYPE): CDK App instance with the context, used to discover the stack groups
+        command (str): CDK app command, e.g. `python3 app.py`
+        context (Dict[str, Any]): context variables of the shard apps
+        shards (int): maximum number of shards, default: number of CPUs
+    """
+
+    def __init__(self, app: CDK_APP_TYPE, command: str, context: Dict[str, Any], shards: Optional[int] = None) -> None:
+        """Initialize the sharded synth."""
+        self.app = app
+        self.command = command
+        self.context = context
+        self.shards = shards or os.cpu_count() or 1
+
+    def partition(self) -> List[List[str]]:
+        """
+        Partition the enabled stack groups into shards, the stack groups resolving each other are in the same shard.
+
+        Returns:
+            stack group module names of each shard
+        """
+        impact = ChangeImpact(self.app, index_config=False)
+        parents = {stack_group: stack_group for stack_group in impact.stack_groups}
+
+        def find(stack_group: str) -> str:
+            while parents[stack_group] != stack_group:
+                parents[stack_group] = parents[parents[stack_group]]
+                stack_group = parents[stack_group]
+            return stack_group
+
+        for stack_group, dependents in impact.dependents.items():
+            for dependent in dependents:
+                parents[find(dependent)] = find(stack_group)
+
+        components: Dict[str, List[str]] = {}
+        enabled = self._enabled()
+        for stack_group in impact.stack_groups:
+            if enabled(stack_group):
+                components.setdefault(find(stack_group), []).append(stack_group)
+
+        # the largest components first, each one to the smallest shard
+        shards = [(0, index, []) for index in range(min(self.shards, len(components)))]
+        for component in sorted(components.values(), key=lambda stack_groups: (-len(stack_groups), stack_groups)):
+            size, index, stack_groups = heapq.heappop(shards)
+            heapq.heappush(shards, (size + len(component), index, stack_groups + component))
+
+        return [sorted(stack_groups) for _, _, stack_groups in sorted(shards, key=lambda shard: shard[1])]
+
+    def synth(self, output: str) -> List[List[str]]:
+        """
+        Synthesize the shards in parallel processes and merge their outputs.
+
+        Args:
+            output (str): output directory, replaced by the merged output, except its cache directory
+
+        Returns:
+            stack group module names of each shard
+
+        Raises:
+            InfraRuntimeException: when a shard fails or the shard outputs conflict
+        """
+        shards = self.partition()
+        shards_dir = f'{output}.shards'
+        shutil.rmtree(shards_dir, ignore_errors=True)
+        LOGGER.debug(f'Synthesizing {sum(len(shard) for shard in shards)} stack groups in {len(shards)} shards')
+        cache_dir = os.path.abspath(os.path.join(output, CACHE_DIRECTORY))
+        with ThreadPoolExecutor(max_workers=max(len(shards), 1)) as executor:
+            outputs = list(executor.map(
+                self._run,
+                [os.path.join(shards_dir, str(index)) for index in range(len(shards))],
+                shards,
+                [cache_dir] * len(shards)
+            ))
+
+        clean_output(output)
+        for shard_output in outputs:
+            merge_output(shard_output, output)
+
+        shutil.rmtree(shards_dir, ignore_errors=True)
+        return shards
+
+    def _run(self, output: str, stack_groups: List[str], cache_dir: str) -> str:
+        """Run the app command of a shard, the default caches are replaced by the cache directory of the merged output."""
+        context = dict(self.context, stackGroups=','.join(stack_groups))
+        for key, path in (('configCache', cache_dir), ('stackManifest', os.path.join(cache_dir, MANIFEST_FILE))):
+            if context.get(key) is True or str(context.get(key)).lower() == 'true':
+                context[key] = path
+
+        context_json = json.dumps(context)
+        env = dict(os.environ, CDK_OUTDIR=output, CDKTF_OUTDIR=output, CDK_CONTEXT_JSON=context_json, CDKTF_CONTEXT_JSON=context_json)
+        os.makedirs(output, exist_ok=True)
+        result = subprocess.run(self.command, shell=True, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if result.returncode != 0:
+            raise InfraRuntimeException(f"Error on synthesizing the stack groups {stack_groups}, exit code {result.returncode}:\n{result.stdout}")
+
+        LOGGER.debug(f'Shard {output}: {stack_groups}\n{result.stdout}')
+        return output
+
+    def _enabled(self) -> Any:
+        """Return the check of the stack groups config, all the stack groups are enabled when the env or region is not set."""
+        env = os.getenv("CDK_ENV", None) or self.app.node.try_get_context("env")
+        region = self.app.node.try_get_context("region")
+        if not env or not region:
+            return lambda stack_group: True
+
+        return ConfigLoader(self.app, env, region).config_exists
+
+
+def clean_output(output: str) -> None:
+    """
+    Remove the content of an output directory, except its cache directory, creating it if it doesn't exist.
+
+    Args:
+        output (str): output directory
+    """
+    os.makedirs(output, exist_ok=True)
+    with os.scandir(output) as entries:
+        for entry in entries:
+            if entry.name == CACHE_DIRECTORY:
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+
+
+def merge_output(source: str, target: str) -> None:
+    """
+    Merge a synth output directory into another, the cache directory of the source is not merged.
+
+    Args:
+        source (str): shard output directory
+        target (str): merged output directory
+
+    Raises:
+        InfraRuntimeException: when a file, except the JSON files, differs in both directories
+    """
+    for directory, directories, files in os.walk(source):
+        if directory == source and CACHE_DIRECTORY in directories:
+            directories.remove(CACHE_DIRECTORY)
+
+        target_directory = os.path.join(target, os.path.relpath(directory, source))
+        os.makedirs(target_directory, exist_ok=True)
+        for name in files:
+            source_file = os.path.join(directory, name)
+            target_file = os.path.join(target_directory, name)
+            if not os.path.exists(target_file):
+                shutil.copy2(source_file, target_file)
+            elif filecmp.cmp(source_file, target_file, shallow=False):
+                continue
+            elif name.endswith('.json'):
+                with open(target_file, 'r') as file:
+                    data = json.load(file)
+                with open(source_file, 'r') as file:
+                    merge_json(data, json.load(file))
+                with open(target_file, 'w') as file:
+                    json.dump(data, file, indent=2)
+            else:
+                raise InfraRuntimeException(f"Error on merging the synth outputs, the file '{Path(target_file)}' differs between the shards")
+
+
+def merge_json(target: dict, source: dict) -> dict:
+    """
+    Merge a JSON object into another, the objects are merged recursively, the new list items are appended \
+        and the other values of the target object are kept.
+
+    Args:
+        target (dict): JSON object, updated
+        source (dict): JSON object
+
+    Returns:
+        the target object
+    """
+    for key, value in source.items():
+        if isinstance(target.get(key), dict) and isinstance(value, dict):
+            merge_json(target[key], value)
+        elif isinstance(target.get(key), list) and isinstance(value, list):
+            target[key].extend(item for item in value if item not in target[key])
+        elif key not in target:
+            target[key] = value
+
+    return target
+
+
+@catch_exceptions
+def main(args: Optional[List[str]] = None) -> None:
+    """Synthesize the stack groups in parallel shards."""
+    parser = argparse.ArgumentParser(description='Synthesize the cdk-organizer stack groups in parallel shards.')
+    parser.add_argument('-s', '--shards', type=int, default=None, help='maximum number of shards, default: number of CPUs')
+    parser.add_argument('-a', '--app', default=None, help='CDK app command, default: the cdk.json or cdktf.json app')
+    parser.add_argument('-o', '--output', default=None, help='output directory, default: cdk.out or cdktf.out')
+    parser.add_argument('-c', '--context', action='append', default=[], metavar='KEY=VALUE', help='context variable')
+    arguments = parser.parse_args(args)
+
+    command = arguments.app
+    output = arguments.output
+    for config_file, default_output in (('cdk.json', 'cdk.out'), ('cdktf.json', 'cdktf.out')):
+        if os.path.exists(config_file):
+            with open(config_file, 'r') as file:
+                command = command or json.load(file).get('app')
+            output = output or default_output
+            break
+
+    if not command:
+        raise InfraRuntimeException('Error on sharded synth, the app command is required (--app, cdk.json or cdktf.json)')
+
+    app = context_app(arguments.context)
+    context = {key: value for key, value in app.node.get_all_context().items() if key != 'stackGroups'}
+    for shard in ShardedSynth(app, command, context, arguments.shards).synth(output or 'cdk.out'):
+        sys.stdout.write(','.join(shard) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,38 @@
 """Base Stack Group module."""
 
 import abc
+import copy
 import dataclasses
-import importlib
+import importlib.machinery
+import importlib.util
 import inspect
+import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Generic, Optional, Type, TypeVar, get_args
+from typing import TYPE_CHECKING, Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, get_args
 
 from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException, catch_exceptions
-from cdk_organizer.loaders.config_loader import ConfigLoader
-from constructs import IConstruct
-from dacite import from_dict
+from cdk_organizer.loaders.config_artifact import ConfigArtifact
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.config_compiler import ConfigCompiler, sorted_subdirectories
+from cdk_organizer.loaders.config_decoder import decode_config
+from cdk_organizer.loaders.config_interner import ConfigInterner
+from cdk_organizer.loaders.config_loader import ConfigLoader, config_directories
+from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+from cdk_organizer.loaders.file_cache import CACHE_DIRECTORY, DEFAULT_MAX_SIZE, FileCache
+from cdk_organizer.loaders.merge_engine import MergeEngine
+from cdk_organizer.loaders.stack_manifest import MANIFEST_FILE, StackManifest
+from cdk_organizer.miscellaneous.yaml_tags.include_cache import INCLUDE_CACHE
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader
+from constructs import Construct, IConstruct
+
+if TYPE_CHECKING:
+    from types import ModuleType
 
 CDK_APP_TYPE = TypeVar('CDK_APP_TYPE', bound=IConstruct)
 CDK_CONFIG_TYPE = TypeVar('CDK_CONFIG_TYPE', covariant=True)
@@ -35,14 +54,246 @@ class StackGroupLoader:
     Attributes:
         app (CDK_APP_TYPE): The CDK app.
         stack_groups (Dict[str, CDK_STACK_GROUP_TYPE]): The stack groups.
+        config_cache (ConfigCache): The resolved config cache shared by the stack groups.
+        file_cache (Optional[FileCache]): The persistent parsed config files cache, enabled by the `configCache` context variable.
+        config_interner (Optional[ConfigInterner]): The config subtrees deduplication table, enabled by the `configIntern` context variable.
+        merge_engine (MergeEngine): The config merge engine, with the strategies of the `configMergeStrategies` context variable.
+        config_artifact (Optional[ConfigArtifact]): The compiled config, enabled by the `configArtifact` context variable.
+        config_tree_index (ConfigTreeIndex): The config directories and YAML files, listed once per run.
+        stack_manifest (Optional[StackManifest]): The stack groups of the stack files, discovered without importing them, \
+            enabled by the `stackManifest` context variable.
+        env (str): The env of the stack groups, from the `CDK_ENV` environment variable or the `env` context variable.
+        region (str): The region of the stack groups, from the `region` context variable.
+        env_matrix (List[Tuple[str, str]]): The env and region pairs of the `envMatrix` context variable.
+        env_loaders (Dict[Tuple[str, str], StackGroupLoader]): The loaders of each env and region pair of the `envMatrix` context variable, \
+            created by `synth`.
     """
 
     def __init__(self, app: CDK_APP_TYPE) -> None:
         """Stack group loader constructor."""
         self.app = app
         self.stack_groups: Dict[str, CDK_STACK_GROUP_TYPE] = {}
+        self.env = os.getenv("CDK_ENV", None) or app.node.try_get_context("env")
+        self.region = app.node.try_get_context("region")
+        self.env_loaders: Dict[Tuple[str, str], StackGroupLoader] = {}
+        self.config_cache = ConfigCache()
+        self.file_cache = self._create_file_cache()
+        self.config_interner = self._create_config_interner()
+        self.merge_engine = self._create_merge_engine()
+        self.config_tree_index = ConfigTreeIndex(*config_directories(app))
         self._stack_dir = app.node.try_get_context("stacksDirectory") or "stacks"
 
+        include_cache_size = app.node.try_get_context("includeCacheMaxSize")
+        if include_cache_size is not None:
+            INCLUDE_CACHE.max_size = int(include_cache_size)
+
+        lazy_includes = app.node.try_get_context("lazyIncludes")
+        if lazy_includes is not None:
+            lazy_includes = str(lazy_includes).lower() == 'true'
+            if lazy_includes != IncludeLoader.lazy_includes:
+                IncludeLoader.lazy_includes = lazy_includes
+                INCLUDE_CACHE.clear()
+
+        self.config_artifact = self._open_config_artifact()
+        self.stack_manifest = self._create_stack_manifest()
+        self.env_matrix = self._env_matrix()
+
+    def _create_file_cache(self) -> Optional[FileCache]:
+        """Create the persistent config cache, `configCache` context can be `true` or the cache directory path."""
+        cache_dir = self.app.node.try_get_context("configCache")
+        if not cache_dir or str(cache_dir).lower() == 'false':
+            return None
+
+        if cache_dir is True or str(cache_dir).lower() == 'true':
+            cache_dir = os.path.join(getattr(self.app, 'outdir', None) or 'cdk.out', CACHE_DIRECTORY)
+
+        max_size = self.app.node.try_get_context("configCacheMaxSize") or DEFAULT_MAX_SIZE
+        return FileCache(str(cache_dir), int(max_size))
+
+    def _create_config_interner(self) -> Optional[ConfigInterner]:
+        """Create the config interner, enabled by the `configIntern` context."""
+        intern = self.app.node.try_get_context("configIntern")
+        if not intern or str(intern).lower() == 'false':
+            return None
+
+        return ConfigInterner()
+
+    def _create_merge_engine(self) -> MergeEngine:
+        """Create the config merge engine, `configMergeStrategies` context can be a mapping or a JSON string."""
+        strategies = self.app.node.try_get_context("configMergeStrategies") or {}
+        if isinstance(strategies, str):
+            strategies = json.loads(strategies)
+
+        return MergeEngine(strategies)
+
+    def _open_config_artifact(self) -> Optional[ConfigArtifact]:
+        """Open the compiled config of the `configArtifact` context (artifact path), it's compiled again when it's missing or stale."""
+        path = self.app.node.try_get_context("configArtifact")
+        if not path or str(path).lower() == 'false':
+            return None
+
+        compiler = ConfigCompiler(self.app, self.merge_engine)
+        artifact = ConfigArtifact.open(str(path), compiler.strategies)
+        if artifact is None:
+            LOGGER.debug(f'Compiling config artifact {path}')
+            compiler.compile(str(path))
+            artifact = ConfigArtifact(str(path))
+
+        return artifact
+
+    def _create_stack_manifest(self) -> Optional[StackManifest]:
+        """Create the stack manifest, `stackManifest` context can be `true` or the manifest file path, all the stack files are imported when it's not set."""
+        value = self.app.node.try_get_context("stackManifest")
+        if isinstance(value, str):
+            value = {'': False, 'false': False, 'true': True}.get(value.strip().lower(), value)
+
+        if value is None or value is False:
+            return None
+
+        if value is True:
+            return StackManifest(os.path.join(getattr(self.app, 'outdir', None) or 'cdk.out', CACHE_DIRECTORY, MANIFEST_FILE))
+
+        if not isinstance(value, str):
+            raise InfraRuntimeException(f"Error on parsing the stackManifest context, expected 'true', 'false' or a file path, got {value!r}")
+
+        return StackManifest(value)
+
+    def _env_matrix(self) -> List[Tuple[str, str]]:
+        """
+        Read the env and region pairs of the `envMatrix` context.
+
+        The context is a list or a comma separated string of `<env>/<region>` pairs, \
+            the `*` wildcards are expanded from the env and region directories of the config roots (e.g. `*/us-east-1`).
+        """
+        patterns = self.app.node.try_get_context("envMatrix")
+        if not patterns:
+            return []
+
+        if isinstance(patterns, str):
+            patterns = patterns.split(',')
+
+        config_dirs = config_directories(self.app)
+        envs = sorted({env for root in config_dirs for env in sorted_subdirectories(root)})
+        matrix = []
+        for pattern in (pattern.strip() for pattern in patterns if pattern.strip()):
+            env_pattern, _, region_pattern = pattern.partition('/')
+            if not region_pattern:
+                raise InfraRuntimeException(f"Error on parsing the envMatrix context, '{pattern}' must be an '<env>/<region>' pair")
+
+            for env in _expand(env_pattern, envs):
+                regions = sorted({region for root in config_dirs for region in sorted_subdirectories(os.path.join(root, env))})
+                for region in _expand(region_pattern, regions):
+                    if (env, region) not in matrix:
+                        matrix.append((env, region))
+
+        return matrix
+
+    def _create_env_loader(self, env: str, region: str) -> 'StackGroupLoader':
+        """Create the loader of an env and region pair, sharing the caches and the imported stack modules, with its own app scope."""
+        loader = copy.copy(self)
+        loader.app = self._create_env_scope(env, region)
+        loader.env = env
+        loader.region = region
+        loader.env_matrix = []
+        loader.env_loaders = {}
+        loader.stack_groups = {}
+        return loader
+
+    def _create_env_scope(self, env: str, region: str) -> IConstruct:
+        """Create the scope of the stack groups of an env and region pair, a `Stage` for AWS CDK apps, a construct otherwise (cdktf)."""
+        scope_id = f'{env}-{region}'
+        try:
+            from aws_cdk import App, Stage
+            if isinstance(self.app, App):
+                return Stage(self.app, scope_id)
+        except ImportError:
+            pass
+
+        return Construct(self.app, scope_id)
+
+    def _create_prefetch_executor(self, files: List[Path]) -> Optional[ThreadPoolExecutor]:
+        """Start parsing the config directories of the stack files, enabled by the `configPrefetch` context."""
+        prefetch = self.app.node.try_get_context("configPrefetch")
+        if not prefetch or str(prefetch).lower() == 'false' or self.config_artifact is not None:
+            return None
+
+        workers = self.app.node.try_get_context("configPrefetchWorkers")
+        executor = ThreadPoolExecutor(max_workers=int(workers) if workers else None, thread_name_prefix='config-prefetch')
+        modules = dict.fromkeys(self._group_module_name(file) for file in files)
+        self._create_config_loader().prefetch(modules, executor)
+        return executor
+
+    def _create_config_loader(self) -> ConfigLoader:
+        """Create a config loader of the current env and region, sharing the loader caches."""
+        return ConfigLoader(
+            self.app,
+            self.env,
+            self.region,
+            self.config_cache,
+            self.file_cache,
+            self.config_interner,
+            self.merge_engine,
+            self.config_artifact,
+            self.config_tree_index
+        )
+
+    def _enabled_files(self, files: List[Path]) -> List[Path]:
+        """
+        Filter the stack files of the stack groups enabled in the current env and region.
+
+        The stack groups of a file are enabled when its config folder has a `config.yaml` file, \
+            the other files are not imported, unless the `importDisabledStacks` context is enabled.
+        """
+        import_disabled = self.app.node.try_get_context("importDisabledStacks")
+        if import_disabled and str(import_disabled).lower() != 'false':
+            return files
+
+        config_loader = self._create_config_loader()
+        enabled = [file for file in files if config_loader.config_exists(self._group_module_name(file))]
+        LOGGER.debug(f'Skipping {len(files) - len(enabled)} stack files of disabled stack groups')
+        return enabled
+
+    def _selected_modules(self, module_names: List[str]) -> List[str]:
+        """
+        Filter the stack modules of the stack groups selected by the `stackGroups` context.
+
+        The context is a list or a comma separated string of stack group patterns, relative to the stacks directory \
+            (e.g. `storage.*,iam.roles`), `storage.*` also matches the `storage` stack group. \
+            The stack groups resolved by the selected stack groups (`resolve_group`) are created when they're resolved.
+
+        All the stack groups are selected when the context is not set, an empty context selects none of them \
+            (e.g. `-c stackGroups=` when no file affecting the stack groups changed).
+        """
+        patterns = self.app.node.try_get_context("stackGroups")
+        if patterns is None:
+            return module_names
+
+        if isinstance(patterns, str):
+            patterns = patterns.split(',')
+        patterns = [pattern.strip() for pattern in patterns if pattern.strip()]
+        prefix = self._stack_dir.strip('/').replace('/', '.') + '.'
+
+        def is_selected(module_name: str) -> bool:
+            group = module_name.rpartition('.')[0]
+            names = (group, group[len(prefix):]) if group.startswith(prefix) else (group,)
+            return any(
+                fnmatchcase(name, pattern) or (pattern.endswith('.*') and name == pattern[:-2])
+                for name in names
+                for pattern in patterns
+            )
+
+        selected = [module_name for module_name in module_names if is_selected(module_name)]
+        LOGGER.debug(f'Selected {len(selected)} of {len(module_names)} stack files by the stack groups {patterns}')
+        return selected
+
+    def _module_name(self, file: Path) -> str:
+        """Return the module name of a stack file."""
+        return str(file).replace("/", ".").replace(".py", "")
+
+    def _group_module_name(self, file: Path) -> str:
+        """Return the module name of the stack groups of a stack file, used to find their config folder."""
+        return '.'.join(self._module_name(file).split('.')[:-1])
+
     def _fullname(self, obj: Type[CDK_STACK_GROUP_TYPE]) -> str:
         """Return the fully qualified name of a class."""
         module = obj.__module__
@@ -51,22 +302,145 @@ class StackGroupLoader:
         return module + '.' + obj.__qualname__
 
     def synth(self) -> None:
-        """Load all the python files from the stacks directory, filters the classes that are `StackGroup` and load the stacks into the CDK app."""
-        for file in Path(f'{self._stack_dir}/').rglob("**/*.py"):
-            module_name = str(file).replace("/", ".").replace(".py", "")
-            spec = importlib.util.spec_from_file_location(module_name, str(file))
-            stack_group_module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = stack_group_module
-            spec.loader.exec_module(stack_group_module)
-
-            for _, obj in inspect.getmembers(stack_group_module):
-                if not inspect.isabstract(obj) and inspect.isclass(obj) and obj.__base__.__base__ is StackGroup:
-                    stack_group_name = self._fullname(obj)
-                    if stack_group_name not in self.stack_groups:
-                        module_instance = obj(self.app, self)
-                        if module_instance.enabled:
-                            self.stack_groups[stack_group_name] = module_instance
-                            module_instance._load_stacks()
+        """
+        Load all the python files from the stacks directory, create the `StackGroup` classes they define and load the stacks into the CDK app.
+
+        The files of the stack groups without config in the current env and region are not imported, \
+            see `importDisabledStacks` context, and only the stack groups selected by the `stackGroups` context \
+            are created, with the stack groups they resolve.
+
+        When the `stackManifest` context is enabled, the stack groups of the files are discovered by the `StackManifest` \
+            before importing them, only the files defining stack groups are imported, after the stack files they depend on, \
+            and the stack groups are loaded in the stack files order.
+
+        When the `configPrefetch` context is enabled, the config directories of all the stack files are \
+            parsed in a thread pool (`configPrefetchWorkers` threads) while the modules are imported.
+
+        When the `envMatrix` context is set, the stack groups of each env and region pair are loaded into \
+            their own scope (`env_loaders`), a `Stage` for AWS CDK apps or a construct for cdktf apps, \
+            the stack modules are imported once and the config caches are shared by all the pairs.
+        """
+        if self.env_matrix:
+            for env, region in self.env_matrix:
+                LOGGER.debug(f'Loading the stack groups of env {env}, region {region}')
+                self.env_loaders[(env, region)] = self._create_env_loader(env, region)
+                self.env_loaders[(env, region)].synth()
+            return
+
+        modules = {self._module_name(file): file for file in Path(f'{self._stack_dir}/').rglob("**/*.py")}
+        if self.stack_manifest is not None:
+            import_order = self.stack_manifest.discover(modules)
+            self.stack_manifest.save()
+            LOGGER.debug(
+                f'Stack manifest: {len(import_order)} of {len(modules)} stack files define stack groups, '
+                f'{self.stack_manifest.parsed} files parsed'
+            )
+        else:
+            import_order = list(modules)
+
+        import_order = self._selected_modules(import_order)
+        enabled_files = set(self._enabled_files([modules[module_name] for module_name in import_order]))
+        import_order = [module_name for module_name in import_order if modules[module_name] in enabled_files]
+        executor = self._create_prefetch_executor([modules[module_name] for module_name in import_order])
+        try:
+            if self.stack_manifest is None:
+                for module_name in import_order:
+                    self._load_stack_groups(self._import_module(module_name, modules[module_name]))
+            else:
+                stack_group_modules = {module_name: self._import_module(module_name, modules[module_name]) for module_name in import_order}
+                for module_name in modules:
+                    if module_name in stack_group_modules:
+                        self._load_stack_groups(stack_group_modules[module_name])
+        finally:
+            if executor is not None:
+                self.config_cache.cancel_prefetch()
+                executor.shutdown()
+
+        LOGGER.debug(f'Config cache: {self.config_cache.hits} hits, {self.config_cache.misses} misses')
+        LOGGER.debug(f'Include cache: {INCLUDE_CACHE.hits} hits, {INCLUDE_CACHE.misses} misses')
+        LOGGER.debug(f'Config merge: {self.merge_engine.stats}')
+        LOGGER.debug(f'Config tree index: {len(self.config_tree_index)} directories, {self.config_tree_index.scans} scans')
+        if self.config_interner is not None:
+            LOGGER.debug(
+                f'Config interner: {len(self.config_interner)} unique subtrees, {self.config_interner.hits} duplicates, '
+                f'~{self.config_interner.saved_bytes} bytes saved'
+            )
+        if self.file_cache is not None:
+            self.file_cache.prune()
+            LOGGER.debug(f'Config file cache: {self.file_cache.hits} hits, {self.file_cache.misses} misses')
+
+    def _import_module(self, module_name: str, file: Path) -> 'ModuleType':
+        """
+        Import a stack file, once per process.
+
+        The module is reused when it was already imported from the same file (e.g. by the `import` of another stack file), \
+            otherwise its parent packages are registered and the module is executed, as the Python import system does. \
+            The `__init__.py` files are imported as their package.
+        """
+        if file.name == '__init__.py':
+            package = self._import_package(module_name.rpartition('.')[0], file.parent)
+            if package is not None:
+                return package
+
+        stack_group_module = sys.modules.get(module_name)
+        if stack_group_module is not None and self._is_module_file(stack_group_module, file):
+            return stack_group_module
+
+        package = self._import_package(module_name.rpartition('.')[0], file.parent)
+        spec = importlib.util.spec_from_file_location(module_name, str(file))
+        stack_group_module = importlib.util.module_from_spec(spec)
+        self._exec_module(module_name, stack_group_module, package)
+        return stack_group_module
+
+    def _import_package(self, package_name: str, directory: Path) -> Optional['ModuleType']:
+        """Import the package of a stack file directory, from its `__init__.py` file or as a namespace package."""
+        if not package_name or not all(package_name.split('.')):
+            return None
+
+        package = sys.modules.get(package_name)
+        if package is not None:
+            return package
+
+        parent = self._import_package(package_name.rpartition('.')[0], directory.parent)
+        init_file = directory / '__init__.py'
+        if init_file.is_file():
+            spec = importlib.util.spec_from_file_location(package_name, str(init_file), submodule_search_locations=[os.path.abspath(directory)])
+        else:
+            spec = importlib.machinery.ModuleSpec(package_name, None, is_package=True)
+            spec.submodule_search_locations = [os.path.abspath(directory)]
+
+        package = importlib.util.module_from_spec(spec)
+        self._exec_module(package_name, package, parent)
+        return package
+
+    def _exec_module(self, module_name: str, module: 'ModuleType', package: Optional['ModuleType']) -> None:
+        """Register and execute a module, it's removed from `sys.modules` if it fails."""
+        sys.modules[module_name] = module
+        try:
+            if module.__spec__.loader is not None:
+                module.__spec__.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
+
+        if package is not None:
+            setattr(package, module_name.rpartition('.')[2], module)
+
+    def _is_module_file(self, module: 'ModuleType', file: Path) -> bool:
+        """Check if a module was loaded from a file."""
+        module_file = getattr(module, '__file__', None)
+        return module_file is not None and os.path.realpath(module_file) == os.path.realpath(file)
+
+    def _load_stack_groups(self, stack_group_module: 'ModuleType') -> None:
+        """Create the enabled stack groups defined by a stack file (`StackGroup.registered`) and load their stacks."""
+        for obj in StackGroup.registered(stack_group_module.__name__):
+            if not inspect.isabstract(obj):
+                stack_group_name = self._fullname(obj)
+                if stack_group_name not in self.stack_groups:
+                    module_instance = obj(self.app, self)
+                    if module_instance.enabled:
+                        self.stack_groups[stack_group_name] = module_instance
+                        module_instance._load_stacks()
 
     def resolve_group(self, stack_group_type: Type[CDK_STACK_GROUP_TYPE]) -> CDK_STACK_GROUP_TYPE:
         """
@@ -95,6 +469,14 @@ class StackGroupLoader:
         return self.stack_groups[self._fullname(stack_group_type)]
 
 
+def _expand(pattern: str, names: List[str]) -> List[str]:
+    """Expand a wildcard pattern (`*`, `?` or `[]`) to the matching names, the other patterns are returned as is."""
+    if not any(char in pattern for char in '*?['):
+        return [pattern]
+
+    return [name for name in names if fnmatchcase(name, pattern)]
+
+
 class StackGroup(
     Generic[CDK_APP_TYPE, CDK_CONFIG_TYPE]
 ):
@@ -111,6 +493,15 @@ class StackGroup(
 
     This class is also a singleton class.
 
+    The concrete subclasses are registered by module when they're defined, so the `StackGroupLoader` \
+        creates the stack groups defined by each stack file, at any depth of the class hierarchy. \
+        The base classes (e.g. a project stack group base class) are declared with `abstract=True`:
+
+    ```python
+    class ProjectStackGroup(StackGroup[CDK_CONFIG_TYPE], abstract=True):
+        ...
+    ```
+
     Usage:
         ### AWS CDK
         ```python
@@ -163,6 +554,28 @@ class StackGroup(
         ```
     """
 
+    _registry: Dict[str, Dict[str, type]] = {}
+
+    def __init_subclass__(cls, abstract: bool = False, **kwargs: Any) -> None:
+        """Register the module level stack group classes, except the `abstract` ones."""
+        super().__init_subclass__(**kwargs)
+        if not abstract and cls.__qualname__ == cls.__name__:
+            StackGroup._registry.setdefault(cls.__module__, {})[cls.__name__] = cls
+
+    @staticmethod
+    def registered(module_name: str) -> List[type]:
+        """
+        Get the stack group classes registered by a module.
+
+        Args:
+            module_name (str): module name
+
+        Returns:
+            stack group classes sorted by name, the last definition of each name.
+        """
+        classes = StackGroup._registry.get(module_name, {})
+        return [classes[name] for name in sorted(classes)]
+
     @catch_exceptions
     def __init__(
         self,
@@ -173,15 +586,46 @@ class StackGroup(
         self.app = app
         self._loader = loader
         self.dependencies = []
-        self.env = os.getenv("CDK_ENV", None) or app.node.try_get_context("env")
-        self.region = app.node.try_get_context("region")
+        self.env = loader.env
+        self.region = loader.region
         normalized_module_name = self.__module__.replace(".py", "")
-        self.module_name = '.'.join(normalized_module_name.split('.')[:-1])
-        self.config, self.enabled = ConfigLoader(self.app, self.env, self.region).load_config(self.module_name)
+        if hasattr(sys.modules.get(self.__module__), '__path__'):
+            # stack groups of the `__init__.py` files, imported as their package
+            self.module_name = normalized_module_name
+        else:
+            self.module_name = '.'.join(normalized_module_name.split('.')[:-1])
+        self._config_loader = ConfigLoader(
+            self.app,
+            self.env,
+            self.region,
+            loader.config_cache,
+            loader.file_cache,
+            loader.config_interner,
+            loader.merge_engine,
+            loader.config_artifact,
+            loader.config_tree_index
+        )
+        self.enabled = self._config_loader.config_exists(self.module_name)
+
+    @cached_property
+    @catch_exceptions
+    def config(self) -> dict:
+        """Load the stack group config, on the first access."""
+        return self._config_loader.load_config(self.module_name)[0]
+
+    @cached_property
+    @catch_exceptions
+    def data(self) -> CDK_CONFIG_TYPE:
+        """
+        Decode the stack group config into the config dataclass, on the first access.
 
+        Only available when the stack group is enabled and the config type is a dataclass.
+        """
         config_type = self._resolve_config_type()
-        if self.enabled and config_type is not None and dataclasses.is_dataclass(config_type):
-            self.data = self._get_data(config_type)
+        if not self.enabled or config_type is None or not dataclasses.is_dataclass(config_type):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute 'data'")
+
+        return self._get_data(config_type)
 
     def resolve_group(self, stack_group_type: Type[CDK_STACK_GROUP_TYPE]) -> CDK_STACK_GROUP_TYPE:
         """
@@ -211,10 +655,7 @@ class StackGroup(
 
     def _get_data(self, config_type: Type[CDK_CONFIG_TYPE]) -> CDK_CONFIG_TYPE:
         try:
-            return from_dict(
-                data_class=config_type,
-                data=self.config
-            )
+            return decode_config(config_type, self.config)
         except Exception as e:
             raise InfraRuntimeException(f"Error on parsing config YAML data for stack group '{self.module_name}', {str(e)}")
 
@@ -9,7 +9,7 @@ from cdktf import App
 CDK_CONFIG_TYPE = TypeVar('CDK_CONFIG_TYPE', covariant=True)
 
 
-class StackGroup(BaseStackGroup[App, CDK_CONFIG_TYPE]):
+class StackGroup(BaseStackGroup[App, CDK_CONFIG_TYPE], abstract=True):
     """Stack Group for Terraform CDK."""
 
     def __init__(self, app: App, loader: StackGroupLoader) -> None:
@@ -0,0 +1,95 @@
+"""Shared fixtures of the cdk-organizer tests."""
+
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from cdk_organizer.miscellaneous.yaml_tags.include_cache import INCLUDE_CACHE
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader
+from cdk_organizer.miscellaneous.yaml_tags.pattern_index import PATTERN_INDEX
+from cdk_organizer.stack_group import StackGroup, StackGroupLoader
+from constructs import RootConstruct
+
+# base class of the stack groups of the test projects, the config type is its only generic argument
+STACK_GROUP_BASE = """\
+from typing import TypeVar
+
+from cdk_organizer.stack_group import StackGroup as BaseStackGroup
+
+T = TypeVar('T', covariant=True)
+
+
+class StackGroup(BaseStackGroup[object, T], abstract=True):
+    def _load_stacks(self):
+        self.loaded = True
+"""
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches() -> Any:
+    """Reset the process wide caches, so each test parses its files again."""
+    INCLUDE_CACHE.clear()
+    PATTERN_INDEX.clear()
+    IncludeLoader.lazy_includes = False
+    yield
+    INCLUDE_CACHE.clear()
+    PATTERN_INDEX.clear()
+    IncludeLoader.lazy_includes = False
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Project directory, used as the current directory of the test."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def write_file(project: Path) -> Callable[[str, str], Path]:
+    """Write a file of the project directory, creating its parent directories."""
+    def write(path: str, content: str = '') -> Path:
+        file = project / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(textwrap.dedent(content))
+        return file
+
+    return write
+
+
+@pytest.fixture
+def make_app() -> Callable[..., RootConstruct]:
+    """Create a CDK app with the given context variables."""
+    def make(**context: Any) -> RootConstruct:
+        app = RootConstruct()
+        for key, value in context.items():
+            app.node.set_context(key, value)
+        return app
+
+    return make
+
+
+@pytest.fixture
+def stack_project(project: Path, write_file: Callable[[str, str], Path], make_app: Callable[..., RootConstruct], monkeypatch: pytest.MonkeyPatch) -> Any:
+    """
+    Project with stack files, the stack groups subclass `fw.StackGroup` and the fixture returns a function synthesizing the project.
+
+    The stack modules imported by the test and their registered stack groups are removed after the test.
+    """
+    def clear() -> None:
+        for name in [name for name in sys.modules if name == 'fw' or name.split('.')[0] == 'stacks']:
+            del sys.modules[name]
+        for name in [name for name in StackGroup._registry if name == 'fw' or name.split('.')[0] == 'stacks']:
+            del StackGroup._registry[name]
+
+    def synth(**context: Any) -> StackGroupLoader:
+        loader = StackGroupLoader(make_app(**context))
+        loader.synth()
+        return loader
+
+    monkeypatch.syspath_prepend(str(project))
+    write_file('fw.py', STACK_GROUP_BASE)
+    clear()
+    yield synth
+    clear()
@@ -0,0 +1,79 @@
+"""Tests of the change impact analysis, mapping the changed files to the affected stack groups."""
+
+import pytest
+from cdk_organizer.loaders import change_impact
+from cdk_organizer.loaders.change_impact import ChangeImpact
+
+
+@pytest.fixture
+def tree(write_file):
+    write_file('lib/naming.py', 'def name(value):\n    return value\n')
+    write_file('stacks/storage/stacks.py', """\
+        from lib.naming import name
+        from cdk_organizer.stack_group import StackGroup
+
+
+        class StorageStackGroup(StackGroup):
+            pass
+        """)
+    write_file('stacks/app/stacks.py', """\
+        from stacks.storage.stacks import StorageStackGroup
+        from cdk_organizer.stack_group import StackGroup
+
+
+        class AppStackGroup(StackGroup):
+            def _load_stacks(self):
+                self.resolve_group(StorageStackGroup)
+        """)
+    write_file('stacks/logs/stacks.py', """\
+        from cdk_organizer.stack_group import StackGroup
+
+
+        class LogsStackGroup(StackGroup):
+            pass
+        """)
+    write_file('config/config.yaml', 'project: demo\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'tags: !include ../../../shared/tags.yaml\n')
+    write_file('config/dev/eu-west-1/logs/config.yaml', 'rules: !include_pattern rules/*.yaml\n')
+    write_file('config/dev/eu-west-1/logs/rules/a.yaml', 'a: 1\n')
+    write_file('config/dev/eu-west-1/app/config.yaml', 'name: app\n')
+    write_file('config/shared/tags.yaml', 'owner: platform\n')
+    return write_file
+
+
+@pytest.mark.parametrize('paths, expected', [
+    (['stacks/logs/stacks.py'], ['stacks.logs']),
+    (['lib/naming.py'], ['stacks.app', 'stacks.storage']),
+    (['./config/config.yaml'], ['stacks.app', 'stacks.logs', 'stacks.storage']),
+    (['config/dev/eu-west-1/storage/new.yaml'], ['stacks.app', 'stacks.storage']),
+    (['config/shared/tags.yaml'], ['stacks.app', 'stacks.storage']),
+    (['config/dev/eu-west-1/logs/rules/b.yaml'], ['stacks.logs']),
+    (['config/prod/config.yaml', 'README.md'], []),
+])
+def test_affected_stack_groups(tree, make_app, paths, expected):
+    impact = ChangeImpact(make_app())
+
+    assert impact.stack_groups == ['stacks.app', 'stacks.logs', 'stacks.storage']
+    assert impact.affected(paths) == expected
+
+
+def test_only_the_context_env_and_region_are_indexed(tree, make_app):
+    tree('config/prod/eu-west-1/logs/config.yaml', 'name: prod\n')
+
+    impact = ChangeImpact(make_app(env='dev', region='eu-west-1'))
+
+    assert impact.affected(['config/prod/eu-west-1/logs/config.yaml']) == []
+    assert impact.affected(['config/dev/eu-west-1/logs/config.yaml']) == ['stacks.logs']
+
+
+def test_modules_only_index(tree, make_app):
+    impact = ChangeImpact(make_app(), index_config=False)
+
+    assert impact.affected(['config/config.yaml']) == []
+    assert impact.affected(['stacks/storage/stacks.py']) == ['stacks.app', 'stacks.storage']
+
+
+def test_command_line(tree, capsys):
+    change_impact.main(['--separator', ',', 'config/shared/tags.yaml', 'stacks/logs/stacks.py'])
+
+    assert capsys.readouterr().out == 'stacks.app,stacks.logs,stacks.storage\n'
@@ -0,0 +1,96 @@
+"""Tests of the compiled config artifact and its sources fingerprint."""
+
+import os
+from pathlib import Path
+
+import pytest
+from cdk_organizer.loaders.config_artifact import ConfigArtifact
+from cdk_organizer.loaders.config_compiler import ConfigCompiler
+from cdk_organizer.loaders.config_loader import ConfigLoader
+
+ARTIFACT = 'cdk.out/config.bin'
+
+
+@pytest.fixture
+def tree(write_file):
+    write_file('stacks/storage/stacks.py')
+    write_file('config/config.yaml', 'tags: !include shared/tags.yaml\nparts: !include_pattern parts/*.yaml\n')
+    write_file('config/shared/tags.yaml', 'owner: platform\n')
+    write_file('config/parts/a.yaml', 'a: 1\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    write_file('config/prod/eu-west-1/storage/config.yaml', 'bucket: prod-data\n')
+    return write_file
+
+
+def compile_artifact(app):
+    os.makedirs('cdk.out', exist_ok=True)
+    return ConfigCompiler(app).compile(ARTIFACT)
+
+
+def test_artifact_has_the_config_of_each_folder(tree, make_app):
+    compile_artifact(make_app())
+
+    artifact = ConfigArtifact.open(ARTIFACT, {})
+    try:
+        config, exists = artifact.load(Path('config/prod/eu-west-1/storage'))
+        assert exists
+        assert config == {'tags': {'owner': 'platform'}, 'parts': [{'a': 1}], 'bucket': 'prod-data'}
+        assert artifact.load(Path('config/dev/us-east-1/storage')) is None
+    finally:
+        artifact.close()
+
+
+def test_config_loader_uses_the_artifact(tree, make_app, monkeypatch):
+    app = make_app()
+    compile_artifact(app)
+    monkeypatch.setattr(ConfigLoader, '_load_file', lambda self, path: pytest.fail(f'{path} parsed'))
+
+    artifact = ConfigArtifact.open(ARTIFACT)
+    try:
+        config, exists = ConfigLoader(app, 'dev', 'eu-west-1', artifact=artifact).load_config('stacks.storage.stacks')
+    finally:
+        artifact.close()
+
+    assert exists
+    assert config == {'tags': {'owner': 'platform'}, 'parts': [{'a': 1}], 'bucket': 'data'}
+
+
+def test_same_sources_have_the_same_fingerprint(tree, make_app):
+    first = compile_artifact(make_app())
+    os.utime('config/shared/tags.yaml', ns=(0, 0))
+
+    assert compile_artifact(make_app()) == first
+    assert ConfigArtifact.open(ARTIFACT, {}) is not None
+
+
+@pytest.mark.parametrize('change', [
+    lambda write_file: write_file('config/config.yaml', 'tags: {}\n'),
+    lambda write_file: write_file('config/shared/tags.yaml', 'owner: storage\n'),
+    lambda write_file: write_file('config/parts/b.yaml', 'b: 2\n'),
+    lambda write_file: write_file('config/dev/extra.yaml', 'extra: true\n'),
+    lambda write_file: os.remove('config/dev/eu-west-1/storage/config.yaml'),
+], ids=['source', 'include', 'pattern', 'directory', 'removed'])
+def test_stale_artifact_is_not_opened(tree, make_app, change):
+    compile_artifact(make_app())
+
+    change(tree)
+
+    assert ConfigArtifact.open(ARTIFACT) is None
+
+
+def test_artifact_of_other_strategies_is_not_opened(tree, make_app):
+    compile_artifact(make_app())
+
+    assert ConfigArtifact.open(ARTIFACT, {'tags': 'replace'}) is None
+
+
+def test_invalid_artifacts_are_not_opened(tree, make_app, monkeypatch):
+    assert ConfigArtifact.open(ARTIFACT) is None
+
+    tree(ARTIFACT, 'not an artifact')
+    assert ConfigArtifact.open(ARTIFACT) is None
+
+    compile_artifact(make_app())
+    uid = os.getuid()
+    monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+    assert ConfigArtifact.open(ARTIFACT) is None
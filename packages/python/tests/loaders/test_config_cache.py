@@ -0,0 +1,55 @@
+"""Tests of the shared directory level config cache."""
+
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.config_loader import ConfigLoader
+
+
+def write_tree(write_file):
+    write_file('config/config.yaml', 'project: demo\ntags:\n  owner: platform\n')
+    write_file('config/dev/config.yaml', 'env: dev\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\ntags:\n  team: storage\n')
+    write_file('config/dev/eu-west-1/iam/config.yaml', 'role: admin\n')
+
+
+def test_get_counts_hits_and_misses():
+    cache = ConfigCache()
+    assert cache.get('config') is None
+
+    cache.set('config', ({'a': 1}, ))
+    assert cache.get('config') == ({'a': 1}, )
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_stack_groups_share_the_parent_directories(write_file, make_app, monkeypatch):
+    write_tree(write_file)
+    parsed = []
+    load_file = ConfigLoader._load_file
+    monkeypatch.setattr(ConfigLoader, '_load_file', lambda self, path: parsed.append(path) or load_file(self, path))
+
+    cache = ConfigCache()
+    app = make_app()
+    storage, storage_exists = ConfigLoader(app, 'dev', 'eu-west-1', cache).load_config('stacks.storage.stacks')
+    iam, iam_exists = ConfigLoader(app, 'dev', 'eu-west-1', cache).load_config('stacks.iam.stacks')
+
+    assert dict(storage) == {'project': 'demo', 'env': 'dev', 'bucket': 'data', 'tags': {'owner': 'platform', 'team': 'storage'}}
+    assert dict(iam) == {'project': 'demo', 'env': 'dev', 'role': 'admin', 'tags': {'owner': 'platform'}}
+    assert storage_exists and iam_exists
+    assert sorted(parsed) == sorted([
+        'config/config.yaml',
+        'config/dev/config.yaml',
+        'config/dev/eu-west-1/storage/config.yaml',
+        'config/dev/eu-west-1/iam/config.yaml',
+    ])
+    assert cache.hits > 0
+
+
+def test_missing_module_config(write_file, make_app):
+    write_tree(write_file)
+
+    config, exists = ConfigLoader(make_app(), 'dev', 'eu-west-1').load_config('stacks.missing.stacks')
+
+    assert dict(config) == {'project': 'demo', 'env': 'dev', 'tags': {'owner': 'platform'}}
+    assert not exists
@@ -0,0 +1,115 @@
+"""Tests of the compiled config decoders and their `dacite` fallback."""
+
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Mapping, Optional, Set, Tuple, Union
+
+import pytest
+from cdk_organizer.loaders import config_decoder
+from cdk_organizer.loaders.config_decoder import compile_decoder, decode_config
+from cdk_organizer.loaders.layered_config import LayeredConfig
+from cdk_organizer.loaders.merge_engine import MergeEngine
+from dacite import MissingValueError, UnionMatchError, WrongTypeError, from_dict
+
+
+@dataclass(frozen=True)
+class Tags:
+    owner: str
+    team: Optional[str] = None
+
+
+@dataclass
+class Rule:
+    port: int
+    cidr: str = '0.0.0.0/0'
+
+
+@dataclass
+class Node:
+    name: str
+    children: List['Node'] = field(default_factory=list)
+
+
+@dataclass
+class Config:
+    bucket: str
+    size: float
+    tags: Tags
+    rules: List[Rule]
+    zones: Set[str]
+    by_name: Dict[str, Rule]
+    extra: Mapping[str, Any]
+    tree: Node
+    port: Union[int, str]
+    backup: Optional[Rule] = None
+    labels: list = field(default_factory=list)
+
+
+@dataclass
+class Unsupported:
+    pair: Tuple[int, int]
+    mode: Literal['a', 'b'] = 'a'
+
+
+DATA = {
+    'bucket': 'data',
+    'size': 1,
+    'tags': {'owner': 'platform'},
+    'rules': [{'port': 80}, {'port': 443, 'cidr': '10.0.0.0/8'}],
+    'zones': {'a', 'b'},
+    'by_name': {'http': {'port': 80}},
+    'extra': {'any': ['value']},
+    'tree': {'name': 'root', 'children': [{'name': 'leaf'}]},
+    'port': 'http',
+    'labels': ['x'],
+}
+
+
+def test_compiled_decoder_matches_dacite():
+    assert compile_decoder(Config) is not None
+    assert compile_decoder(Config) is compile_decoder(Config)
+
+    assert decode_config(Config, DATA) == from_dict(data_class=Config, data=DATA)
+
+
+def test_layered_config_is_decoded():
+    config = LayeredConfig.from_layers(({'bucket': 'logs', 'tags': {'team': 'storage'}}, DATA), MergeEngine())
+
+    data = decode_config(Config, config)
+
+    assert data.bucket == 'logs'
+    assert data.tags == Tags(owner='platform', team='storage')
+    assert hash(data.tags) == hash(Tags(owner='platform', team='storage'))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        data.tags.owner = 'other'
+
+
+def test_unsupported_types_are_decoded_by_dacite():
+    assert compile_decoder(Unsupported) is None
+
+    assert decode_config(Unsupported, {'pair': (1, 2), 'mode': 'b'}) == Unsupported(pair=(1, 2), mode='b')
+
+
+@pytest.mark.parametrize('change, error', [
+    ({'bucket': 1}, WrongTypeError),
+    ({'rules': [{'port': '80'}]}, WrongTypeError),
+    ({'tags': None}, WrongTypeError),
+    ({'port': 1.5}, UnionMatchError),
+    ({'tree': {'children': []}}, MissingValueError),
+])
+def test_mismatches_raise_the_dacite_errors(change, error):
+    with pytest.raises(error):
+        decode_config(Config, {**DATA, **change})
+
+
+def test_numeric_tower(monkeypatch):
+    @dataclass
+    class Sized:
+        size: float
+
+    assert decode_config(Sized, {'size': 1}).size == 1
+
+    monkeypatch.setattr(config_decoder, 'NUMERIC_TOWER', False)
+    config_decoder.DECODERS.pop(Sized)
+    with pytest.raises(config_decoder._Mismatch):
+        compile_decoder(Sized)({'size': 1})
@@ -0,0 +1,70 @@
+"""Tests of the config interner, deduplicating the subtrees of the parsed config directories."""
+
+import copy
+import pickle
+
+import pytest
+from cdk_organizer.loaders.config_interner import ConfigInterner, FrozenDict, FrozenList
+from cdk_organizer.loaders.config_loader import ConfigLoader
+
+
+def test_equal_subtrees_are_the_same_object():
+    interner = ConfigInterner()
+
+    first = interner.intern_layer({'tags': {'owner': 'platform', 'zones': ['a', 'b']}})
+    second = interner.intern_layer({'tags': {'owner': 'platform', 'zones': ['a', 'b']}, 'other': ['a', 'b']})
+
+    assert type(first) is dict
+    assert isinstance(first['tags'], FrozenDict)
+    assert first['tags'] is second['tags']
+    assert second['other'] is first['tags']['zones']
+    assert interner.hits == 3
+    assert interner.saved_bytes > 0
+
+
+def test_equal_values_of_different_types_are_not_merged():
+    interner = ConfigInterner()
+
+    first = interner.intern_layer({'a': {'enabled': True}, 'b': [1, 2]})
+    second = interner.intern_layer({'a': {'enabled': 1}, 'b': [2, 1]})
+
+    assert first['a']['enabled'] is True and second['a']['enabled'] == 1
+    assert first['a'] is not second['a']
+    assert second['b'] == [2, 1]
+
+
+def test_unhashable_subtrees_keep_their_interned_children():
+    interner = ConfigInterner()
+    shared = {'owner': 'platform'}
+
+    layer = interner.intern_layer({'a': {'values': {1, 2}, 'tags': {'owner': 'platform'}}, 'b': shared, 'c': shared})
+
+    assert type(layer['a']) is dict
+    assert isinstance(layer['a']['tags'], FrozenDict)
+    assert layer['a']['tags'] is layer['b'] is layer['c']
+
+
+def test_frozen_objects_are_read_only_and_copied_as_plain_objects():
+    frozen = ConfigInterner().intern({'tags': {'owner': 'platform'}, 'zones': ['a']})[0]
+
+    with pytest.raises(TypeError, match='read-only'):
+        frozen['tags'] = {}
+    with pytest.raises(TypeError, match='read-only'):
+        frozen['zones'].append('b')
+
+    value = copy.deepcopy(frozen)
+    assert type(value) is dict and type(value['zones']) is list
+    assert value == {'tags': {'owner': 'platform'}, 'zones': ['a']}
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_config_loader_interns_the_layers(write_file, make_app):
+    write_file('config/config.yaml', 'tags:\n  owner: platform\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\nowner:\n  owner: platform\n')
+
+    config, _ = ConfigLoader(make_app(), 'dev', 'eu-west-1', interner=ConfigInterner()).load_config('stacks.storage.stacks')
+
+    assert config == {'tags': {'owner': 'platform'}, 'bucket': 'data', 'owner': {'owner': 'platform'}}
+    config['tags']['team'] = 'storage'
+    assert type(config['tags']) is not FrozenDict
+    assert not isinstance(config['owner'], FrozenList)
@@ -0,0 +1,42 @@
+"""Tests of the config directories prefetch."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cdk_organizer.loaders.config_cache import ConfigCache
+from cdk_organizer.loaders.config_loader import ConfigLoader
+
+
+def test_prefetched_directories_are_used_by_load_config(write_file, make_app, monkeypatch):
+    write_file('config/config.yaml', 'project: demo\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    write_file('config/dev/eu-west-1/iam/config.yaml', 'role: admin\n')
+    cache = ConfigCache()
+    loader = ConfigLoader(make_app(), 'dev', 'eu-west-1', cache)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        loader.prefetch(['stacks.storage.stacks', 'stacks.iam.stacks'], executor)
+
+    prefetched = sorted(key for key in ('config', 'config/dev/eu-west-1/storage', 'config/dev/eu-west-1/iam') if cache.contains(key))
+    assert prefetched == ['config', 'config/dev/eu-west-1/iam', 'config/dev/eu-west-1/storage']
+
+    monkeypatch.setattr(ConfigLoader, '_load_directory_config', lambda self, path: fail_parse(path))
+    config, exists = loader.load_config('stacks.storage.stacks')
+    assert dict(config) == {'project': 'demo', 'bucket': 'data'}
+    assert exists
+
+
+def test_unused_prefetches_are_cancelled(write_file, make_app):
+    write_file('config/config.yaml', 'project: demo\n')
+    cache = ConfigCache()
+    loader = ConfigLoader(make_app(), 'dev', 'eu-west-1', cache)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        loader.prefetch(['stacks.storage.stacks'], executor)
+    cache.cancel_prefetch()
+
+    assert not cache.contains('config')
+    assert cache.pop_prefetch('config') is None
+
+
+def fail_parse(path):
+    raise AssertionError(f'{path} was parsed again')
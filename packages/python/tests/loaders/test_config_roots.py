@@ -0,0 +1,52 @@
+"""Tests of the config roots of the `configDirectory` context variable."""
+
+import os
+
+import pytest
+from cdk_organizer.loaders.config_loader import ConfigLoader, config_directories
+from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+
+
+@pytest.mark.parametrize('context, expected', [
+    (None, ['config']),
+    ('./settings/', ['settings']),
+    (os.pathsep.join(['base', '', 'overrides']), ['base', 'overrides']),
+    (['base', '/etc/config/'], ['base', '/etc/config']),
+])
+def test_config_directories(make_app, context, expected):
+    assert config_directories(make_app(configDirectory=context)) == expected
+
+
+@pytest.fixture
+def roots(write_file, project, tmp_path_factory):
+    external = tmp_path_factory.mktemp('external')
+    write_file('config/config.yaml', 'tags:\n  owner: platform\nproject: demo\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    (external / 'dev' / 'eu-west-1' / 'storage').mkdir(parents=True)
+    (external / 'config.yaml').write_text('tags:\n  team: storage\n')
+    (external / 'dev' / 'eu-west-1' / 'storage' / 'config.yaml').write_text('bucket: external\n')
+    (external / 'dev' / 'eu-west-1' / 'iam').mkdir(parents=True)
+    return ['config', str(external)]
+
+
+@pytest.mark.parametrize('indexed', [False, True], ids=['probed', 'indexed'])
+def test_later_roots_have_the_higher_priority(make_app, roots, indexed):
+    tree_index = ConfigTreeIndex(*roots) if indexed else None
+    loader = ConfigLoader(make_app(configDirectory=roots), 'dev', 'eu-west-1', tree_index=tree_index)
+
+    config, exists = loader.load_config('stacks.storage.stacks')
+
+    assert exists
+    assert config == {'tags': {'owner': 'platform', 'team': 'storage'}, 'project': 'demo', 'bucket': 'external'}
+
+
+def test_module_config_in_any_root(make_app, roots, write_file):
+    app = make_app(configDirectory=roots)
+
+    assert not ConfigLoader(app, 'dev', 'eu-west-1').config_exists('stacks.iam.stacks')
+
+    write_file(os.path.join(roots[1], 'dev/eu-west-1/iam/config.yaml'), 'role: admin\n')
+    config, exists = ConfigLoader(app, 'dev', 'eu-west-1').load_config('stacks.iam.stacks')
+
+    assert exists
+    assert config['role'] == 'admin'
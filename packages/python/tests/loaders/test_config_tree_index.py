@@ -0,0 +1,60 @@
+"""Tests of the config tree index, listing the config directories once per run."""
+
+import os
+
+from cdk_organizer.loaders.config_loader import ConfigLoader
+from cdk_organizer.loaders.config_tree_index import ConfigTreeIndex
+
+
+def test_index_lists_the_yaml_files(write_file):
+    write_file('config/config.yaml')
+    write_file('config/notes.txt')
+    write_file('config/dev/eu-west-1/storage/config.yaml')
+    write_file('config/dev/eu-west-1/storage/extra.yaml')
+
+    index = ConfigTreeIndex('config')
+
+    assert index.exists('config/dev/eu-west-1')
+    assert not index.exists('config/prod')
+    assert index.yaml_files('config') == ['config/config.yaml']
+    assert sorted(index.yaml_files('config/dev/eu-west-1/storage')) == [
+        'config/dev/eu-west-1/storage/config.yaml',
+        'config/dev/eu-west-1/storage/extra.yaml',
+    ]
+    assert index.yaml_files('config/prod/eu-west-1') is None
+    assert index.has_file('config/config.yaml') and not index.has_file('config/notes.txt')
+    assert len(index) == 4
+
+
+def test_missing_directories_of_the_roots_are_not_scanned(write_file):
+    write_file('config/config.yaml')
+    index = ConfigTreeIndex('config')
+    scans = index.scans
+
+    write_file('config/prod/config.yaml')
+
+    assert not index.exists('config/prod')
+    assert index.scans == scans
+
+
+def test_directories_outside_the_roots_and_links_are_listed_on_lookup(write_file, project):
+    write_file('config/config.yaml')
+    write_file('shared/config.yaml')
+    os.symlink(project / 'shared', project / 'config' / 'linked')
+    index = ConfigTreeIndex('config')
+
+    assert index.yaml_files('config/linked') == ['config/linked/config.yaml']
+    assert index.yaml_files(str(project / 'shared')) == [str(project / 'shared' / 'config.yaml')]
+    assert index.yaml_files(str(project / 'missing')) is None
+
+
+def test_config_loader_uses_the_index(write_file, make_app, monkeypatch):
+    write_file('config/config.yaml', 'project: demo\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    index = ConfigTreeIndex('config')
+    monkeypatch.setattr(os, 'scandir', lambda *args: None)
+
+    config, exists = ConfigLoader(make_app(), 'dev', 'eu-west-1', tree_index=index).load_config('stacks.storage.stacks')
+
+    assert exists
+    assert config == {'project': 'demo', 'bucket': 'data'}
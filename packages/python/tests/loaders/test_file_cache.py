@@ -0,0 +1,129 @@
+"""Tests of the persistent parsed config files cache."""
+
+import os
+import stat
+import time
+
+import pytest
+from cdk_organizer.loaders.file_cache import FileCache, is_owned
+
+
+@pytest.fixture
+def cache_dir(project):
+    return str(project / 'cache')
+
+
+def entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.pickle'))
+
+
+def test_load_yaml_is_served_from_the_cache_directory(write_file, cache_dir):
+    write_file('config.yaml', 'a: 1\n')
+
+    assert FileCache(cache_dir).load_yaml('config.yaml') == {'a': 1}
+    cache = FileCache(cache_dir)
+    assert cache.load_yaml('config.yaml') == {'a': 1}
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert len(entries(cache_dir)) == 1
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
+
+
+def test_changed_file_is_parsed_again(write_file, cache_dir):
+    file = write_file('config.yaml', 'a: 1\n')
+    FileCache(cache_dir).load_yaml('config.yaml')
+
+    file.write_text('a: 2\n')
+    cache = FileCache(cache_dir)
+    assert cache.load_yaml('config.yaml') == {'a': 2}
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_changed_included_file_invalidates_the_entry(write_file, cache_dir):
+    write_file('config.yaml', 'tags: !include tags.yaml\n')
+    tags = write_file('tags.yaml', 'owner: platform\n')
+    FileCache(cache_dir).load_yaml('config.yaml')
+
+    tags.write_text('owner: storage\n')
+    cache = FileCache(cache_dir)
+    assert cache.load_yaml('config.yaml') == {'tags': {'owner': 'storage'}}
+    assert cache.misses == 1
+
+
+def test_new_pattern_match_invalidates_the_entry(write_file, cache_dir):
+    write_file('config.yaml', 'parts: !include_pattern parts/*.yaml\n')
+    write_file('parts/a.yaml', 'a: 1\n')
+    FileCache(cache_dir).load_yaml('config.yaml')
+
+    write_file('parts/b.yaml', 'b: 2\n')
+    cache = FileCache(cache_dir)
+    assert cache.load_yaml('config.yaml') == {'parts': [{'a': 1}, {'b': 2}]}
+    assert cache.misses == 1
+
+
+def test_invalid_entry_is_ignored(write_file, cache_dir):
+    write_file('config.yaml', 'a: 1\n')
+    cache = FileCache(cache_dir)
+    cache.load_yaml('config.yaml')
+    for name in entries(cache_dir):
+        with open(os.path.join(cache_dir, name), 'wb') as file:
+            file.write(b'not a pickle')
+
+    assert FileCache(cache_dir).load_yaml('config.yaml') == {'a': 1}
+
+
+def test_prune_evicts_the_least_recently_used_entries(write_file, cache_dir):
+    for name in ('a', 'b', 'c'):
+        write_file(f'{name}.yaml', f'{name}: {"x" * 100}\n')
+
+    cache = FileCache(cache_dir)
+    for age, name in enumerate(('a', 'b', 'c')):
+        cache.load_yaml(f'{name}.yaml')
+        for entry in entries(cache_dir):
+            path = os.path.join(cache_dir, entry)
+            if os.path.getmtime(path) > time.time() - 60:
+                os.utime(path, (time.time() - 3 + age, time.time() - 3 + age))
+
+    stale_temp = os.path.join(cache_dir, 'stale.tmp')
+    open(stale_temp, 'w').close()
+    os.utime(stale_temp, (0, 0))
+    sizes = sorted(os.path.getsize(os.path.join(cache_dir, entry)) for entry in entries(cache_dir))
+    cache.max_size = sum(sizes[-2:])
+    cache.prune()
+
+    assert len(entries(cache_dir)) == 2
+    assert not os.path.exists(stale_temp)
+    assert FileCache(cache_dir).load_yaml('c.yaml') == {'c': 'x' * 100}
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='user ids are not available')
+def test_cache_directory_is_private(cache_dir):
+    FileCache(cache_dir)
+
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077 == 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='user ids are not available')
+def test_entries_of_other_users_are_not_loaded(write_file, cache_dir, monkeypatch):
+    write_file('config.yaml', 'a: 1\n')
+    cache = FileCache(cache_dir)
+    cache.load_yaml('config.yaml')
+
+    uid = os.getuid()
+    monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+    assert cache.load_yaml('config.yaml') == {'a': 1}
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='user ids are not available')
+def test_directory_of_other_users_is_not_used(write_file, cache_dir, monkeypatch):
+    write_file('config.yaml', 'a: 1\n')
+    os.makedirs(cache_dir)
+    uid = os.getuid()
+    monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+
+    cache = FileCache(cache_dir)
+    assert not cache.trusted
+    assert cache.load_yaml('config.yaml') == {'a': 1}
+    cache.prune()
+    assert entries(cache_dir) == []
+    assert not is_owned(os.stat(cache_dir))
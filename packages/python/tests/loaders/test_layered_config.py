@@ -0,0 +1,67 @@
+"""Tests of the layered config, resolving the keys through the shared config layers."""
+
+import copy
+import json
+import pickle
+
+import pytest
+import yaml
+from cdk_organizer.loaders.layered_config import LayeredConfig
+from cdk_organizer.loaders.merge_engine import MergeEngine
+
+ROOT = {'project': 'demo', 'tags': {'owner': 'platform', 'cost': 'shared'}, 'zones': ['a']}
+PARENT = {'env': 'dev', 'tags': 'none', 'zones': ['b']}
+CHILD = {'tags': {'team': 'storage'}, 'bucket': {'name': 'data'}}
+
+
+def layered():
+    return LayeredConfig.from_layers((CHILD, PARENT, ROOT), MergeEngine())
+
+
+def merged():
+    engine = MergeEngine()
+    # each layer is merged into the next lower priority one, from the stack group folder up to the root folder
+    return engine.merge(copy.deepcopy(ROOT), engine.merge(copy.deepcopy(PARENT), copy.deepcopy(CHILD)))
+
+
+def test_same_result_as_merging_the_layers():
+    config = layered()
+
+    assert config == merged()
+    assert config['tags'] == {'owner': 'platform', 'cost': 'shared', 'team': 'storage'}
+    assert config['zones'] == ['b']
+    assert list(config) == list(merged())
+
+
+def test_writes_do_not_change_the_layers():
+    config = layered()
+
+    config['tags']['owner'] = 'storage'
+    config['zones'].append('c')
+    config['bucket']['name'] = 'logs'
+    del config['project']
+
+    assert ROOT == {'project': 'demo', 'tags': {'owner': 'platform', 'cost': 'shared'}, 'zones': ['a']}
+    assert PARENT['zones'] == ['b']
+    assert CHILD['bucket'] == {'name': 'data'}
+    assert layered() == merged()
+
+
+def test_copies_are_plain_dicts():
+    config = layered()
+
+    for value in (copy.deepcopy(config), pickle.loads(pickle.dumps(config)), config.copy()):
+        assert type(value) is dict
+        assert value == merged()
+
+    assert type(copy.deepcopy(config)['tags']) is dict
+
+
+@pytest.mark.parametrize('dumper', [yaml.SafeDumper, yaml.Dumper, getattr(yaml, 'CSafeDumper', yaml.SafeDumper)])
+def test_yaml_dump(dumper):
+    assert yaml.safe_load(yaml.dump(layered(), Dumper=dumper)) == merged()
+    assert yaml.safe_load(yaml.safe_dump(LayeredConfig.from_layers(({'a': 1}, {'b': {'c': 2}}), MergeEngine()))) == {'a': 1, 'b': {'c': 2}}
+
+
+def test_json_dump():
+    assert json.loads(json.dumps(layered())) == merged()
@@ -0,0 +1,89 @@
+"""Tests of the merge strategies of the config keys."""
+
+import copy
+
+import pytest
+from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException
+from cdk_organizer.loaders.config_loader import ConfigLoader
+from cdk_organizer.loaders.layered_config import LayeredConfig
+from cdk_organizer.loaders.merge_engine import MergeEngine
+
+BASE = {
+    'tags': {'owner': 'platform'},
+    'subnets': ['10.0.0.0/24'],
+    'rules': [{'port': 80, 'cidr': '0.0.0.0/0'}, {'port': 443}],
+    'network': {'zones': ['a']},
+}
+OVERRIDE = {
+    'tags': {'team': 'storage'},
+    'subnets': ['10.0.1.0/24'],
+    'rules': [{'cidr': '10.0.0.0/8'}],
+    'network': {'zones': ['b']},
+}
+
+
+def merge(strategies=None, base=BASE, override=OVERRIDE):
+    engine = MergeEngine(strategies)
+    merged = engine.merge(copy.deepcopy(base), copy.deepcopy(override))
+
+    # the layered config resolves the keys with the same rules
+    assert LayeredConfig.from_layers((override, base), MergeEngine(strategies)) == merged
+    return merged
+
+
+def test_default_rules():
+    assert merge() == {
+        'tags': {'owner': 'platform', 'team': 'storage'},
+        'subnets': ['10.0.1.0/24'],
+        'rules': [{'cidr': '10.0.0.0/8'}],
+        'network': {'zones': ['b']},
+    }
+
+
+def test_loader_strategies():
+    merged = merge({'tags': 'replace', 'subnets': 'append', 'rules': 'merge_lists', 'network.zones': 'append'})
+
+    assert merged == {
+        'tags': {'team': 'storage'},
+        'subnets': ['10.0.0.0/24', '10.0.1.0/24'],
+        'rules': [{'port': 80, 'cidr': '10.0.0.0/8'}, {'port': 443}],
+        'network': {'zones': ['a', 'b']},
+    }
+
+
+def test_strategies_are_ignored_for_other_types():
+    assert merge({'subnets': 'append'}, base={'subnets': 'none'}, override={'subnets': ['a']}) == {'subnets': ['a']}
+
+
+def test_declared_strategies_of_the_higher_priority_config_win():
+    base = {'__merge__': {'subnets': 'append', 'tags': 'replace'}, 'subnets': ['a'], 'tags': {'owner': 'platform'}}
+    override = {'__merge__': {'tags': 'merge'}, 'subnets': ['b'], 'tags': {'team': 'storage'}}
+
+    merged = LayeredConfig.from_layers((override, base), MergeEngine())
+
+    assert merged == {'subnets': ['a', 'b'], 'tags': {'owner': 'platform', 'team': 'storage'}}
+
+
+@pytest.mark.parametrize('strategies', [{'subnets': 'prepend'}, {'network.zones': 'concat'}])
+def test_invalid_loader_strategy(strategies):
+    with pytest.raises(InfraRuntimeException, match='Invalid merge strategy'):
+        MergeEngine(strategies)
+
+
+def test_invalid_declared_strategy():
+    with pytest.raises(InfraRuntimeException, match="Invalid merge strategy 'prepend' for 'subnets'"):
+        merge(base={'subnets': ['a']}, override={'__merge__': {'subnets': 'prepend'}, 'subnets': ['b']})
+
+
+def test_config_loader_applies_the_declared_strategies(write_file, make_app):
+    write_file('config/config.yaml', 'subnets:\n  - 10.0.0.0/24\n')
+    write_file('config/dev/eu-west-1/network/config.yaml', """\
+        __merge__:
+          subnets: append
+        subnets:
+          - 10.0.1.0/24
+        """)
+
+    config, _ = ConfigLoader(make_app(), 'dev', 'eu-west-1').load_config('stacks.network.stacks')
+
+    assert config == {'subnets': ['10.0.0.0/24', '10.0.1.0/24']}
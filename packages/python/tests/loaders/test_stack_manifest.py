@@ -0,0 +1,115 @@
+"""Tests of the stack manifest, discovering the stack groups of the stack files without importing them."""
+
+import json
+import os
+from pathlib import Path
+
+from cdk_organizer.loaders.stack_manifest import StackManifest
+
+FILES = {
+    'stacks/base/common.py': """\
+        from cdk_organizer.aws.stack_group import StackGroup as Group
+
+
+        class ProjectBase(Group, abstract=True):
+            pass
+        """,
+    'stacks/app/stacks.py': """\
+        from stacks.base.common import ProjectBase
+        from stacks.db.stacks import DatabaseStackGroup
+
+
+        class App(ProjectBase):
+            def _load_stacks(self):
+                self.resolve_group(DatabaseStackGroup)
+        """,
+    'stacks/db/stacks.py': """\
+        from cdk_organizer.stack_group import StackGroup
+
+
+        class DatabaseStackGroup(StackGroup[object, dict]):
+            pass
+        """,
+    'stacks/lib/stacks.py': """\
+        from lib.base import Base
+
+
+        class Unknown(Base):
+            pass
+        """,
+    'stacks/util/helpers.py': """\
+        import enum
+
+
+        class Mode(enum.Enum):
+            A = 'a'
+
+
+        class Failed(Exception):
+            pass
+
+
+        class Plain:
+            pass
+
+
+        def helper():
+            pass
+        """,
+    'stacks/broken/stacks.py': 'class Broken(:\n',
+}
+
+
+def write_tree(write_file):
+    for path, content in FILES.items():
+        write_file(path, content)
+
+    return {path[:-3].replace('/', '.'): Path(path) for path in FILES}
+
+
+def test_discover_stack_groups(write_file):
+    modules = write_tree(write_file)
+    manifest = StackManifest()
+
+    order = manifest.discover(modules)
+
+    assert set(order) == {'stacks.base.common', 'stacks.app.stacks', 'stacks.db.stacks', 'stacks.lib.stacks', 'stacks.broken.stacks'}
+    assert order.index('stacks.base.common') < order.index('stacks.app.stacks')
+    assert order.index('stacks.db.stacks') < order.index('stacks.app.stacks')
+    assert manifest.stack_groups(Path('stacks/app/stacks.py')) == ['App']
+    assert manifest.stack_groups(Path('stacks/base/common.py')) == ['ProjectBase']
+    assert manifest.stack_groups(Path('stacks/lib/stacks.py')) == ['Unknown']
+    assert manifest.stack_groups(Path('stacks/util/helpers.py')) == []
+    assert manifest.stack_groups(Path('stacks/broken/stacks.py')) is None
+    assert manifest.parsed == len(FILES)
+
+
+def test_persisted_manifest_only_parses_the_changed_files(write_file):
+    modules = write_tree(write_file)
+    first = StackManifest('cdk.out/manifest.json')
+    order = first.discover(modules)
+    first.save()
+
+    manifest = StackManifest('cdk.out/manifest.json')
+    assert manifest.discover(modules) == order
+    assert manifest.parsed == 0
+
+    os.utime('stacks/db/stacks.py', ns=(0, 0))
+    write_file('stacks/util/helpers.py', 'from cdk_organizer.stack_group import StackGroup\n\n\nclass UtilStackGroup(StackGroup):\n    pass\n')
+    manifest = StackManifest('cdk.out/manifest.json')
+    assert 'stacks.util.helpers' in manifest.discover(modules)
+    assert manifest.parsed == 1
+
+    manifest.save()
+    with open('cdk.out/manifest.json') as file:
+        assert json.load(file)['files']['stacks/db/stacks.py']['mtime_ns'] == 0
+
+
+def test_invalid_manifest_is_ignored(write_file):
+    modules = write_tree(write_file)
+    write_file('cdk.out/manifest.json', 'not json')
+
+    manifest = StackManifest('cdk.out/manifest.json')
+
+    assert 'stacks.app.stacks' in manifest.discover(modules)
+    assert manifest.parsed == len(FILES)
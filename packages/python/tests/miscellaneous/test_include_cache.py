@@ -0,0 +1,93 @@
+"""Tests of the included files cache."""
+
+import os
+
+import yaml
+from cdk_organizer.miscellaneous.yaml_tags.include_cache import INCLUDE_CACHE, IncludeCache, IncludeCacheEntry
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import yaml_path_loader
+
+
+def load(path):
+    with open(path, 'r') as file:
+        return yaml.load(file.read(), yaml_path_loader(path))
+
+
+def test_included_file_is_parsed_once(write_file):
+    write_file('a.yaml', 'tags: !include tags.yaml\n')
+    write_file('b.yaml', 'tags: !include tags.yaml\n')
+    write_file('tags.yaml', 'owner: platform\n')
+
+    first = load('a.yaml')
+    second = load('b.yaml')
+
+    assert first == second == {'tags': {'owner': 'platform'}}
+    assert first['tags'] is not second['tags']
+    assert (INCLUDE_CACHE.hits, INCLUDE_CACHE.misses) == (1, 1)
+
+
+def test_params_are_part_of_the_key(write_file):
+    write_file('config.yaml', """\
+        a: !include {path: bucket.yaml, params: {name: a}}
+        b: !include {path: bucket.yaml, params: {name: b}}
+        """)
+    write_file('bucket.yaml', 'name: "{{ name }}"\n')
+
+    assert load('config.yaml') == {'a': {'name': 'a'}, 'b': {'name': 'b'}}
+
+
+def test_changed_nested_include_invalidates_the_entry(write_file):
+    write_file('config.yaml', 'tags: !include tags.yaml\n')
+    write_file('tags.yaml', 'owner: !include owner.yaml\n')
+    owner = write_file('owner.yaml', 'platform\n')
+    load('config.yaml')
+
+    owner.write_text('storage-team\n')
+    stat = os.stat(owner)
+    os.utime(owner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert load('config.yaml') == {'tags': {'owner': 'storage-team'}}
+
+
+def test_files_using_parent_anchors_are_not_cached(write_file):
+    write_file('a.yaml', 'owner: &owner a\ntags: !include tags.yaml\n')
+    write_file('b.yaml', 'owner: &owner b\ntags: !include tags.yaml\n')
+    write_file('tags.yaml', 'nested: !include owner.yaml\n')
+    write_file('owner.yaml', 'owner: *owner\n')
+
+    assert load('a.yaml')['tags'] == {'nested': {'owner': 'a'}}
+    assert load('b.yaml')['tags'] == {'nested': {'owner': 'b'}}
+    assert len(INCLUDE_CACHE) == 0
+
+
+def test_anchors_of_nested_includes_are_restored_from_the_cache(write_file):
+    write_file('a.yaml', 'shared: !include outer.yaml\ntags: !include tags.yaml\n')
+    write_file('b.yaml', 'shared: !include outer.yaml\ntags: !include tags.yaml\n')
+    write_file('outer.yaml', 'inner: !include inner.yaml\n')
+    write_file('inner.yaml', 'name: &owner platform\n')
+    write_file('tags.yaml', 'owner: *owner\n')
+
+    assert load('a.yaml')['tags'] == {'owner': 'platform'}
+    assert load('b.yaml')['tags'] == {'owner': 'platform'}
+    assert INCLUDE_CACHE.hits == 1
+
+
+def test_least_recently_used_entries_are_evicted(write_file):
+    for name in ('a', 'b', 'c'):
+        write_file(f'{name}.yaml', 'x' * 10)
+
+    cache = IncludeCache(max_size=25)
+    for name in ('a', 'b'):
+        cache.set(f'{name}.yaml', {}, IncludeCacheEntry(name))
+    cache.get('a.yaml', {})
+    cache.set('c.yaml', {}, IncludeCacheEntry('c'))
+
+    assert cache.contains('a.yaml', {}) and cache.contains('c.yaml', {})
+    assert not cache.contains('b.yaml', {})
+
+
+def test_disabled_cache(write_file):
+    write_file('a.yaml', 'a')
+    cache = IncludeCache(max_size=0)
+    cache.set('a.yaml', {}, IncludeCacheEntry('a'))
+
+    assert len(cache) == 0
@@ -0,0 +1,86 @@
+"""Tests of the YAML loader and its `!include`, `!include_pattern` and `!merge` tags."""
+
+import pytest
+import yaml
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader, yaml_path_loader
+
+
+def load(path):
+    with open(path, 'r') as file:
+        loader = yaml_path_loader(path)(file.read())
+
+    try:
+        return loader.get_single_data(), loader
+    finally:
+        loader.dispose()
+
+
+def test_include_is_resolved_relative_to_the_file(write_file):
+    write_file('config/config.yaml', 'tags: !include shared/tags.yaml\n')
+    write_file('config/shared/tags.yaml', 'owner: platform\n')
+
+    data, loader = load('config/config.yaml')
+
+    assert data == {'tags': {'owner': 'platform'}}
+    assert [path.endswith('config/shared/tags.yaml') for path in loader.dependencies] == [True]
+
+
+def test_included_file_uses_the_anchors_of_the_including_file(write_file):
+    write_file('config.yaml', """\
+        owner: &owner platform
+        tags: !include tags.yaml
+        """)
+    write_file('tags.yaml', 'owner: *owner\n')
+
+    assert load('config.yaml')[0] == {'owner': 'platform', 'tags': {'owner': 'platform'}}
+
+
+def test_include_params_and_pointer(write_file):
+    write_file('config.yaml', """\
+        bucket: !include
+          path: bucket.yaml
+          params:
+            name: data
+        prefixes: !include
+          path: ranges.json
+          pointer: /prefixes/0
+        """)
+    write_file('bucket.yaml', 'name: "{{ name }}-bucket"\n')
+    write_file('ranges.json', '{"prefixes": [{"ip": "10.0.0.0/8"}]}')
+
+    assert load('config.yaml')[0] == {'bucket': {'name': 'data-bucket'}, 'prefixes': {'ip': '10.0.0.0/8'}}
+
+
+def test_undefined_param_is_an_error(write_file):
+    write_file('config.yaml', 'bucket: !include bucket.yaml\n')
+    write_file('bucket.yaml', 'name: "{{ name }}"\n')
+
+    with pytest.raises(yaml.constructor.ConstructorError, match='undefined variable'):
+        load('config.yaml')
+
+
+def test_include_pattern_and_merge(write_file):
+    write_file('config.yaml', """\
+        parts: !include_pattern parts/*.yaml
+        merged: !merge
+          - [1]
+          - [2, 3]
+          - 4
+        """)
+    write_file('parts/b.yaml', 'b: 2\n')
+    write_file('parts/a.yaml', 'a: 1\n')
+    write_file('parts/.hidden.yaml', 'hidden: true\n')
+
+    data, loader = load('config.yaml')
+
+    assert data == {'parts': [{'a': 1}, {'b': 2}], 'merged': [1, 2, 3, 4]}
+    assert loader.patterns == [('parts/*.yaml', ['parts/a.yaml', 'parts/b.yaml'])]
+
+
+def test_loader_keeps_the_safe_loader_rules(write_file):
+    write_file('config.yaml', 'value: !!python/object:object {}\n')
+
+    with pytest.raises(yaml.constructor.ConstructorError):
+        load('config.yaml')
+
+    assert issubclass(IncludeLoader, yaml.constructor.SafeConstructor)
@@ -0,0 +1,79 @@
+"""Tests of the JSON includes and pointers."""
+
+import pytest
+import yaml
+from cdk_organizer.miscellaneous.yaml_tags import include_yaml, json_include
+from cdk_organizer.miscellaneous.yaml_tags.json_include import load_json_file, loads, resolve_json_pointer
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def decoder(request, monkeypatch):
+    """Run the test with `orjson`, when installed, and with the `json` module."""
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(json_include, 'orjson', None)
+
+    return request.param
+
+
+def test_load_json_file(write_file, decoder):
+    path = write_file('ranges.json', '{"prefixes": [{"ip": "10.0.0.0/8"}], "name": "é"}')
+
+    assert load_json_file(str(path)) == {'prefixes': [{'ip': '10.0.0.0/8'}], 'name': 'é'}
+    assert load_json_file(str(path), '[1]') == [1]
+
+
+def test_load_empty_json_file(write_file, decoder):
+    path = write_file('empty.json')
+
+    with pytest.raises(ValueError):
+        load_json_file(str(path))
+
+
+def test_unsupported_documents_fall_back_to_the_json_module(write_file, decoder):
+    path = write_file('large.json', '{"big": 123456789012345678901234567890, "nan": NaN}')
+
+    document = load_json_file(str(path))
+
+    assert document['big'] == 123456789012345678901234567890
+    assert document['nan'] != document['nan']
+    assert loads(b'[NaN]')[0] != loads(b'[NaN]')[0]
+
+
+def test_resolve_json_pointer():
+    document = {'a': {'b': [1, 2]}, 'c/d': {'e~f': 3}}
+
+    assert resolve_json_pointer(document, '') is document
+    assert resolve_json_pointer(document, '/a/b/1') == 2
+    assert resolve_json_pointer(document, '/c~1d/e~0f') == 3
+
+
+@pytest.mark.parametrize('pointer, message', [
+    ('a/b', 'must start with'),
+    ('/a/c', 'not found'),
+    ('/a/b/2', 'not found'),
+    ('/a/b/x', 'not found'),
+])
+def test_invalid_json_pointer(pointer, message):
+    with pytest.raises(yaml.constructor.ConstructorError, match=message):
+        resolve_json_pointer({'a': {'b': [1, 2]}}, pointer)
+
+
+def test_json_file_is_parsed_once_for_all_the_pointers(write_file, monkeypatch):
+    write_file('config.yaml', """\
+        first: !include
+          path: ranges.json
+          pointer: /prefixes/0
+        all: !include ranges.json
+        """)
+    write_file('ranges.json', '{"prefixes": [{"ip": "10.0.0.0/8"}]}')
+    parsed = []
+    monkeypatch.setattr(include_yaml, 'load_json_file', lambda path, content=None: parsed.append(path) or load_json_file(path, content))
+
+    with open('config.yaml', 'r') as file:
+        data = yaml.load(file.read(), include_yaml.yaml_path_loader('config.yaml'))
+
+    assert data == {'first': {'ip': '10.0.0.0/8'}, 'all': {'prefixes': [{'ip': '10.0.0.0/8'}]}}
+    assert data['first'] is not data['all']['prefixes'][0]
+    assert len(parsed) == 1
@@ -0,0 +1,96 @@
+"""Tests of the lazy includes, enabled by the `lazyIncludes` context variable."""
+
+from functools import partial
+
+import pytest
+from cdk_organizer.loaders.config_loader import ConfigLoader
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import IncludeLoader, yaml_path_loader
+from cdk_organizer.miscellaneous.yaml_tags.lazy_include import LazyConfig, LazyInclude, has_lazy_include, materialize
+
+
+@pytest.fixture
+def lazy_includes():
+    IncludeLoader.lazy_includes = True
+
+
+def load(path):
+    with open(path, 'r') as file:
+        loader = yaml_path_loader(path)(file.read())
+
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+def test_included_file_is_read_on_resolve(write_file, lazy_includes):
+    write_file('config.yaml', 'tags: !include tags.yaml\n')
+
+    data = load('config.yaml')
+    assert isinstance(data['tags'], LazyInclude)
+
+    # the file doesn't exist when the including file is loaded
+    write_file('tags.yaml', 'owner: platform\n')
+    assert data['tags'].resolve() == {'owner': 'platform'}
+
+
+def test_lazy_include_uses_the_anchors_of_the_including_file(write_file, lazy_includes):
+    write_file('config.yaml', """\
+        owner: &owner platform
+        tags: !include tags.yaml
+        parts: !include_pattern parts/*.yaml
+        """)
+    write_file('tags.yaml', 'owner: *owner\n')
+    write_file('parts/a.yaml', 'a: *owner\n')
+
+    assert materialize(load('config.yaml')) == {'owner': 'platform', 'tags': {'owner': 'platform'}, 'parts': [{'a': 'platform'}]}
+
+
+def test_materialize_resolves_nested_values():
+    value = {'a': [LazyInclude(partial(dict, b=LazyInclude(partial(list, 'xy'))))], 'c': 1}
+
+    assert has_lazy_include(value)
+    assert materialize(value) == {'a': [{'b': ['x', 'y']}], 'c': 1}
+    assert not has_lazy_include(value)
+
+
+def test_lazy_config_resolves_only_the_accessed_keys():
+    resolved = []
+
+    def resolver(key):
+        resolved.append(key)
+        return {'key': key}
+
+    config = LazyConfig(a=LazyInclude(partial(resolver, 'a')), b=LazyInclude(partial(resolver, 'b')), c=1)
+
+    assert config['a'] == {'key': 'a'}
+    assert config.get('c') == 1
+    assert resolved == ['a']
+
+    assert dict(config.items()) == {'a': {'key': 'a'}, 'b': {'key': 'b'}, 'c': 1}
+    assert resolved == ['a', 'b']
+
+
+def test_lazy_config_copies_are_materialized():
+    config = LazyConfig(a=LazyInclude(partial(dict, b=1)))
+
+    assert config.copy() == {'a': {'b': 1}}
+    assert type(config.copy()) is dict
+    assert config == {'a': {'b': 1}}
+
+
+def test_config_loader_resolves_the_lazy_includes_on_access(write_file, make_app, lazy_includes):
+    write_file('config/config.yaml', """\
+        tags: !include tags.yaml
+        unused: !include missing.yaml
+        """)
+    write_file('config/tags.yaml', 'owner: platform\n')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+
+    config, exists = ConfigLoader(make_app(), 'dev', 'eu-west-1').load_config('stacks.storage.stacks')
+
+    assert exists
+    assert config['tags'] == {'owner': 'platform'}
+    assert config['bucket'] == 'data'
+    with pytest.raises(FileNotFoundError):
+        config['unused']
@@ -0,0 +1,70 @@
+"""Tests of the `!include_pattern` directory index."""
+
+import glob
+import os
+
+import yaml
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import yaml_path_loader
+from cdk_organizer.miscellaneous.yaml_tags.pattern_index import PARALLEL_READ_THRESHOLD, PATTERN_INDEX, PatternIndex
+
+
+def load(path):
+    with open(path, 'r') as file:
+        return yaml.load(file.read(), yaml_path_loader(path))
+
+
+def test_glob_follows_the_glob_module_rules(write_file):
+    for path in ('a/x.yaml', 'a/y.yml', 'a/.hidden.yaml', 'b/x.yaml', 'b/c/x.yaml', 'a.yaml'):
+        write_file(path, '')
+
+    index = PatternIndex()
+    for pattern in ('*/*.yaml', 'a/*', 'a/.*', '*/c/*.yaml', 'a.yaml', 'missing/*.yaml', './a/../b/*.yaml', '*'):
+        assert index.glob(pattern) == sorted(glob.glob(pattern)), pattern
+
+
+def test_absolute_patterns(project, write_file):
+    write_file('a/x.yaml', '')
+
+    assert PatternIndex().glob(str(project / 'a' / '*.yaml')) == [str(project / 'a' / 'x.yaml')]
+
+
+def test_added_and_removed_files_are_listed_again(write_file):
+    write_file('parts/a.yaml', '')
+    index = PatternIndex()
+    assert index.glob('parts/*.yaml') == ['parts/a.yaml']
+
+    write_file('parts/b.yaml', '')
+    assert index.glob('parts/*.yaml') == ['parts/a.yaml', 'parts/b.yaml']
+
+    os.remove('parts/a.yaml')
+    assert index.glob('parts/*.yaml') == ['parts/b.yaml']
+
+
+def test_read_files_in_parallel(write_file):
+    paths = [str(write_file(f'parts/{index}.yaml', f'index: {index}\n')) for index in range(PARALLEL_READ_THRESHOLD)]
+
+    assert PatternIndex(max_workers=2).read_files(paths[:1]) == {}
+    assert PatternIndex(max_workers=2).read_files(paths) == {path: f'index: {index}\n' for index, path in enumerate(paths)}
+
+
+def test_include_pattern_matches_new_files_in_the_same_process(write_file):
+    write_file('config.yaml', 'parts: !include_pattern parts/*.yaml\n')
+    write_file('parts/a.yaml', 'a: 1\n')
+    assert load('config.yaml') == {'parts': [{'a': 1}]}
+
+    write_file('parts/b.yaml', 'b: 2\n')
+    assert load('config.yaml') == {'parts': [{'a': 1}, {'b': 2}]}
+
+    os.remove('parts/a.yaml')
+    assert load('config.yaml') == {'parts': [{'b': 2}]}
+    assert PATTERN_INDEX.glob('parts/*.yaml') == ['parts/b.yaml']
+
+
+def test_nested_pattern_invalidates_the_include_cache(write_file):
+    write_file('config.yaml', 'shared: !include shared.yaml\n')
+    write_file('shared.yaml', 'parts: !include_pattern parts/*.yaml\n')
+    write_file('parts/a.yaml', 'a: 1\n')
+    load('config.yaml')
+
+    write_file('parts/b.yaml', 'b: 2\n')
+    assert load('config.yaml') == {'shared': {'parts': [{'a': 1}, {'b': 2}]}}
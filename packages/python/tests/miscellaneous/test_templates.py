@@ -0,0 +1,35 @@
+"""Tests of the include params templates."""
+
+from unittest import mock
+
+import pytest
+import yaml
+from cdk_organizer.miscellaneous.yaml_tags import include_yaml
+from cdk_organizer.miscellaneous.yaml_tags.include_yaml import compile_template, resolve_variables
+
+
+@pytest.fixture(autouse=True)
+def clear_templates():
+    compile_template.cache_clear()
+
+
+def test_plain_values_are_not_rendered():
+    with mock.patch.object(include_yaml, 'compile_template', wraps=compile_template) as compile_mock:
+        assert resolve_variables('name: data', {'name': 'other'}) == 'name: data'
+
+    compile_mock.assert_not_called()
+
+
+def test_templates_are_compiled_once():
+    assert resolve_variables('name: {{ name }}', {'name': 'a'}) == 'name: a'
+    assert resolve_variables('name: {{ name }}', {'name': 'b'}) == 'name: b'
+
+    info = compile_template.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_templates_are_escaped_and_strict():
+    assert resolve_variables('{{ value }}', {'value': '<a>'}) == '&lt;a&gt;'
+
+    with pytest.raises(yaml.constructor.ConstructorError, match='undefined variable'):
+        resolve_variables('{# comment #}{{ missing }}', {})
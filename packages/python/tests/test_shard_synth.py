@@ -0,0 +1,163 @@
+"""Tests of the sharded synth and of the merge of the shard outputs."""
+
+import json
+import os
+import sys
+
+import pytest
+from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException
+from cdk_organizer.loaders.config_compiler import context_app
+from cdk_organizer.shard_synth import ShardedSynth, clean_output, merge_json, merge_output
+
+# app of the tests, writes a template of each stack group and a manifest listing them
+SHARD_APP = """\
+import json
+import os
+
+output = os.environ['CDK_OUTDIR']
+context = json.loads(os.environ['CDK_CONTEXT_JSON'])
+stack_groups = context['stackGroups'].split(',')
+for stack_group in stack_groups:
+    with open(os.path.join(output, stack_group + '.template.json'), 'w') as file:
+        json.dump({'stackGroup': stack_group}, file)
+with open(os.path.join(output, 'manifest.json'), 'w') as file:
+    json.dump({'version': '1', 'artifacts': {stack_group: {} for stack_group in stack_groups}}, file)
+with open(os.path.join(output, 'asset.txt'), 'w') as file:
+    file.write('shared')
+os.makedirs(os.path.join(output, '.cdk-organizer-cache'), exist_ok=True)
+with open(os.path.join(output, '.cdk-organizer-cache', 'context.json'), 'w') as file:
+    json.dump(context, file)
+"""
+
+
+def read_json(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def stacks(write_file):
+    for name in ('storage', 'logs', 'app', 'iam'):
+        write_file(f'stacks/{name}/stacks.py', 'from cdk_organizer.stack_group import StackGroup\n\n\nclass Group(StackGroup):\n    pass\n')
+        write_file(f'config/dev/eu-west-1/{name}/config.yaml', f'name: {name}\n')
+
+    write_file('stacks/app/stacks.py', """\
+        from cdk_organizer.stack_group import StackGroup
+        from stacks.storage.stacks import Group as Storage
+
+
+        class Group(StackGroup):
+            def _load_stacks(self):
+                self.resolve_group(Storage)
+        """)
+    write_file('app.py', SHARD_APP)
+    return write_file
+
+
+def test_partition_keeps_the_dependent_stack_groups_together(stacks, make_app):
+    stacks('config/dev/eu-west-1/iam/config.yaml').unlink()
+
+    shards = ShardedSynth(make_app(env='dev', region='eu-west-1'), 'true', {}, shards=4).partition()
+
+    assert sorted(shards) == [['stacks.app', 'stacks.storage'], ['stacks.logs']]
+    assert ShardedSynth(make_app(), 'true', {}, shards=1).partition() == [['stacks.app', 'stacks.iam', 'stacks.logs', 'stacks.storage']]
+
+
+def test_synth_merges_the_shard_outputs_and_keeps_the_cache(stacks, make_app, write_file):
+    write_file('cdk.out/.cdk-organizer-cache/entry.pickle', 'cached')
+    write_file('cdk.out/stale.template.json', '{}')
+    command = f'"{sys.executable}" app.py'
+
+    shards = ShardedSynth(make_app(), command, {'env': 'dev', 'configCache': 'true'}, shards=2).synth('cdk.out')
+
+    assert sorted(stack_group for shard in shards for stack_group in shard) == ['stacks.app', 'stacks.iam', 'stacks.logs', 'stacks.storage']
+    assert sorted(os.listdir('cdk.out')) == [
+        '.cdk-organizer-cache',
+        'asset.txt',
+        'manifest.json',
+        'stacks.app.template.json',
+        'stacks.iam.template.json',
+        'stacks.logs.template.json',
+        'stacks.storage.template.json',
+    ]
+    assert sorted(read_json('cdk.out/manifest.json')['artifacts']) == ['stacks.app', 'stacks.iam', 'stacks.logs', 'stacks.storage']
+    assert os.listdir('cdk.out/.cdk-organizer-cache') == ['entry.pickle']
+    assert not os.path.exists('cdk.out.shards')
+
+
+def test_shards_share_the_cache_of_the_output(stacks, make_app, monkeypatch):
+    cache_dirs = []
+    monkeypatch.setattr(ShardedSynth, '_run', lambda self, output, stack_groups, cache_dir: cache_dirs.append(cache_dir) or output)
+
+    ShardedSynth(make_app(), 'true', {}, shards=1).synth('cdk.out')
+
+    assert cache_dirs == [os.path.abspath('cdk.out/.cdk-organizer-cache')]
+
+
+@pytest.mark.parametrize('context, expected', [
+    ({'configCache': True, 'stackManifest': 'true'}, ('/cache', '/cache/stack-manifest.json')),
+    ({'configCache': 'build/cache', 'stackManifest': 'false'}, ('build/cache', 'false')),
+])
+def test_shard_context_uses_the_shared_cache(stacks, make_app, context, expected):
+    synth = ShardedSynth(make_app(), f'"{sys.executable}" app.py', context)
+
+    synth._run('shard', ['stacks.logs'], '/cache')
+
+    shard_context = read_json('shard/.cdk-organizer-cache/context.json')
+    assert (shard_context['configCache'], shard_context['stackManifest']) == expected
+    assert shard_context['stackGroups'] == 'stacks.logs'
+
+
+def test_failed_shard(stacks, make_app):
+    with pytest.raises(InfraRuntimeException, match='exit code 3'):
+        ShardedSynth(make_app(), 'echo failed; exit 3', {}, shards=1).synth('cdk.out')
+
+
+def test_merge_output(write_file):
+    write_file('a/asset.txt', 'same')
+    write_file('a/manifest.json', '{"artifacts": {"a": {}}, "list": [1]}')
+    write_file('a/.cdk-organizer-cache/entry', 'a')
+    write_file('b/asset.txt', 'same')
+    write_file('b/manifest.json', '{"artifacts": {"b": {}}, "list": [1, 2]}')
+    write_file('b/nested/b.template.json', '{}')
+    write_file('b/.cdk-organizer-cache/entry', 'b')
+
+    merge_output('a', 'out')
+    merge_output('b', 'out')
+
+    assert read_json('out/manifest.json') == {'artifacts': {'a': {}, 'b': {}}, 'list': [1, 2]}
+    assert sorted(os.listdir('out')) == ['asset.txt', 'manifest.json', 'nested']
+
+
+def test_merge_output_conflict(write_file):
+    write_file('a/asset.txt', 'a')
+    write_file('b/asset.txt', 'b')
+    merge_output('a', 'out')
+
+    with pytest.raises(InfraRuntimeException, match='asset.txt'):
+        merge_output('b', 'out')
+
+
+def test_merge_json_keeps_the_target_values():
+    assert merge_json({'a': 1, 'b': {'c': [1]}}, {'a': 2, 'b': {'c': [1, 2], 'd': 3}}) == {'a': 1, 'b': {'c': [1, 2], 'd': 3}}
+
+
+def test_clean_output_keeps_the_cache(write_file):
+    write_file('cdk.out/.cdk-organizer-cache/entry', 'cached')
+    write_file('cdk.out/asset/file.txt')
+    write_file('cdk.out/manifest.json', '{}')
+
+    clean_output('cdk.out')
+    clean_output('new.out')
+
+    assert os.listdir('cdk.out') == ['.cdk-organizer-cache']
+    assert os.listdir('new.out') == []
+
+
+def test_context_app_merges_the_project_context_as_the_cdk_cli(write_file):
+    write_file('cdk.context.json', '{"lookup": "cached", "env": "context-file", "region": "context-file"}')
+    write_file('cdk.json', '{"app": "python3 app.py", "context": {"env": "dev", "region": "eu-west-1"}}')
+
+    context = context_app(['region=us-east-1']).node.get_all_context()
+
+    assert context == {'lookup': 'cached', 'env': 'dev', 'region': 'us-east-1'}
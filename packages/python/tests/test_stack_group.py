@@ -0,0 +1,269 @@
+"""Tests of the stack group loader and of the stack groups."""
+
+import os
+import sys
+import textwrap
+
+import pytest
+from cdk_organizer.decorators.catch_exceptions import InfraRuntimeException
+from cdk_organizer.stack_group import StackGroup, StackGroupLoader
+
+STORAGE_STACKS = """\
+    from dataclasses import dataclass
+
+    from fw import StackGroup
+
+
+    @dataclass
+    class StorageConfig:
+        bucket: str
+
+
+    class StorageStackGroup(StackGroup[StorageConfig]):
+        pass
+    """
+
+
+def group(loader, name):
+    return loader.stack_groups[name]
+
+
+def group_type(name):
+    module, _, cls = name.rpartition('.')
+    return getattr(sys.modules[module], cls)
+
+
+def test_config_and_data_are_loaded_on_first_access(stack_project, write_file):
+    write_file('stacks/storage/stacks.py', STORAGE_STACKS)
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+
+    storage = group(stack_project(env='dev', region='eu-west-1'), 'stacks.storage.stacks.StorageStackGroup')
+
+    assert storage.loaded
+    assert 'config' not in vars(storage) and 'data' not in vars(storage)
+    assert storage.data.bucket == 'data'
+    assert storage.config == {'bucket': 'data'}
+    assert storage.data is storage.data
+
+
+def test_config_errors_are_reported_on_access(stack_project, write_file):
+    write_file('stacks/storage/stacks.py', STORAGE_STACKS)
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'name: data\n')
+
+    storage = group(stack_project(env='dev', region='eu-west-1'), 'stacks.storage.stacks.StorageStackGroup')
+
+    with pytest.raises(SystemExit):
+        storage.data
+
+
+def test_disabled_stack_group_has_no_data(stack_project, write_file):
+    write_file('stacks/storage/stacks.py', STORAGE_STACKS)
+    write_file('config/dev/eu-west-1/config.yaml', 'bucket: data\n')
+
+    loader = stack_project(env='dev', region='eu-west-1', importDisabledStacks=True)
+    storage = loader.resolve_group(group_type('stacks.storage.stacks.StorageStackGroup'))
+
+    assert not storage.enabled
+    assert not hasattr(storage, 'loaded')
+    assert storage.config == {'bucket': 'data'}
+    with pytest.raises(AttributeError):
+        storage.data
+
+
+def executions():
+    with open('executions.log', 'a+') as file:
+        file.seek(0)
+        return file.read().split()
+
+
+def write_recorded_stacks(write_file, path):
+    # the stack files record their executions, to check which ones are imported
+    write_file(path, "open('executions.log', 'a').write(__name__ + '\\n')\n" + textwrap.dedent(STORAGE_STACKS))
+
+
+def test_stack_files_of_disabled_stack_groups_are_not_imported(stack_project, write_file):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_recorded_stacks(write_file, 'stacks/logs/stacks.py')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    write_file('config/prod/eu-west-1/logs/config.yaml', 'bucket: logs\n')
+
+    loader = stack_project(env='dev', region='eu-west-1')
+
+    assert list(loader.stack_groups) == ['stacks.storage.stacks.StorageStackGroup']
+    assert executions() == ['stacks.storage.stacks']
+
+
+def test_import_disabled_stacks(stack_project, write_file):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_recorded_stacks(write_file, 'stacks/logs/stacks.py')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+
+    loader = stack_project(env='dev', region='eu-west-1', importDisabledStacks='true')
+
+    assert list(loader.stack_groups) == ['stacks.storage.stacks.StorageStackGroup']
+    assert sorted(executions()) == ['stacks.logs.stacks', 'stacks.storage.stacks']
+
+
+def test_stack_manifest_is_opt_in(stack_project, write_file, make_app):
+    assert StackGroupLoader(make_app()).stack_manifest is None
+    assert StackGroupLoader(make_app(stackManifest='False')).stack_manifest is None
+    assert StackGroupLoader(make_app(stackManifest=True)).stack_manifest.path == os.path.join('cdk.out', '.cdk-organizer-cache', 'stack-manifest.json')
+    assert StackGroupLoader(make_app(stackManifest='build/manifest.json')).stack_manifest.path == 'build/manifest.json'
+    with pytest.raises(InfraRuntimeException, match='stackManifest'):
+        StackGroupLoader(make_app(stackManifest=1))
+
+
+def test_stack_manifest_imports_only_the_stack_group_files(stack_project, write_file):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_file('stacks/storage/helpers.py', "open('executions.log', 'a').write(__name__ + '\\n')\n")
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+
+    loader = stack_project(env='dev', region='eu-west-1', stackManifest='true')
+
+    assert list(loader.stack_groups) == ['stacks.storage.stacks.StorageStackGroup']
+    assert executions() == ['stacks.storage.stacks']
+    assert os.path.exists('cdk.out/.cdk-organizer-cache/stack-manifest.json')
+
+
+def test_registry_has_the_concrete_module_level_stack_groups(stack_project, write_file):
+    write_file('stacks/base/common.py', """\
+        from fw import StackGroup
+
+
+        class ProjectStackGroup(StackGroup[dict], abstract=True):
+            pass
+        """)
+    write_file('stacks/app/stacks.py', """\
+        from stacks.base.common import ProjectStackGroup
+
+
+        class Web(ProjectStackGroup):
+            class Nested(ProjectStackGroup):
+                pass
+
+
+        class Api(Web):
+            pass
+        """)
+    write_file('config/dev/eu-west-1/app/config.yaml', 'name: app\n')
+    write_file('config/dev/eu-west-1/base/config.yaml', 'name: base\n')
+
+    loader = stack_project(env='dev', region='eu-west-1')
+
+    assert StackGroup.registered('stacks.base.common') == []
+    assert [cls.__name__ for cls in StackGroup.registered('stacks.app.stacks')] == ['Api', 'Web']
+    assert list(loader.stack_groups) == ['stacks.app.stacks.Api', 'stacks.app.stacks.Web']
+    assert all(stack_group.loaded for stack_group in loader.stack_groups.values())
+
+
+@pytest.mark.parametrize('stack_manifest', ['false', 'true'])
+def test_stack_files_are_executed_once(stack_project, write_file, stack_manifest):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_file('stacks/app/__init__.py', """\
+        open('executions.log', 'a').write(__name__ + '\\n')
+
+        from stacks.storage.stacks import StorageStackGroup
+        from fw import StackGroup
+
+
+        class AppStackGroup(StackGroup[dict]):
+            def _load_stacks(self):
+                self.storage = self.resolve_group(StorageStackGroup)
+        """)
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: data\n')
+    write_file('config/dev/eu-west-1/app/config.yaml', 'name: app\n')
+
+    loader = stack_project(env='dev', region='eu-west-1', stackManifest=stack_manifest)
+
+    assert sorted(executions()) == ['stacks.app', 'stacks.storage.stacks']
+    app = group(loader, 'stacks.app.AppStackGroup')
+    assert app.module_name == 'stacks.app'
+    assert app.storage is group(loader, 'stacks.storage.stacks.StorageStackGroup')
+    assert app.dependencies == [app.storage]
+
+
+def write_selection_project(write_file):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_recorded_stacks(write_file, 'stacks/logs/stacks.py')
+    write_file('stacks/app/web/stacks.py', """\
+        from stacks.storage.stacks import StorageStackGroup
+        from fw import StackGroup
+
+
+        class WebStackGroup(StackGroup[dict]):
+            def _load_stacks(self):
+                self.resolve_group(StorageStackGroup)
+        """)
+    for name in ('storage', 'logs', 'app/web'):
+        write_file(f'config/dev/eu-west-1/{name}/config.yaml', 'bucket: data\n')
+
+
+@pytest.mark.parametrize('context, expected', [
+    (None, ['stacks.app.web.stacks.WebStackGroup', 'stacks.logs.stacks.StorageStackGroup', 'stacks.storage.stacks.StorageStackGroup']),
+    ('logs', ['stacks.logs.stacks.StorageStackGroup']),
+    (['stacks.logs'], ['stacks.logs.stacks.StorageStackGroup']),
+    ('app.*', ['stacks.app.web.stacks.WebStackGroup', 'stacks.storage.stacks.StorageStackGroup']),
+    ('app.web, missing', ['stacks.app.web.stacks.WebStackGroup', 'stacks.storage.stacks.StorageStackGroup']),
+    ('', []),
+])
+def test_selected_stack_groups_and_their_dependencies(stack_project, write_file, context, expected):
+    write_selection_project(write_file)
+
+    loader = stack_project(env='dev', region='eu-west-1', stackGroups=context)
+
+    assert sorted(loader.stack_groups) == expected
+    if context == '':
+        assert executions() == []
+
+
+def write_env_matrix_project(write_file):
+    write_recorded_stacks(write_file, 'stacks/storage/stacks.py')
+    write_recorded_stacks(write_file, 'stacks/logs/stacks.py')
+    write_file('config/dev/eu-west-1/storage/config.yaml', 'bucket: dev-eu\n')
+    write_file('config/dev/us-east-1/storage/config.yaml', 'bucket: dev-us\n')
+    write_file('config/dev/us-east-1/logs/config.yaml', 'bucket: dev-logs\n')
+    write_file('config/prod/us-east-1/storage/config.yaml', 'bucket: prod-us\n')
+
+
+@pytest.mark.parametrize('context, expected', [
+    ('dev/*', [('dev', 'eu-west-1'), ('dev', 'us-east-1')]),
+    ('*/us-east-1, dev/us-east-1', [('dev', 'us-east-1'), ('prod', 'us-east-1')]),
+    (['prod/us-east-1', 'dev/eu-west-1'], [('prod', 'us-east-1'), ('dev', 'eu-west-1')]),
+])
+def test_env_matrix_loads_each_pair_in_its_own_scope(stack_project, write_file, context, expected):
+    write_env_matrix_project(write_file)
+
+    loader = stack_project(envMatrix=context)
+
+    assert loader.env_matrix == expected
+    assert list(loader.env_loaders) == expected
+    assert loader.stack_groups == {}
+    for (env, region), env_loader in loader.env_loaders.items():
+        assert (env_loader.env, env_loader.region) == (env, region)
+        assert env_loader.app.node.id == f'{env}-{region}'
+        assert env_loader.app.node.scope is loader.app
+        assert env_loader.config_cache is loader.config_cache
+        storage = group(env_loader, 'stacks.storage.stacks.StorageStackGroup')
+        assert storage.app is env_loader.app
+        assert storage.data.bucket == f'{env}-{region.split("-")[0]}'
+    assert executions().count('stacks.storage.stacks') == 1
+    assert len(executions()) == len(set(executions()))
+
+
+def test_env_matrix_pairs_only_load_their_enabled_stack_groups(stack_project, write_file):
+    write_env_matrix_project(write_file)
+
+    loader = stack_project(envMatrix='dev/*')
+
+    assert list(loader.env_loaders[('dev', 'eu-west-1')].stack_groups) == ['stacks.storage.stacks.StorageStackGroup']
+    assert sorted(loader.env_loaders[('dev', 'us-east-1')].stack_groups) == [
+        'stacks.logs.stacks.StorageStackGroup',
+        'stacks.storage.stacks.StorageStackGroup',
+    ]
+    assert sorted(executions()) == ['stacks.logs.stacks', 'stacks.storage.stacks']
+
+
+@pytest.mark.parametrize('context', ['dev', 'dev/eu-west-1,prod'])
+def test_invalid_env_matrix(stack_project, make_app, context):
+    with pytest.raises(InfraRuntimeException, match='envMatrix'):
+        StackGroupLoader(make_app(envMatrix=context))